@@ -3,27 +3,17 @@ from typing import Any, Callable, TypeVar
 
 import click
 
-from lingq.commands.add_timestamps import add_timestamps
-from lingq.commands.get_courses import get_courses
-from lingq.commands.get_images import get_images
-from lingq.commands.get_lesson import get_lesson
-from lingq.commands.get_lessons import get_lessons
-from lingq.commands.get_words import get_words
-from lingq.commands.merge import merge
-from lingq.commands.mk_library_overview import overview
-from lingq.commands.mk_markdown import markdown
-from lingq.commands.mk_yomitan import YOMITAN_DICT_CHOICES, YomitanDictTy, yomitan
-from lingq.commands.patch import patch_audios
-from lingq.commands.post import PAIRING_STRATEGIES, Strategy, post
-from lingq.commands.post_yt_playlist import post_yt_playlist
-from lingq.commands.reindex import reindex
-from lingq.commands.replace import replace
-from lingq.commands.resplit import resplit
-from lingq.commands.show import show_course, show_my, show_status
-from lingq.commands.sort import sort_lessons
-from lingq.commands.stats import stats
+from lingq.commands.choices import (
+    DEFAULT_BANK_SIZE,
+    DEFAULT_WINDOW,
+    DUMP_FORMAT_CHOICES,
+    PAIRING_STRATEGIES,
+    YOMITAN_DICT_CHOICES,
+    DumpFormat,
+    Strategy,
+    YomitanDictTy,
+)
 from lingq.config import CONFIG_DIR, CONFIG_PATH
-from lingq.lingqhandler import LingqHandler
 
 DEFAULT_OUT_PATH = Path("downloads")
 DEFAULT_OUT_WORDS_PATH = DEFAULT_OUT_PATH / "lingqs"
@@ -55,6 +45,18 @@ def dry_run_option() -> Callable[[T], T]:
     )
 
 
+def parallel_langs_option() -> Callable[[T], T]:
+    return click.option(
+        "--parallel-langs",
+        "-p",
+        type=click.IntRange(min=1),
+        default=1,
+        show_default=True,
+        help="Number of languages to download simultaneously. "
+        "They share the same rate limit, so this does not increase the load on LingQ.",
+    )
+
+
 def assume_yes_option() -> Callable[[T], T]:
     # Reference: https://linux.die.net/man/8/apt-get
     return click.option(
@@ -69,6 +71,8 @@ class LangType(click.ParamType):
     """A helper class to do language code validation at CLI time.
 
     Uses a cache to prevent sending multiple requests when parsing a list of LangType.
+    The languages are also cached on disk (cf. LanguagesCache): on a miss, they are
+    fetched again, in case a language was started since.
 
     # When the command expects a list of LangType (nargs = -1)
     get courses        | None      | 'None' does not call convert (cf. docs)
@@ -85,13 +89,20 @@ class LangType(click.ParamType):
     def __init__(self) -> None:
         self._cache: list[str] | None = None
 
-    def _get_lang_codes(self) -> list[str]:
-        if self._cache is None:
-            self._cache = LingqHandler.get_user_langs()
+        self._refreshed = False
+
+    def _get_lang_codes(self, *, refresh: bool = False) -> list[str]:
+        from lingq.lingqhandler import LingqHandler
+
+        if self._cache is None or refresh:
+            self._cache = LingqHandler.get_user_langs(refresh=refresh)
+            self._refreshed |= refresh
         return self._cache
 
     def convert(self, value: str, param, ctx) -> str:  # noqa: ANN001
         lang_codes = self._get_lang_codes()
+        if value not in lang_codes and not self._refreshed:
+            lang_codes = self._get_lang_codes(refresh=True)
         if value not in lang_codes:
             self.fail(
                 f"{value}.\nLanguages found for this account: {', '.join(sorted(lang_codes))}.",
@@ -110,6 +121,22 @@ def cli() -> None:
     """
 
 
+@cli.command("serve")
+def serve_cli() -> None:
+    """Serve the commands from a long-lived process.
+
+    While it runs, the other lingq calls are forwarded to it, and skip the startup.
+    Commands that prompt need --yes. Stop it with Ctrl+C.
+    """
+    import asyncio
+    import contextlib
+
+    from lingq.daemon import serve
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve())
+
+
 @cli.command("setup")
 @click.argument("apikey")
 def setup_cli(apikey: str) -> None:
@@ -143,6 +170,11 @@ def setup_cli(apikey: str) -> None:
 
         print(f"Config file has been created at {CONFIG_PATH}")
 
+    # The cached languages with known words may be those of another account.
+    from lingq.langcache import LANGS_PATH
+
+    LANGS_PATH.unlink(missing_ok=True)
+
 
 @cli.group()
 def show() -> None:
@@ -156,6 +188,8 @@ def show() -> None:
 @click.option("-v", "--verbose", is_flag=True, default=False, show_default=True)
 def show_my_cli(lang: str, shared: bool, codes: bool, verbose: bool) -> None:
     """Show my collections in a language."""
+    from lingq.commands.show import show_my
+
     show_my(lang, shared=shared, codes=codes, verbose=verbose)
 
 
@@ -173,6 +207,8 @@ def show_course_cli(
     verbose: bool,
 ) -> None:
     """Show lessons in a language."""
+    from lingq.commands.show import show_course
+
     show_course(lang, course_id, shared=shared, codes=codes, verbose=verbose)
 
 
@@ -180,6 +216,8 @@ def show_course_cli(
 @click.argument("lang", type=LangType())
 def show_status_cli(lang: str) -> None:
     """Show pending and refused lessons in a language."""
+    from lingq.commands.show import show_status
+
     show_status(lang)
 
 
@@ -187,6 +225,8 @@ def show_status_cli(lang: str) -> None:
 @click.argument("lang", type=LangType())
 def stats_cli(lang: str) -> None:
     """Show stats."""
+    from lingq.commands.stats import stats
+
     stats(lang)
 
 
@@ -201,18 +241,69 @@ def get() -> None:
 @opath_option()
 def get_images_cli(lang: str, course_id: int, opath: Path) -> None:
     """Get course images."""
+    from lingq.commands.get_images import get_images
+
     get_images(lang, course_id, opath)
 
 
 @get.command("words")
 @click.argument("langs", nargs=-1, type=LangType())
 @opath_option()
-def get_words_cli(langs: list[str], opath: Path) -> None:
+@click.option(
+    "--window",
+    "-w",
+    type=click.IntRange(min=1),
+    default=DEFAULT_WINDOW,
+    show_default=True,
+    help="Number of pages to download simultaneously.",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(DUMP_FORMAT_CHOICES),
+    default="json",
+    show_default=True,
+    help="Format of the dump. JSON Lines (optionally gzipped) are lighter for big accounts.",
+)
+@click.option(
+    "--incremental",
+    "-i",
+    is_flag=True,
+    default=False,
+    help="Only download the words added since the last run. "
+    "Changes to older words are only picked up by a full run, done at least once a week.",
+)
+@click.option(
+    "--sqlite",
+    is_flag=True,
+    default=False,
+    help="Also write the words to a SQLite store, that 'make yomitan' can query.",
+)
+@parallel_langs_option()
+def get_words_cli(
+    langs: list[str],
+    opath: Path,
+    window: int,
+    fmt: DumpFormat,
+    incremental: bool,
+    sqlite: bool,
+    parallel_langs: int,
+) -> None:
     """Get all words (LingQs) for the given languages.
 
     If no language codes are given, use all languages.
     """
-    get_words(langs, opath)
+    from lingq.commands.get_words import get_words
+
+    get_words(
+        langs,
+        opath,
+        window=window,
+        fmt=fmt,
+        incremental=incremental,
+        sqlite=sqlite,
+        parallel_langs=parallel_langs,
+    )
 
 
 @get.command("lesson")
@@ -234,6 +325,8 @@ def get_lesson_cli(
 
     CAREFUL: This reorders your 'Continue studying' shelf.
     """
+    from lingq.commands.get_lesson import get_lesson
+
     get_lesson(
         lang,
         lesson_id,
@@ -257,7 +350,7 @@ def get_lesson_cli(
     is_flag=True,
     default=False,
     show_default=True,
-    help="Skip already downloaded lessons.",
+    help="Only download the lessons that are new or changed since the last download.",
 )
 @click.option("--with-index", is_flag=True, default=False, help="Add index to the title.")
 def get_lessons_cli(
@@ -273,6 +366,8 @@ def get_lessons_cli(
 
     CAREFUL: This reorders your 'Continue studying' shelf.
     """
+    from lingq.commands.get_lessons import get_lessons
+
     get_lessons(
         lang,
         course_id,
@@ -298,7 +393,7 @@ def get_lessons_cli(
     is_flag=True,
     default=False,
     show_default=True,
-    help="Skip already downloaded lessons.",
+    help="Only download the lessons that are new or changed since the last download.",
 )
 @click.option(
     "--batch-size",
@@ -309,6 +404,7 @@ def get_lessons_cli(
     help="Number of courses to download simultanously. "
     "Increasing this too much may incur in throttling. Suggested: 1 or 2.",
 )
+@parallel_langs_option()
 @assume_yes_option()
 def get_courses_cli(
     langs: list[str],
@@ -317,6 +413,7 @@ def get_courses_cli(
     download_timestamps: bool,
     skip_downloaded: bool,
     batch_size: int,
+    parallel_langs: int,
     yes: bool,
 ) -> None:
     """Get all courses for the given languages.
@@ -325,6 +422,8 @@ def get_courses_cli(
 
     If no language codes are given, use all languages.
     """
+    from lingq.commands.get_courses import get_courses
+
     get_courses(
         langs,
         opath,
@@ -332,6 +431,7 @@ def get_courses_cli(
         download_timestamps=download_timestamps,
         skip_downloaded=skip_downloaded,
         batch_size=batch_size,
+        parallel_langs=parallel_langs,
         assume_yes=yes,
     )
 
@@ -370,6 +470,8 @@ def post_cli(
 
     When no texts are given, LingQ will use whisper to transcribe.
     """
+    from lingq.commands.post import post
+
     post(
         lang,
         course_id,
@@ -391,6 +493,8 @@ def post_yt_playlist_cli(
     skip_uploaded: bool,
 ) -> None:
     """Post a youtube playlist."""
+    from lingq.commands.post_yt_playlist import post_yt_playlist
+
     post_yt_playlist(
         lang,
         course_id,
@@ -411,6 +515,8 @@ def merge_cli(lang: str, fr_course_id: int, to_course_id: int) -> None:
 
     The old course, even if it remains without any lessons, will not be deleted.
     """
+    from lingq.commands.merge import merge
+
     merge(lang, fr_course_id, to_course_id)
 
 
@@ -420,6 +526,8 @@ def merge_cli(lang: str, fr_course_id: int, to_course_id: int) -> None:
 @dry_run_option()
 def reindex_cli(lang: str, course_id: int, dry_run: bool) -> None:
     """Reindex course titles."""
+    from lingq.commands.reindex import reindex
+
     reindex(lang, course_id, dry_run=dry_run)
 
 
@@ -440,6 +548,8 @@ def patch() -> None:
 )
 def patch_audios_cli(lang: str, course_id: int, audios_folder: Path) -> None:
     """Patch a course audio."""
+    from lingq.commands.patch import patch_audios
+
     patch_audios(lang, course_id, audios_folder)
 
 
@@ -454,6 +564,8 @@ def replace_cli(lang: str, course_id: int, fr: str, to: str, yes: bool) -> None:
 
     Example (replace a with b): `lingq replace ja 123123 a b`
     """
+    from lingq.commands.replace import replace
+
     replacements = {fr: to}
     replace(lang, course_id, replacements, yes)
 
@@ -463,6 +575,8 @@ def replace_cli(lang: str, course_id: int, fr: str, to: str, yes: bool) -> None:
 @click.argument("course_id")
 def resplit_cli(lang: str, course_id: int) -> None:
     """Resplit a course."""
+    from lingq.commands.resplit import resplit
+
     resplit(lang, course_id)
 
 
@@ -475,6 +589,8 @@ def make() -> None:
 @click.argument("lang", type=LangType())
 def overview_cli(lang: str) -> None:
     """Make a library overview."""
+    from lingq.commands.mk_library_overview import overview
+
     overview(lang)
 
 
@@ -505,6 +621,8 @@ def markdown_cli(
 
     If no language codes are given, use all languages.
     """
+    from lingq.commands.mk_markdown import markdown
+
     markdown(langs, select_courses, include_views, opath)
 
 
@@ -519,12 +637,66 @@ def markdown_cli(
     type=click.Path(exists=True, path_type=Path),
     help="Input path.",
 )
-def yomitan_cli(dict_ty: YomitanDictTy, langs: list[str], ipath: Path) -> None:
+@click.option(
+    "--sqlite",
+    is_flag=True,
+    default=False,
+    help="Read the words from the SQLite store made by 'lingq get words --sqlite'.",
+)
+@click.option(
+    "--status",
+    "statuses",
+    multiple=True,
+    type=click.IntRange(1, 5),
+    help="Only include words with this status (1-5). Can be repeated.",
+)
+@click.option(
+    "--bank-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BANK_SIZE,
+    show_default=True,
+    help="Number of entries per term bank.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of processes converting the words. Languages are also built concurrently.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Rebuild the dictionaries even if the words did not change.",
+)
+def yomitan_cli(
+    dict_ty: YomitanDictTy,
+    langs: list[str],
+    ipath: Path,
+    sqlite: bool,
+    statuses: tuple[int, ...],
+    bank_size: int,
+    jobs: int,
+    force: bool,
+) -> None:
     """Make a Yomitan dictionary from the result of 'lingq get words'.
 
     If no language codes are given, use all languages.
     """
-    yomitan(langs, ipath, dict_ty=dict_ty)
+    from lingq.commands.mk_yomitan import yomitan
+
+    yomitan(
+        langs,
+        ipath,
+        dict_ty=dict_ty,
+        sqlite=sqlite,
+        statuses=statuses or None,
+        bank_size=bank_size,
+        jobs=jobs,
+        force=force,
+    )
 
 
 @cli.command("timestamp")
@@ -533,6 +705,8 @@ def yomitan_cli(dict_ty: YomitanDictTy, langs: list[str], ipath: Path) -> None:
 @click.option("--skip-timestamped", default=True)
 def generate_timestamps_cli(lang: str, course_id: int, skip_timestamped: bool) -> None:
     """Add course timestamps."""
+    from lingq.commands.add_timestamps import add_timestamps
+
     add_timestamps(lang, course_id, skip_timestamped)
 
 
@@ -542,6 +716,8 @@ def generate_timestamps_cli(lang: str, course_id: int, skip_timestamped: bool) -
 @dry_run_option()
 def sort_lessons_cli(lang: str, course_id: int, dry_run: bool) -> None:
     """Sort course lessons."""
+    from lingq.commands.sort import sort_lessons
+
     sort_lessons(lang, course_id, dry_run=dry_run)
 
 
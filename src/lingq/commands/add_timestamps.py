@@ -1,15 +1,16 @@
 import asyncio
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
 from lingq.models.collection_v3 import CollectionLessonResult
 
 
 async def check_if_timestamped(handler: LingqHandler, lesson_res: CollectionLessonResult) -> bool:
-    lesson = await handler.get_lesson_from_id(lesson_res.id)
-    is_timestamped = any(lesson.tokenized_text[0][0].timestamp)
+    # Only the first paragraph is needed: do not download the whole lesson.
+    paragraph = await handler.get_lesson_head_from_id(lesson_res.id)
+    is_timestamped = any(paragraph[0].timestamp)
     if is_timestamped:
-        logger.info(f"[Skip: already timestamped] {lesson.title}")
+        logger.info(f"[Skip: already timestamped] {lesson_res.title}")
     return is_timestamped
 
 
@@ -38,7 +39,7 @@ async def add_timestamps_async(lang: str, course_id: int, skip_timestamped: bool
 
 def add_timestamps(lang: str, course_id: int, skip_timestamped: bool) -> None:
     """Add course timestamps."""
-    asyncio.run(add_timestamps_async(lang, course_id, skip_timestamped))
+    run_async(add_timestamps_async(lang, course_id, skip_timestamped))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+"""Choices and defaults of the command options.
+
+Kept apart from the commands, so that the CLI can declare its options without
+importing them. Cf. cli.py.
+"""
+
+from typing import Literal, get_args
+
+DEFAULT_WINDOW = 4
+"""Number of pages downloaded at the same time."""
+
+DumpFormat = Literal["json", "jsonl", "jsonl.gz"]
+"""The format of the LingQs dump. JSON Lines are lighter to write and to read back."""
+
+DUMP_FORMAT_CHOICES: list[DumpFormat] = list(get_args(DumpFormat))
+
+YomitanDictTy = Literal["simple", "normal"]
+"""The type of the Yomitan dictionary."""
+
+YOMITAN_DICT_CHOICES: list[YomitanDictTy] = list(get_args(YomitanDictTy))
+
+DEFAULT_BANK_SIZE = 10_000
+"""Number of cards per term bank."""
+
+Strategy = Literal["zip", "zipsort", "exact", "fuzzy"]
+PAIRING_STRATEGIES: list[Strategy] = list(get_args(Strategy))
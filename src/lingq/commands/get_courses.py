@@ -2,67 +2,66 @@ import asyncio
 from pathlib import Path
 
 from lingq.commands.get_lessons import get_lessons_async
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
+from lingq.manifest import Manifest
 from lingq.utils import double_check, timing
 
 
-async def get_lessons_async_rate_limited(
+async def sync_course(
     semaphore: asyncio.Semaphore,
+    handler: LingqHandler,
+    manifest: Manifest,
+    course_id: int,
     *args,  # noqa: ANN002
     **kwargs,  # noqa: ANN003
 ) -> None:
     async with semaphore:
-        await get_lessons_async(*args, **kwargs)
+        await get_lessons_async(handler, course_id, *args, manifest=manifest, **kwargs)
 
 
 async def get_courses_for_language_async(
-    lang: str,
+    handler: LingqHandler,
     opath: Path,
+    manifest: Manifest,
     *,
     download_audio: bool,
     download_timestamps: bool,
     skip_downloaded: bool,
     batch_size: int,
 ) -> None:
+    lang = handler.lang
     # Number of courses to download in batch
     semaphore = asyncio.Semaphore(batch_size)
 
-    async with LingqHandler(lang) as handler:
-        # This is only for the courses ID.
-        # To get the text we need to do yet another request.
-        my_collections = await handler.get_my_collections()
-        logger.info(f"Found {my_collections.count} courses in language: {lang}")
-
-        # Async fetching of courses is too fast for the API...
-        # for res in my_collections.results:
-        #     await get_lessons_async(
-        #         lang,
-        #         res.id,
-        #         skip_already_downloaded=False,
-        #         download_audio=download_audio,
-        #         download_timestamps=download_timestamps,
-        #         opath=opath,
-        #         write=True,
-        #         handler=handler,
-        #     )
-
-        await asyncio.gather(
-            *(
-                get_lessons_async_rate_limited(
-                    semaphore,
-                    lang,
-                    res.id,
-                    skip_downloaded=skip_downloaded,
-                    download_audio=download_audio,
-                    download_timestamps=download_timestamps,
-                    opath=opath,
-                    write=True,
-                    with_index=False,
-                )
-                for res in my_collections.results
-            ),
+    # This is only for the courses ID.
+    # To get the text we need to do yet another request.
+    my_collections = await handler.get_my_collections()
+    logger.info(f"Found {my_collections.count} courses in language: {lang}")
+    collections = my_collections.results
+    if not collections:
+        return
+
+    tasks = [
+        sync_course(
+            semaphore,
+            handler,
+            manifest,
+            res.id,
+            skip_downloaded=skip_downloaded,
+            download_audio=download_audio,
+            download_timestamps=download_timestamps,
+            opath=opath,
+            write=True,
+            with_index=False,
         )
+        for res in collections
+    ]
+    # Report the progress per language, since languages may run side by side.
+    for step, task in enumerate(asyncio.as_completed(tasks), 1):
+        await task
+        logger.info(f"Progress ({lang}): {step}/{len(tasks)} courses")
+    logger.success(f"Got the courses for language: {lang}")
 
 
 async def get_courses_async(
@@ -73,20 +72,35 @@ async def get_courses_async(
     download_timestamps: bool,
     skip_downloaded: bool,
     batch_size: int,
+    parallel_langs: int,
     assume_yes: bool,
 ) -> None:
+    """Get the courses of every language, 'parallel_langs' languages at a time.
+
+    Every language goes through the same session, rate limiter and retry budget: the
+    number of languages at a time does not change how hard we hit the API.
+    """
     logger.info(f"Getting courses for languages: {', '.join(langs)}")
     double_check("CAREFUL: This reorders your 'Continue studying' shelf.", assume_yes)
-    for lang in langs:
-        await get_courses_for_language_async(
-            lang,
-            opath,
-            download_audio=download_audio,
-            download_timestamps=download_timestamps,
-            skip_downloaded=skip_downloaded,
-            batch_size=batch_size,
-        )
-        await asyncio.sleep(2)
+    semaphore = asyncio.Semaphore(parallel_langs)
+
+    async def get_courses_for_language(handler: LingqHandler) -> None:
+        async with semaphore:
+            await get_courses_for_language_async(
+                handler,
+                opath,
+                manifest,
+                download_audio=download_audio,
+                download_timestamps=download_timestamps,
+                skip_downloaded=skip_downloaded,
+                batch_size=batch_size,
+            )
+
+    with Manifest(opath) as manifest:
+        async with LingqHandler("Filler") as base_handler:
+            await asyncio.gather(
+                *(get_courses_for_language(base_handler.for_lang(lang)) for lang in langs)
+            )
 
 
 @timing
@@ -98,6 +112,7 @@ def get_courses(
     download_timestamps: bool,
     skip_downloaded: bool,
     batch_size: int = 1,
+    parallel_langs: int = 1,
     assume_yes: bool = False,
 ) -> None:
     """Get all courses for the given languages.
@@ -108,7 +123,7 @@ def get_courses(
     """
     if not langs:
         langs = LingqHandler.get_user_langs()
-    asyncio.run(
+    run_async(
         get_courses_async(
             langs,
             opath,
@@ -116,6 +131,7 @@ def get_courses(
             download_timestamps=download_timestamps,
             skip_downloaded=skip_downloaded,
             batch_size=batch_size,
+            parallel_langs=parallel_langs,
             assume_yes=assume_yes,
         )
     )
@@ -3,7 +3,7 @@ import re
 from pathlib import Path
 from typing import Any
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
 from lingq.models.collection_v3 import CollectionLessonResult
 from lingq.utils import timing
@@ -59,7 +59,7 @@ async def get_images_async(lang: str, course_id: int, opath: Path) -> None:
 @timing
 def get_images(lang: str, course_id: int, opath: Path) -> None:
     """Get course images."""
-    asyncio.run(get_images_async(lang, course_id, opath))
+    run_async(get_images_async(lang, course_id, opath))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,9 @@
-import asyncio
 from pathlib import Path
 
-from lingq.lingqhandler import LingqHandler
+from lingq.download import DownloadError
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
-from lingq.models.lesson_v3 import LessonV3
+from lingq.models.lesson_v3 import LessonV3View
 from lingq.utils import timing
 
 
@@ -11,19 +11,32 @@ def sanitize_title(title: str) -> str:
     return title.replace("/", "-")
 
 
+def get_lesson_folder(lang: str, lesson: LessonV3View, opath: Path) -> Path:
+    return opath / lang / sanitize_title(lesson.collection_title)
+
+
 async def get_lesson_async(
     handler: LingqHandler,
     lesson_id: int,
+    opath: Path,
     download_audio: bool,
     download_timestamps: bool,
-) -> LessonV3 | None:
-    lesson = await handler.get_lesson_from_id(lesson_id)
+) -> LessonV3View | None:
+    # Only the text is needed: the tokens are not validated, the words not downloaded.
+    lesson = await handler.get_lesson_view_from_id(lesson_id, projection="text")
     if lesson is None:
         return None
 
     if download_audio:
-        audio = await handler.get_audio_from_lesson(lesson)
-        lesson._downloaded_audio = audio
+        # Streamed next to its final path: write_lesson then only has to rename it.
+        audios_folder = get_lesson_folder(handler.lang, lesson, opath) / "audios"
+        audio_path = audios_folder / f".{lesson.id}.mp3"
+        try:
+            lesson._audio_path = await handler.download_audio_from_lesson(lesson, audio_path)
+        except DownloadError as e:
+            # Keep the text: running the command again resumes the download.
+            logger.error(f"{e}. Writing the lesson without its audio.")
+            lesson._audio_path = None
 
     if download_timestamps:
         timestamps = lesson.to_vtt()
@@ -32,16 +45,17 @@ async def get_lesson_async(
     return lesson
 
 
-def write_lesson(lang: str, lesson: LessonV3, opath: Path, idx: int | None) -> None:
-    collection_title = sanitize_title(lesson.collection_title)
+def write_lesson(lang: str, lesson: LessonV3View, opath: Path, idx: int | None) -> dict[str, Path]:
+    """Write a lesson, and return the paths written by kind: text, audio and timestamps."""
     title = sanitize_title(lesson.title)
 
     if idx:
         title = f"{idx:02d}. {title}"
 
-    texts_folder = opath / lang / collection_title / "texts"
-    audios_folder = opath / lang / collection_title / "audios"
-    timestamps_folder = opath / lang / collection_title / "timestamps"
+    lesson_folder = get_lesson_folder(lang, lesson, opath)
+    texts_folder = lesson_folder / "texts"
+    audios_folder = lesson_folder / "audios"
+    timestamps_folder = lesson_folder / "timestamps"
 
     # Write text
     Path.mkdir(texts_folder, parents=True, exist_ok=True)
@@ -50,13 +64,15 @@ def write_lesson(lang: str, lesson: LessonV3, opath: Path, idx: int | None) -> N
         # Cf. https://forum.lingq.com/t/bug-lesson-titles/1323451
         # text_file.write(f"{lesson.title}\n")
         text_file.write(lesson.get_raw_text())
+    paths = {"text": text_path}
 
     # Write audio if any
-    if audio := lesson._downloaded_audio:
+    if audio_path := lesson._audio_path:
         Path.mkdir(audios_folder, parents=True, exist_ok=True)
         mp3_path = audios_folder / f"{title}.mp3"
-        with mp3_path.open("wb") as audio_file:
-            audio_file.write(audio)
+        audio_path.replace(mp3_path)
+        lesson._audio_path = mp3_path
+        paths["audio"] = mp3_path
 
     # Write timestamps if any
     if timestamps := lesson._timestamps:
@@ -64,19 +80,24 @@ def write_lesson(lang: str, lesson: LessonV3, opath: Path, idx: int | None) -> N
         vtt_path = timestamps_folder / f"{title}.vtt"
         with vtt_path.open("w", encoding="utf-8") as vtt_file:
             vtt_file.write(timestamps)
+        paths["timestamps"] = vtt_path
+
+    return paths
 
 
 async def _get_lesson_async(
     lang: str,
     lesson_id: int,
+    opath: Path,
     download_audio: bool,
     download_timestamps: bool,
-) -> LessonV3 | None:
+) -> LessonV3View | None:
     """Same as get_lesson_async but does not expect a handler."""
     async with LingqHandler(lang) as handler:
         return await get_lesson_async(
             handler,
             lesson_id,
+            opath,
             download_audio,
             download_timestamps,
         )
@@ -95,10 +116,11 @@ def get_lesson(
 
     Download text and/or audio from a lesson given the language code and the lesson ID.
     """
-    lesson = asyncio.run(
+    lesson = run_async(
         _get_lesson_async(
             lang=lang,
             lesson_id=lesson_id,
+            opath=opath,
             download_audio=download_audio,
             download_timestamps=download_timestamps,
         )
@@ -1,76 +1,217 @@
 import asyncio
 from pathlib import Path
 
-from lingq.commands.get_lesson import get_lesson_async, sanitize_title, write_lesson
-from lingq.lingqhandler import LingqHandler
+from lingq.commands.get_lesson import get_lesson_async, write_lesson
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
+from lingq.manifest import Artifact, Manifest
 from lingq.models.collection_v3 import CollectionLessonResult
-from lingq.models.lesson_v3 import LessonV3
+from lingq.models.lesson_v3 import LessonV3View
 from lingq.utils import get_editor_url, timing
 
+IndexedLesson = tuple[int, CollectionLessonResult]
 
-def filter_downloaded(
-    texts_path: Path, lessons: list[CollectionLessonResult]
-) -> list[CollectionLessonResult]:
-    if not texts_path.exists():
-        return lessons
 
-    collection_title = lessons[0].collection_title
-    text_files = [path.name for path in texts_path.iterdir()]
-    logger.trace(text_files)
-    filtered_lessons = [
-        lesson for lesson in lessons if f"{sanitize_title(lesson.title)}.txt" not in text_files
-    ]
-    n_skipped = len(lessons) - len(filtered_lessons)
-    logger.info(f"'{collection_title}' Skipped {n_skipped} out of {len(lessons)} lessons.")
-    return filtered_lessons
+async def write_and_record(
+    lang: str,
+    listed_lesson: CollectionLessonResult,
+    lesson: LessonV3View,
+    opath: Path,
+    idx: int | None,
+    *,
+    download_audio: bool,
+    download_timestamps: bool,
+    manifest: Manifest | None,
+) -> None:
+    """Write a lesson in a thread, then record it in the manifest, if any."""
+
+    def write_and_hash() -> list[Artifact]:
+        paths = write_lesson(lang, lesson, opath, idx)
+        if manifest is None:
+            return []
+        return [Artifact.from_path(kind, path) for kind, path in paths.items()]
+
+    artifacts = await asyncio.to_thread(write_and_hash)
+    if manifest is None:
+        return
+
+    # A lesson without audio is as complete as it gets.
+    with_audio = download_audio and (lesson._audio_path is not None or listed_lesson.audio is None)
+    replaced = manifest.record_lesson(
+        lang,
+        listed_lesson,
+        artifacts,
+        with_audio=with_audio,
+        with_timestamps=download_timestamps,
+    )
+    for path in replaced:
+        logger.debug(f"Removing outdated {path}")
+        path.unlink(missing_ok=True)
+
+
+async def fetch_and_write_lessons(
+    handler: LingqHandler,
+    lessons: list[IndexedLesson],
+    opath: Path,
+    *,
+    download_audio: bool,
+    download_timestamps: bool,
+    write: bool,
+    with_index: bool,
+    manifest: Manifest | None = None,
+) -> list[LessonV3View]:
+    """Fetch lessons, and write each one as soon as it is fetched.
+
+    A few fetchers (as many as the requests the limiter lets in flight) feed a bounded
+    queue, that a single writer drains. The writes run in a thread, so that they do not
+    block the fetches, and the fetches wait when the writes fall behind. Each lesson
+    written is then recorded in the manifest, if any.
+
+    If a fetch fails, the lessons already fetched are still written before re-raising.
+    The lessons come with their index in the course, starting at 1.
+
+    Return the lessons fetched, in the order of the course, only if they are not written:
+    written lessons are dropped, so that memory does not grow with the course.
+    """
+    jobs: asyncio.Queue[IndexedLesson] = asyncio.Queue()
+    for indexed_lesson in lessons:
+        jobs.put_nowait(indexed_lesson)
+    n_fetchers = min(handler.limiter.max_in_flight, len(lessons))
+    fetched: asyncio.Queue[tuple[IndexedLesson, LessonV3View] | None] = asyncio.Queue(n_fetchers)
+    results: dict[int, LessonV3View] = {}
+
+    async def fetch() -> None:
+        while not jobs.empty():
+            indexed_lesson = jobs.get_nowait()
+            lesson = await get_lesson_async(
+                handler, indexed_lesson[1].id, opath, download_audio, download_timestamps
+            )
+            if lesson is not None:
+                await fetched.put((indexed_lesson, lesson))
+
+    async def write_fetched() -> None:
+        while (item := await fetched.get()) is not None:
+            (idx, listed_lesson), lesson = item
+            if not write:
+                results[idx] = lesson
+                continue
+            await write_and_record(
+                handler.lang,
+                listed_lesson,
+                lesson,
+                opath,
+                idx if with_index else None,
+                download_audio=download_audio,
+                download_timestamps=download_timestamps,
+                manifest=manifest,
+            )
+
+    writer = asyncio.create_task(write_fetched())
+    fetchers = [asyncio.create_task(fetch()) for _ in range(n_fetchers)]
+
+    def stop_fetchers(_: asyncio.Task[None]) -> None:
+        # Otherwise, if a write fails, the fetchers wait forever on the full queue.
+        for fetcher in fetchers:
+            fetcher.cancel()
+
+    writer.add_done_callback(stop_fetchers)
+    try:
+        await asyncio.gather(*fetchers)
+    finally:
+        stop_fetchers(writer)
+        # Let the writer drain the queue, unless it failed itself.
+        done = asyncio.ensure_future(fetched.put(None))
+        await asyncio.wait([done, writer], return_when=asyncio.FIRST_COMPLETED)
+        done.cancel()
+        await writer
+
+    return [results[idx] for idx in sorted(results)]
 
 
 async def get_lessons_async(
-    lang: str,
+    handler: LingqHandler,
     course_id: int,
     opath: Path,
     *,
+    manifest: Manifest,
     download_audio: bool,
     download_timestamps: bool,
     skip_downloaded: bool,
     write: bool,
     with_index: bool,
-) -> list[LessonV3]:
-    async with LingqHandler(lang) as handler:
-        lessons = await handler.get_collection_lessons_from_id(course_id)
-        if not lessons:
-            return []
+) -> list[LessonV3View]:
+    """Fetch (and write) the lessons of a course.
+
+    With 'skip_downloaded', only the lessons that the manifest does not have as they
+    are now, with the files asked for, are fetched.
 
-        editor_url = get_editor_url(lang, course_id, "course")
-        logger.trace(editor_url)
-        collection_title = lessons[0].collection_title
+    Return the lessons only if they are not written, cf. fetch_and_write_lessons.
+    """
+    lessons = await handler.get_collection_lessons_from_id(course_id)
+    if not lessons:
+        return []
 
-        if skip_downloaded:
-            texts_folder = opath / lang / collection_title / "texts"
-            lessons = filter_downloaded(texts_folder, lessons)
-            if not lessons:
-                return []
+    editor_url = get_editor_url(handler.lang, course_id, "course")
+    logger.trace(editor_url)
+    collection_title = lessons[0].collection_title
 
-        tasks = [
-            get_lesson_async(
-                handler,
-                lesson_json.id,
-                download_audio,
-                download_timestamps,
-            )
-            for lesson_json in lessons
+    if n_removed := manifest.forget_lessons(course_id, (lesson.id for lesson in lessons)):
+        logger.info(f"'{collection_title}' {n_removed} lessons were removed from the course.")
+
+    indexed_lessons = list(enumerate(lessons, 1))
+    if skip_downloaded:
+        outdated = manifest.outdated(
+            lessons, with_audio=download_audio, with_timestamps=download_timestamps
+        )
+        outdated_ids = {lesson.id for lesson in outdated}
+        indexed_lessons = [
+            (idx, lesson) for idx, lesson in indexed_lessons if lesson.id in outdated_ids
         ]
-        lessons = await asyncio.gather(*tasks)
-        lessons = [les for les in lessons if les is not None]
-        logger.success(f"'{collection_title}'")
+        n_skipped = len(lessons) - len(indexed_lessons)
+        logger.info(f"'{collection_title}' Skipped {n_skipped} out of {len(lessons)} lessons.")
+        if not indexed_lessons:
+            return []
+
+    fetched_lessons = await fetch_and_write_lessons(
+        handler,
+        indexed_lessons,
+        opath,
+        download_audio=download_audio,
+        download_timestamps=download_timestamps,
+        write=write,
+        with_index=with_index,
+        manifest=manifest,
+    )
+    logger.success(f"'{collection_title}'")
+    return fetched_lessons
 
-        if write:
-            for _idx, lesson in enumerate(lessons, 1):
-                idx = _idx if with_index else None
-                write_lesson(lang, lesson, opath, idx)
 
-        return lessons
+async def _get_lessons_async(
+    lang: str,
+    course_id: int,
+    opath: Path,
+    *,
+    download_audio: bool,
+    download_timestamps: bool,
+    skip_downloaded: bool,
+    write: bool,
+    with_index: bool,
+) -> list[LessonV3View]:
+    """Same as get_lessons_async but does not expect a handler."""
+    # Opened on the loop, since SQLite connections are bound to their thread (cf. run_async).
+    with Manifest(opath) as manifest:
+        async with LingqHandler(lang) as handler:
+            return await get_lessons_async(
+                handler,
+                course_id,
+                opath,
+                manifest=manifest,
+                download_audio=download_audio,
+                download_timestamps=download_timestamps,
+                skip_downloaded=skip_downloaded,
+                write=write,
+                with_index=with_index,
+            )
 
 
 @timing
@@ -96,14 +237,15 @@ def get_lessons(
 
         download_audio (bool): If True, downloads the audio files for the lessons.
         download_timestamps (bool): If True, downloads the timestamps files for the lessons.
-        skip_downloaded (bool): If True, skip downloading already downloaded lessons.
+        skip_downloaded (bool): If True, only download the lessons that are new or changed
+            since they were downloaded, cf. lingq.manifest.
 
         TODO: Update me
 
     Creates a 'download' folder and saves the text/audio in 'text'/'audio' subfolders.
     """
-    asyncio.run(
-        get_lessons_async(
+    run_async(
+        _get_lessons_async(
             lang,
             course_id,
             opath,
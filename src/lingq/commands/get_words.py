@@ -1,70 +1,391 @@
 import asyncio
+import gzip
+import hashlib
 import json
+import textwrap
+import time
+from collections.abc import Iterator
+from contextlib import aclosing, nullcontext
+from datetime import datetime
+from itertools import batched
 from math import ceil
 from pathlib import Path
-from typing import Any
+from types import TracebackType
+from typing import IO, Any, Literal, Self
 
-from lingq.lingqhandler import LingqHandler
+from pydantic import BaseModel
+
+from lingq.commands.choices import DEFAULT_WINDOW, DUMP_FORMAT_CHOICES, DumpFormat
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
-from lingq.models.cards import Card, Cards
+from lingq.models.cards import Card
+from lingq.store import STORE_FILENAME, CardStore
 from lingq.utils import timing
 
-# List of JSON-like dumps of the Word model
-WordDump = list[dict[str, Any]]
+DEFAULT_PAGE_SIZE = 500
+SYNC_STATE_FILENAME = "sync_state.json"
+CHANGES_FILENAME = "changes.jsonl"
+FULL_SYNC_INTERVAL = 7 * 24 * 3600.0
+"""How often (in seconds) an incremental sync falls back to a full download.
 
+The API can not list the cards changed since a date: an incremental sync only sees
+the changes to the newest cards, and a full download catches up with the others.
+"""
+
+
+def open_dump(path: Path, mode: Literal["r", "w"], *, compressed: bool) -> IO[str]:
+    if compressed:
+        return gzip.open(path, f"{mode}t", encoding="utf-8")  # type: ignore[return-value]
+    return path.open(mode, encoding="utf-8")
+
+
+class WordsWriter:
+    """Write cards to disk, page by page, without ever holding every card in memory.
+
+    For the "json" format, the result is identical to:
+        json.dump(cards, f, ensure_ascii=False, indent=2)
+    For the "jsonl" formats, there is one compact JSON card per line.
+
+    The file is written to a temporary path and only replaces the previous dump
+    once every page has been written.
+    """
+
+    def __init__(self, path: Path, fmt: DumpFormat = "json") -> None:
+        self.path = path
+        self.fmt = fmt
+        self.tmp_path = path.with_name(f"{path.name}.tmp")
+        self.count = 0
+        self._file: IO[str] | None = None
+
+    def __enter__(self) -> Self:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open_dump(self.tmp_path, "w", compressed=self.fmt.endswith(".gz"))
+        if self.fmt == "json":
+            self._file.write("[")
+        return self
+
+    def write_cards(self, cards: list[Card]) -> None:
+        assert self._file is not None
+        for card in cards:
+            if self.fmt == "json":
+                card_json = json.dumps(card.model_dump(), ensure_ascii=False, indent=2)
+                separator = "," if self.count else ""
+                self._file.write(f"{separator}\n{textwrap.indent(card_json, '  ')}")
+            else:
+                self._file.write(f"{json.dumps(card.model_dump(), ensure_ascii=False)}\n")
+            self.count += 1
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        assert self._file is not None
+        if self.fmt == "json":
+            self._file.write("\n]" if self.count else "]")
+        self._file.close()
+        if exc_type is None:
+            self.tmp_path.replace(self.path)
+        else:
+            self.tmp_path.unlink()
+
+
+def get_dump_path(opath: Path, lang: str, fmt: DumpFormat = "json") -> Path:
+    return opath / "lingqs" / lang / f"lingqs.{fmt}"
 
-async def get_words_for_language_async(lang: str, page_size: int = 500) -> WordDump:
-    """Get all LingQs for the given language.
 
-    The LingQ API clamps page size:
-        - The API default page_size is 100 (with a clamped max of 1000 words per page).
+def find_dump(dump_folder: Path) -> Path | None:
+    """Find the most recent dump in a folder, whatever its format."""
+    paths = [dump_folder / f"lingqs.{fmt}" for fmt in DUMP_FORMAT_CHOICES]
+    paths = [path for path in paths if path.exists()]
+    if not paths:
+        return None
+    return max(paths, key=lambda path: path.stat().st_mtime)
+
+
+def iter_dump(path: Path) -> Iterator[Card]:
+    """Read back the cards of a dump.
+
+    JSON Lines dumps are read incrementally, one card at a time.
+    """
+    with open_dump(path, "r", compressed=path.name.endswith(".gz")) as f:
+        if path.name.endswith(".json"):
+            yield from (Card.model_validate(card) for card in json.load(f))
+        else:
+            yield from (Card.model_validate_json(line) for line in f if line.strip())
+
+
+def iter_raw_dump(path: Path) -> Iterator[dict[str, Any] | str]:
+    """Read back the cards of a dump without validating them.
+
+    Cards are parsed dicts for JSON dumps, and JSON strings for JSON Lines dumps.
     """
-    async with LingqHandler(lang) as handler:
-        url = f"https://www.lingq.com/api/v3/{lang}/cards/"
-        cur_url = f"{url}?page=1&page_size={page_size}"
-        words: list[Card] = []
-        step = 1
-        total_pages = None
-
-        while cur_url:
-            async with handler.session.get(cur_url, headers=handler.config.headers) as response:
-                cards_json = await response.json()
-                cards = Cards.model_validate(cards_json)
+    with open_dump(path, "r", compressed=path.name.endswith(".gz")) as f:
+        if path.name.endswith(".json"):
+            yield from json.load(f)
+        else:
+            yield from (line for line in f if line.strip())
+
+
+class SyncState(BaseModel):
+    """What we know about the last dump of a language, to only download what changed.
+
+    Attributes:
+        high_water_mark (int): The biggest card pk in the dump. Newer cards have bigger pks.
+        hashes (dict[int, str]): The content hash of every card in the dump, by pk.
+        full_sync_at (float): When every card was last downloaded, cf. FULL_SYNC_INTERVAL.
+
+    """
+
+    high_water_mark: int = 0
+    hashes: dict[int, str] = {}
+    full_sync_at: float = 0.0
+
+    @classmethod
+    def load(cls, path: Path) -> "SyncState | None":
+        if not path.exists():
+            return None
+        return cls.model_validate_json(path.read_text(encoding="utf-8"))
+
+    def save(self, path: Path) -> None:
+        path.write_text(self.model_dump_json(), encoding="utf-8")
 
+    def add(self, card: Card) -> None:
+        self.hashes[card.pk] = card_hash(card)
+        self.high_water_mark = max(self.high_water_mark, card.pk)
+
+
+def card_hash(card: Card) -> str:
+    card_json = json.dumps(card.model_dump(), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(card_json.encode()).hexdigest()[:16]
+
+
+def record_changes(
+    dump_folder: Path, added: list[int], updated: list[int], deleted: list[int]
+) -> None:
+    """Append the changes of a sync to the changelog of the dump."""
+    logger.info(f"Added: {len(added)}, updated: {len(updated)}, deleted: {len(deleted)}")
+    changes = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "added": added,
+        "updated": updated,
+        "deleted": deleted,
+    }
+    with (dump_folder / CHANGES_FILENAME).open("a", encoding="utf-8") as f:
+        f.write(f"{json.dumps(changes)}\n")
+
+
+async def download_words(
+    handler: LingqHandler,
+    dump_path: Path,
+    fmt: DumpFormat,
+    *,
+    page_size: int,
+    window: int,
+    store: CardStore | None,
+) -> SyncState:
+    """Download every LingQ of the handler language and write them as they arrive.
+
+    After the first page, the following 'window' pages are downloaded concurrently.
+    Pages are validated and appended to the dump (and the store) in order.
+    """
+    lang = handler.lang
+    state = SyncState(full_sync_at=time.time())
+    with WordsWriter(dump_path, fmt) as writer, store.transaction() if store else nullcontext():
+        if store:
+            store.delete_language(lang)
+        step, total_pages = 1, 0
+        async for cards in handler.get_cards_pages(page_size, window):
             if step == 1:
                 logger.info(f"Getting {cards.count} lingqs for {lang}...")
                 total_pages = ceil(cards.count / page_size)
+            writer.write_cards(cards.results)
+            if store:
+                store.upsert_cards(lang, cards.results)
+            for card in cards.results:
+                state.add(card)
+            logger.info(f"Progress ({lang}): {step}/{total_pages} pages")
+            step += 1
+    return state
 
-            words.extend(cards.results)
-            logger.info(f"Progress: {step}/{total_pages} pages")
-            logger.trace(cur_url)
 
-            cur_url = cards.next
-            step += 1
-            # await asyncio.sleep(1)
+def update_store(
+    store: CardStore, lang: str, dump_path: Path, n_known: int, cards: list[Card]
+) -> None:
+    """Upsert the cards to the store, or rebuild the language from the dump if out of sync."""
+    with store.transaction():
+        if store.count(lang) == n_known:
+            store.upsert_cards(lang, cards)
+            return
+        logger.info(f"Filling the store at {store.path} for {lang}...")
+        store.delete_language(lang)
+        for batch in batched(iter_dump(dump_path), DEFAULT_PAGE_SIZE):
+            store.upsert_cards(lang, list(batch))
+
+
+async def get_new_words(
+    handler: LingqHandler, state: SyncState, *, page_size: int
+) -> tuple[list[Card], dict[int, Card]] | None:
+    """Get the cards added since the last sync, newest first.
+
+    Stop at the first page reaching cards older than the high-water mark. Changes to the
+    cards seen on the way are also returned, but older cards are not checked.
+
+    Return None if an incremental sync is not possible: either some cards were deleted,
+    or the API did not sort the cards as expected.
+    """
+    added: list[Card] = []
+    updated: dict[int, Card] = {}
+    count = 0
+    pages = handler.get_cards_pages(page_size, window=1, sort="date")
+    async with aclosing(pages):
+        async for cards in pages:
+            count = cards.count
+            pks = [card.pk for card in cards.results]
+            if pks != sorted(pks, reverse=True):
+                logger.warning("Cards are not sorted by date: falling back to a full sync.")
+                return None
+            for card in cards.results:
+                if card.pk not in state.hashes:
+                    added.append(card)
+                elif state.hashes[card.pk] != card_hash(card):
+                    updated[card.pk] = card
+            if pks and pks[-1] <= state.high_water_mark:
+                break
 
-        dump = [word.model_dump() for word in words]
-        return dump
+    if count != len(state.hashes) + len(added):
+        logger.info("Some lingqs were deleted: falling back to a full sync.")
+        return None
+    return added, updated
 
 
-def write_words_for_language(lang: str, opath: Path, dump: WordDump) -> None:
-    """Write the word dump for a specific language."""
-    dump_folder_path = opath / "lingqs" / lang
-    Path.mkdir(dump_folder_path, parents=True, exist_ok=True)
-    dump_path = dump_folder_path / "lingqs.json"
-    with dump_path.open("w") as f:
-        json.dump(dump, f, ensure_ascii=False, indent=2)
+async def get_recent_words(
+    handler: LingqHandler, state: SyncState, *, page_size: int
+) -> tuple[list[Card], dict[int, Card]] | None:
+    """Like get_new_words, but None if the last full download is older than FULL_SYNC_INTERVAL."""
+    if time.time() - state.full_sync_at > FULL_SYNC_INTERVAL:
+        logger.info(f"Checking every lingq for {handler.lang}, for changes to older lingqs...")
+        return None
+    logger.info(f"Syncing lingqs for {handler.lang}...")
+    return await get_new_words(handler, state, page_size=page_size)
+
+
+async def get_words_for_language_async(
+    handler: LingqHandler,
+    opath: Path,
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    window: int = DEFAULT_WINDOW,
+    fmt: DumpFormat = "json",
+    incremental: bool = False,
+    store: CardStore | None = None,
+) -> None:
+    """Get all LingQs for the given language.
+
+    Next to the dump, keep a sync state and a changelog of added, updated and deleted cards.
+
+    If incremental, only download the cards added since the previous dump, then merge them
+    into it. Fall back to a full download when this is not possible, or when the last one
+    is older than FULL_SYNC_INTERVAL, since changes to older cards are otherwise missed.
+
+    If a store is given, also write the cards to it.
+    """
+    lang = handler.lang
+    dump_folder = opath / "lingqs" / lang
+    dump_path = get_dump_path(opath, lang, fmt)
+    state_path = dump_folder / SYNC_STATE_FILENAME
+    old_dump_path = find_dump(dump_folder)
+    old_state = SyncState.load(state_path) if old_dump_path else None
+
+    new_words = None
+    if incremental and old_state is not None:
+        new_words = await get_recent_words(handler, old_state, page_size=page_size)
+    if new_words is None:
+        state = await download_words(
+            handler, dump_path, fmt, page_size=page_size, window=window, store=store
+        )
+    else:
+        assert old_dump_path is not None and old_state is not None
+        added, updated = new_words
+        n_known = len(old_state.hashes)
+        if not added and not updated:
+            if store:
+                update_store(store, lang, old_dump_path, n_known, [])
+            logger.success(f"Words for {lang} are up to date at {old_dump_path}")
+            return
+        state = old_state.model_copy(deep=True)
+        with WordsWriter(dump_path, fmt) as writer:
+            for card in iter_dump(old_dump_path):
+                writer.write_cards([updated.get(card.pk, card)])
+            writer.write_cards(added)
+        for card in [*added, *updated.values()]:
+            state.add(card)
+        if store:
+            update_store(store, lang, dump_path, n_known, [*added, *updated.values()])
+
+    if old_dump_path is not None and old_dump_path != dump_path:
+        old_dump_path.unlink()
+    state.save(state_path)
+
+    if old_state is not None:
+        old_hashes = old_state.hashes
+        record_changes(
+            dump_folder,
+            added=[pk for pk in state.hashes if pk not in old_hashes],
+            updated=[pk for pk, h in state.hashes.items() if old_hashes.get(pk, h) != h],
+            deleted=[pk for pk in old_hashes if pk not in state.hashes],
+        )
     logger.success(f"Wrote words at {dump_path}")
 
 
-async def get_words_async(langs: list[str], opath: Path) -> None:
-    for lang in langs:
-        dump = await get_words_for_language_async(lang)
-        write_words_for_language(lang, opath, dump)
+async def get_words_async(
+    langs: list[str],
+    opath: Path,
+    *,
+    window: int,
+    fmt: DumpFormat,
+    incremental: bool,
+    sqlite: bool,
+    parallel_langs: int,
+) -> None:
+    """Get the LingQs of every language, 'parallel_langs' languages at a time.
+
+    Every language goes through the same session, rate limiter and retry budget.
+    """
+    if sqlite and parallel_langs > 1:
+        # A language writes to the store in a single transaction, for its whole download.
+        logger.warning("Ignoring --parallel-langs: the store takes one language at a time.")
+        parallel_langs = 1
+    semaphore = asyncio.Semaphore(parallel_langs)
+    store_path = opath / "lingqs" / STORE_FILENAME
+
+    async def get_words_for_language(handler: LingqHandler) -> None:
+        async with semaphore:
+            await get_words_for_language_async(
+                handler, opath, window=window, fmt=fmt, incremental=incremental, store=store
+            )
+
+    with CardStore(store_path) if sqlite else nullcontext() as store:
+        async with LingqHandler("Filler") as base_handler:
+            await asyncio.gather(
+                *(get_words_for_language(base_handler.for_lang(lang)) for lang in langs)
+            )
+    if sqlite:
+        logger.success(f"Wrote words to the store at {store_path}")
 
 
 @timing
-def get_words(langs: list[str], opath: Path) -> None:
+def get_words(
+    langs: list[str],
+    opath: Path,
+    *,
+    window: int = DEFAULT_WINDOW,
+    fmt: DumpFormat = "json",
+    incremental: bool = False,
+    sqlite: bool = False,
+    parallel_langs: int = 1,
+) -> None:
     """Get all words (LingQs) for the given languages.
 
     If no language codes are given, use all languages.
@@ -72,7 +393,17 @@ def get_words(langs: list[str], opath: Path) -> None:
     if not langs:
         langs = LingqHandler.get_user_langs()
     logger.info(f"Getting words for languages: {', '.join(langs)}")
-    asyncio.run(get_words_async(langs, opath))
+    run_async(
+        get_words_async(
+            langs,
+            opath,
+            window=window,
+            fmt=fmt,
+            incremental=incremental,
+            sqlite=sqlite,
+            parallel_langs=parallel_langs,
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -1,6 +1,4 @@
-import asyncio
-
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 
 
 async def merge_async(
@@ -25,7 +23,7 @@ def merge(
 
     The old course, even if it remains without any lessons, will not be deleted.
     """
-    asyncio.run(merge_async(lang, fr_course_id, to_course_id))
+    run_async(merge_async(lang, fr_course_id, to_course_id))
 
 
 if __name__ == "__main__":
@@ -1,12 +1,11 @@
 # Script by @bamboozled
 # https://forum.lingq.com/t/export-your-lingq-text-content-as-a-tree-of-files-to-google-drive/164914/9
 
-import asyncio
 import csv
 from pathlib import Path
 from typing import Any
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
 from lingq.models.collection_v3 import SearchCollectionResult, SearchCollections
 
@@ -87,7 +86,7 @@ def write_to_csv(lang: str, data_list: list[Any]) -> None:
 
 def overview(lang: str) -> None:
     """Make a library overview."""
-    asyncio.run(fetch_and_save_to_csv(lang))
+    run_async(fetch_and_save_to_csv(lang))
 
 
 if __name__ == "__main__":
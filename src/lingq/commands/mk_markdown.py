@@ -2,7 +2,7 @@ import asyncio
 from datetime import datetime
 from pathlib import Path
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
 from lingq.models.collection import Collection
 from lingq.models.collection_v3 import SearchCollectionResult
@@ -133,12 +133,12 @@ async def make_markdown_async(
     Path.mkdir(courses_folder, parents=True, exist_ok=True)
     write_readme(langs, readme_folder)
 
-    async with LingqHandler("Filler") as handler:
+    async with LingqHandler("Filler") as base_handler:
         n_languages = len(langs)
         for idx, lang in enumerate(langs, 1):
             logger.info(f"Starting download for {lang} ({idx} of {n_languages})")
 
-            handler.lang = lang
+            handler = base_handler.for_lang(lang)
             collections_list = await get_collections(handler, select_courses)
 
             if not collections_list:
@@ -173,7 +173,7 @@ def markdown(
     """
     if not langs:
         langs = LingqHandler.get_user_langs()
-    asyncio.run(make_markdown_async(langs, select_courses, include_views, out_folder))
+    run_async(make_markdown_async(langs, select_courses, include_views, out_folder))
 
 
 if __name__ == "__main__":
@@ -16,24 +16,30 @@ What to do once you managed to create a yomitan dictionary:
 (7) That is all. If you want to further customize Yomitan check their guides.
 """
 
-import io
+import hashlib
 import json
 import sys
 import zipfile
+from collections import deque
+from collections.abc import Callable, Collection, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
+from itertools import batched
+from multiprocessing import get_context
 from pathlib import Path
-from typing import Any, Literal, TypedDict, get_args
+from typing import Any, TypedDict, assert_never
 
+from pydantic import BaseModel, ValidationError
+
+from lingq.commands.choices import DEFAULT_BANK_SIZE, YomitanDictTy
+from lingq.commands.get_words import find_dump, iter_raw_dump
 from lingq.lingqhandler import LingqHandler
 from lingq.log import logger
 from lingq.models.cards import Card
+from lingq.store import STORE_FILENAME, CardStore
 
 YomitanIndex = dict[str, int | str | bool]
-YomitanDictTy = Literal["simple", "normal"]
-"""The type of the Yomitan dictionary."""
-
-YOMITAN_DICT_CHOICES: list[YomitanDictTy] = list(get_args(YomitanDictTy))
-
 Definition = Any
 
 
@@ -49,7 +55,20 @@ class YomitanEntryModel(TypedDict):
 
 
 YomitanEntry = list[str | int | list[Definition]]
-YomitanDict = list[YomitanEntry]
+YomitanMetaEntry = list[str | dict[str, int | str]]
+YomitanTag = list[str | int]
+
+Banks = tuple[bytes, bytes]
+"""The serialized term bank of a chunk of cards, and its term meta bank."""
+
+STATUS_NAMES = {1: "new", 2: "recognized", 3: "familiar", 4: "learned", 5: "known"}
+"""The statuses displayed by LingQ, cf. Card.displayed_status."""
+
+RawCard = dict[str, Any] | str
+"""A card that has not been validated yet: either parsed JSON or a JSON string."""
+
+GENERATOR_VERSION = 3
+"""Bump this whenever the generated dictionaries change, to invalidate the build caches."""
 
 
 def get_dictionary_title(lang: str, dict_ty: YomitanDictTy) -> str:
@@ -58,6 +77,8 @@ def get_dictionary_title(lang: str, dict_ty: YomitanDictTy) -> str:
             return f"lingq-{lang}"
         case "simple":
             return f"lingq-{lang}-simple"
+        case _:
+            assert_never(dict_ty)
 
 
 def get_dictionary_index(lang: str, dict_ty: YomitanDictTy) -> YomitanIndex:
@@ -77,9 +98,23 @@ def get_dictionary_index(lang: str, dict_ty: YomitanDictTy) -> YomitanIndex:
         "sourceLanguage": lang,
         "targetLanguage": "en",
         "title": get_dictionary_title(lang, dict_ty),
+        # The frequencies of term_meta_bank are LingQ importances: higher is more important.
+        "frequencyMode": "occurrence-based",
     }
 
 
+def get_tag_bank() -> list[YomitanTag]:
+    """Describe the status tags.
+
+    Each status has its own category, used by the styles to colour it.
+    """
+    # Format: [name, category, order, notes, score]
+    return [
+        [str(status), f"status-{status}", 0, f"Status {status}: {name}", 0]
+        for status, name in STATUS_NAMES.items()
+    ]
+
+
 def get_styles_css() -> str:
     """Add a minimal palette for word status and aligns the backlink.
 
@@ -94,27 +129,27 @@ def get_styles_css() -> str:
     """
     return """
 
-.tag[data-details='1'] .tag-label {
+.tag[data-category='status-1'] .tag-label {
   color: black;
   background-color: #fbe493;
 }
 
-.tag[data-details='2'] .tag-label {
+.tag[data-category='status-2'] .tag-label {
   color: black;
   background-color: #fff2c5;
 }
 
-.tag[data-details='3'] .tag-label {
+.tag[data-category='status-3'] .tag-label {
   color: black;
   background-color: #fff7db;
 }
 
-.tag[data-details='4'] .tag-label {
+.tag[data-category='status-4'] .tag-label {
   color: black;
   background-color: #a8e6a3;
 }
 
-.tag[data-details='5'] .tag-label {
+.tag[data-category='status-5'] .tag-label {
   color: black;
   background-color: #28a745;
 }
@@ -292,7 +327,7 @@ def card_to_yomitan_entry_simple(card: Card) -> YomitanEntry:
 
     Contains only the terms, tags (coloured) and hints with no format.
     """
-    tags_items = [str(card.status), *card.tags]
+    tags_items = [str(card.displayed_status()), *card.tags]
     tags = " ".join(tags_items)
 
     entry: YomitanEntry = [
@@ -308,47 +343,301 @@ def card_to_yomitan_entry_simple(card: Card) -> YomitanEntry:
     return entry
 
 
-def yomitan_for_language(dump_path: Path, lang: str, dict_ty: YomitanDictTy) -> YomitanDict:
-    """Read and convert the JSON obtained from LingQ.
+def card_to_yomitan_meta(card: Card) -> YomitanMetaEntry:
+    """Frequency of the card, from its LingQ importance. Its status is also displayed."""
+    status = card.displayed_status()
+    frequency: dict[str, int | str] = {
+        "value": card.importance,
+        "displayValue": f"{card.importance} ({STATUS_NAMES[status]})",
+    }
+    return [card.term, "freq", frequency]
+
+
+def read_raw_cards(
+    dump_path: Path,
+    lang: str,
+    *,
+    store: CardStore | None = None,
+    statuses: Collection[int] | None = None,
+) -> Iterator[RawCard]:
+    """Read the cards obtained from LingQ, without validating them.
 
-    There is no need to split the dictionary into smaller jsons. It should be small enough.
+    Read from the store if given, else from the dump. Only the store filters by status.
     """
-    lingq_json_path = dump_path / "lingqs.json"
-    if not lingq_json_path.exists():
-        logger.error(f"Dump not found at {lingq_json_path}.")
+    if store is not None:
+        check_store(store, lang)
+        yield from store.iter_cards_json(lang, statuses=statuses)
+        return
+
+    yield from iter_raw_dump(get_lingq_dump_path(dump_path, lang))
+
+
+def check_store(store: CardStore, lang: str) -> None:
+    if not store.count(lang):
+        logger.error(f"No words for {lang} in the store at {store.path}.")
+        logger.error(f"First run the following command: lingq get words --sqlite {lang}")
+        sys.exit(1)
+
+
+def get_lingq_dump_path(dump_path: Path, lang: str) -> Path:
+    lingq_dump_path = find_dump(dump_path)
+    if lingq_dump_path is None:
+        logger.error(f"Dump not found at {dump_path / 'lingqs.json'}.")
         logger.error(f"First run the following command: lingq get words {lang}")
         sys.exit(1)
+    return lingq_dump_path
 
-    with lingq_json_path.open("r", encoding="utf-8") as f:
-        words = json.load(f)
-        words = [Card.model_validate(word) for word in words]
 
+def get_entry_converter(dict_ty: YomitanDictTy) -> Callable[[Card], YomitanEntry]:
     match dict_ty:
         case "normal":
-            fn = card_to_yomitan_entry
+            return card_to_yomitan_entry
         case "simple":
-            fn = card_to_yomitan_entry_simple
+            return card_to_yomitan_entry_simple
+        case _:
+            assert_never(dict_ty)
+
+
+def encode_entry(entry: YomitanEntry | YomitanMetaEntry) -> bytes:
+    """Serialize compactly an entry, as written in the term (meta) banks."""
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode()
 
-    yomitan_dict = [fn(card) for card in words]
 
-    return yomitan_dict
+def convert_chunk(
+    raw_cards: Iterable[RawCard],
+    dict_ty: YomitanDictTy,
+    statuses: Collection[int] | None,
+) -> Banks | None:
+    """Validate, filter, convert and serialize a chunk of cards into a term bank.
+
+    The term meta bank is made in the same pass, cf. card_to_yomitan_meta.
+
+    Runs in a worker process when building in parallel: only the banks are sent back.
+    Return None if no card is left after filtering.
+    """
+    fn = get_entry_converter(dict_ty)
+    entries: list[bytes] = []
+    metas: list[bytes] = []
+    for raw_card in raw_cards:
+        if isinstance(raw_card, str):
+            card = Card.model_validate_json(raw_card)
+        else:
+            card = Card.model_validate(raw_card)
+        if statuses is None or card.displayed_status() in statuses:
+            entries.append(encode_entry(fn(card)))
+            metas.append(encode_entry(card_to_yomitan_meta(card)))
+    if not entries:
+        return None
+    return b"[" + b",".join(entries) + b"]", b"[" + b",".join(metas) + b"]"
+
+
+class BuildCache(BaseModel):
+    """What we know about the previous build of a dictionary, to only redo what changed.
+
+    Attributes:
+        key (str): Hash of the input and of the build settings.
+        banks (dict[str, int | None]): For every chunk hash, the number of its banks
+            in the previous zip, or None if no card of the chunk was kept.
+
+    """
+
+    key: str
+    banks: dict[str, int | None] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> "BuildCache | None":
+        if not path.exists():
+            return None
+        try:
+            return cls.model_validate_json(path.read_text(encoding="utf-8"))
+        except ValidationError:
+            logger.warning(f"Ignoring outdated build cache at {path}")
+            return None
+
+    def save(self, path: Path) -> None:
+        path.write_text(self.model_dump_json(), encoding="utf-8")
+
+
+def get_settings_hash(
+    dict_ty: YomitanDictTy, bank_size: int, statuses: Collection[int] | None
+) -> str:
+    statuses_str = ",".join(map(str, sorted(statuses))) if statuses is not None else "all"
+    settings = f"{GENERATOR_VERSION}|{dict_ty}|{bank_size}|{statuses_str}"
+    return hashlib.sha1(settings.encode()).hexdigest()[:16]
+
+
+def get_input_hash(
+    dump_path: Path,
+    lang: str,
+    *,
+    store: CardStore | None = None,
+    statuses: Collection[int] | None = None,
+) -> str:
+    """Hash the dump file, or the cards of the language in the store."""
+    h = hashlib.sha1()
+    if store is not None:
+        for card_json in read_raw_cards(dump_path, lang, store=store, statuses=statuses):
+            assert isinstance(card_json, str)
+            h.update(card_json.encode())
+    else:
+        with get_lingq_dump_path(dump_path, lang).open("rb") as f:
+            while chunk := f.read(1 << 20):
+                h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def get_chunk_hash(settings_hash: str, raw_cards: Iterable[RawCard]) -> str:
+    h = hashlib.sha1(settings_hash.encode())
+    for raw_card in raw_cards:
+        if isinstance(raw_card, str):
+            h.update(raw_card.strip().encode())
+        else:
+            h.update(json.dumps(raw_card, ensure_ascii=False).encode())
+    return h.hexdigest()[:16]
+
+
+def iter_term_banks(
+    raw_cards: Iterable[RawCard],
+    dict_ty: YomitanDictTy,
+    *,
+    settings_hash: str,
+    bank_size: int,
+    statuses: Collection[int] | None = None,
+    reuse: Callable[[str], tuple[bool, Banks | None]] | None = None,
+    pool: ProcessPoolExecutor | None = None,
+    window: int = 1,
+) -> Iterator[tuple[str, Banks | None]]:
+    """Yield the hash and the banks of every chunk of 'bank_size' cards, in order.
+
+    Chunks already built are taken from 'reuse' when possible. The others are converted
+    in the pool if given, with at most 'window' chunks in flight.
+    """
+    futures: deque[tuple[str, Future[Banks | None]]] = deque()
+    try:
+        for chunk in batched(raw_cards, bank_size):
+            chunk_hash = get_chunk_hash(settings_hash, chunk)
+            found, banks = reuse(chunk_hash) if reuse is not None else (False, None)
+            if found or pool is None:
+                future: Future[Banks | None] = Future()
+                future.set_result(banks if found else convert_chunk(chunk, dict_ty, statuses))
+            else:
+                future = pool.submit(convert_chunk, chunk, dict_ty, statuses)
+            futures.append((chunk_hash, future))
+            if len(futures) >= window:
+                chunk_hash, future = futures.popleft()
+                yield chunk_hash, future.result()
+        while futures:
+            chunk_hash, future = futures.popleft()
+            yield chunk_hash, future.result()
+    finally:
+        for _, future in futures:
+            future.cancel()
 
 
 def write_yomitan_dict(
-    lang: str, out_path: Path, yomitan_dict: YomitanDict, dict_ty: YomitanDictTy
-) -> None:
-    """Write the zipped yomitan dict."""
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
+    lang: str,
+    out_path: Path,
+    chunk_banks: Iterable[tuple[str, Banks | None]],
+    dict_ty: YomitanDictTy,
+) -> dict[str, int | None]:
+    """Write the zipped yomitan dict, one chunk of banks at a time.
+
+    Return the number of the banks of every chunk hash, cf. BuildCache.
+    """
+    bank_numbers: dict[str, int | None] = {}
+    with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
         index = get_dictionary_index(lang, dict_ty)
         zipf.writestr("index.json", json.dumps(index, indent=2, ensure_ascii=False))
         styles = get_styles_css()
         zipf.writestr("styles.css", styles)
-        # No need to split the banks, the files are small
-        zipf.writestr("term_bank_1.json", json.dumps(yomitan_dict, indent=2, ensure_ascii=False))
+        tag_bank = get_tag_bank()
+        zipf.writestr("tag_bank_1.json", json.dumps(tag_bank, indent=2, ensure_ascii=False))
+        n_banks = 0
+        for chunk_hash, banks in chunk_banks:
+            if banks is None:
+                bank_numbers[chunk_hash] = None
+                continue
+            n_banks += 1
+            bank_numbers[chunk_hash] = n_banks
+            term_bank, term_meta_bank = banks
+            zipf.writestr(f"term_bank_{n_banks}.json", term_bank)
+            zipf.writestr(f"term_meta_bank_{n_banks}.json", term_meta_bank)
+        if n_banks == 0:
+            zipf.writestr("term_bank_1.json", "[]")
+    return bank_numbers
+
+
+def yomitan_language(
+    lang: str,
+    opath: Path,
+    *,
+    dict_ty: YomitanDictTy,
+    sqlite: bool,
+    statuses: Collection[int] | None,
+    bank_size: int,
+    pool: ProcessPoolExecutor | None,
+    jobs: int,
+    force: bool,
+) -> None:
+    """Make the Yomitan dictionary of a language.
+
+    Next to the dictionary, keep a build cache. If neither the words nor the settings
+    changed, do nothing. Otherwise only rebuild the term banks whose cards changed,
+    and copy the others from the previous dictionary.
+
+    If a pool is given, the cards are converted by its worker processes.
+    """
+    dump_path = opath / lang
+    yomitan_dict_title = get_dictionary_title(lang, dict_ty)
+    out_path = dump_path / f"{yomitan_dict_title}.zip"
+    tmp_path = out_path.with_name(f"{out_path.name}.tmp")
+    cache_path = dump_path / f"{yomitan_dict_title}.cache.json"
+
+    # One connection per language: languages may be built in different threads.
+    with CardStore(opath / STORE_FILENAME) if sqlite else nullcontext() as store:
+        settings_hash = get_settings_hash(dict_ty, bank_size, statuses)
+        input_hash = get_input_hash(dump_path, lang, store=store, statuses=statuses)
+        key = f"{settings_hash}-{input_hash}"
+        cache = BuildCache.load(cache_path) if out_path.exists() and not force else None
+        if cache is not None and cache.key == key:
+            logger.success(f"Dictionary for {lang} is up to date at: {out_path}")
+            return
 
-    with out_path.open("wb") as f:
-        f.write(zip_buffer.getvalue())
+        logger.info(f"Converting to yomitan format for {lang}...")
+        with zipfile.ZipFile(out_path) if cache is not None else nullcontext() as old_zipf:
+
+            def reuse(chunk_hash: str) -> tuple[bool, Banks | None]:
+                if old_zipf is None or cache is None or chunk_hash not in cache.banks:
+                    return False, None
+                n = cache.banks[chunk_hash]
+                if n is None:
+                    return True, None
+                banks = (
+                    old_zipf.read(f"term_bank_{n}.json"),
+                    old_zipf.read(f"term_meta_bank_{n}.json"),
+                )
+                return True, banks
+
+            raw_cards = read_raw_cards(dump_path, lang, store=store, statuses=statuses)
+            chunk_banks = iter_term_banks(
+                raw_cards,
+                dict_ty,
+                settings_hash=settings_hash,
+                bank_size=bank_size,
+                # The store already filters by status.
+                statuses=None if store else statuses,
+                reuse=reuse,
+                pool=pool,
+                window=2 * jobs,
+            )
+            # The previous dictionary is only replaced once the new one is complete.
+            bank_numbers = write_yomitan_dict(lang, tmp_path, chunk_banks, dict_ty)
+
+    tmp_path.replace(out_path)
+    n_reused = sum(chunk_hash in cache.banks for chunk_hash in bank_numbers) if cache else 0
+    logger.debug(f"Reused {n_reused}/{len(bank_numbers)} term banks for {lang}")
+    BuildCache(key=key, banks=bank_numbers).save(cache_path)
+    logger.success(f"Finished dictionary for {lang} at: {out_path}")
 
 
 def yomitan(
@@ -356,22 +645,50 @@ def yomitan(
     opath: Path,
     *,
     dict_ty: YomitanDictTy = "normal",
+    sqlite: bool = False,
+    statuses: Collection[int] | None = None,
+    bank_size: int = DEFAULT_BANK_SIZE,
+    jobs: int = 1,
+    force: bool = False,
 ) -> None:
     """Make a Yomitan dictionary from the result of 'lingq get words'.
 
     If no language codes are given, use all languages.
+    If sqlite, read the words from the store instead of the dumps.
+    If statuses are given, only include words with those statuses (1-5).
+    If jobs > 1, convert the cards in that many processes and build the languages
+    concurrently.
+    Unchanged dictionaries are not rebuilt, unless force.
     """
     if not langs:
         langs = LingqHandler.get_user_langs()
 
     logger.debug(f"Chosen dictionary type: {dict_ty}")
 
-    for lang in langs:
-        dump_path = opath / lang
-        logger.info(f"Converting to yomitan format for {lang}...")
-        yomitan_dict = yomitan_for_language(dump_path, lang, dict_ty)
-        yomitan_dict_title = get_dictionary_title(lang, dict_ty)
-        out_path = dump_path / f"{yomitan_dict_title}.zip"
-        logger.info("Writing dictionary...")
-        write_yomitan_dict(lang, out_path, yomitan_dict, dict_ty)
-        logger.success(f"Finished dictionary for {lang} at: {out_path}")
+    def build(lang: str, pool: ProcessPoolExecutor | None) -> None:
+        yomitan_language(
+            lang,
+            opath,
+            dict_ty=dict_ty,
+            sqlite=sqlite,
+            statuses=statuses,
+            bank_size=bank_size,
+            pool=pool,
+            jobs=jobs,
+            force=force,
+        )
+
+    if jobs == 1 or not langs:
+        for lang in langs:
+            build(lang, None)
+        return
+
+    # The workers are started from the threads: forking a multi-threaded process may
+    # deadlock, so spawn them instead.
+    with (
+        ProcessPoolExecutor(max_workers=jobs, mp_context=get_context("spawn")) as pool,
+        ThreadPoolExecutor(max_workers=min(jobs, len(langs))) as threads,
+    ):
+        futures = [threads.submit(build, lang, pool) for lang in langs]
+        for future in futures:
+            future.result()
@@ -1,7 +1,6 @@
-import asyncio
 from pathlib import Path
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
 from lingq.utils import double_check, sorted_subpaths, timing
 
@@ -39,7 +38,7 @@ def patch_audios(lang: str, course_id: int, audios_folder: Path) -> None:
     editing has already be done, and we wouldn't want to upload the text again.
     """
     # The blank audios were found here: https://github.com/anars/blank-audio.
-    asyncio.run(patch_audios_async(lang, course_id, audios_folder))
+    run_async(patch_audios_async(lang, course_id, audios_folder))
 
 
 if __name__ == "__main__":
@@ -3,23 +3,19 @@
 Note: Posting only audio triggers whisper transcript generation on their servers.
 """
 
-import asyncio
 from pathlib import Path
-from typing import Literal
 
 import aiohttp
 import Levenshtein
 
-from lingq.lingqhandler import LingqHandler
+from lingq.commands.choices import PAIRING_STRATEGIES, Strategy
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
 from lingq.utils import double_check, get_editor_url, sorted_subpaths, timing
 
 SUPPORTED_BY_LINGQ_AUDIO_EXTENSIONS = [".mp3", ".m4a"]
 SUPPORTED_BY_US_TEXT_EXTENSIONS = [".txt", ".srt", ".vtt"]
 SUPPORTED_BY_US_AUDIO_EXTENSIONS = SUPPORTED_BY_LINGQ_AUDIO_EXTENSIONS
-PAIRING_STRATEGIES = ["zip", "zipsort", "exact", "fuzzy"]
-
-Strategy = Literal["zip", "zipsort", "exact", "fuzzy"]
 Pairing = tuple[Path | None, Path | None]
 Pairings = list[Pairing]
 
@@ -225,7 +221,7 @@ def post(
         pairing_strategy (str, optional): How to pair text and audio files.
             Options are: ["zip", "zipsort", "exact", "fuzzy"]
     """
-    asyncio.run(
+    run_async(
         post_async(
             lang,
             course_id,
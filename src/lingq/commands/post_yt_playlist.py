@@ -12,7 +12,7 @@ from typing import Any
 
 import yt_dlp  # type: ignore
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
 from lingq.utils import timing
 
@@ -193,7 +193,7 @@ def post_yt_playlist(
         skip_no_cc (bool): If True, skip videos without Closed Captions (CC).
             Requires download_audio_info to be true in order to get the necessary information.
     """
-    asyncio.run(
+    run_async(
         post_yt_playlist_async(
             lang,
             course_id,
@@ -1,7 +1,6 @@
-import asyncio
 import re
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
 
 
@@ -46,7 +45,7 @@ async def reindex_async(lang: str, course_id: int, *, dry_run: bool) -> None:
 
 def reindex(lang: str, course_id: int, *, dry_run: bool = False) -> None:
     """Reindex course titles."""
-    asyncio.run(reindex_async(lang, course_id, dry_run=dry_run))
+    run_async(reindex_async(lang, course_id, dry_run=dry_run))
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@ import asyncio
 
 from loguru import logger
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.utils import double_check, timing
 
 
@@ -30,7 +30,7 @@ def replace(
     assume_yes: bool,
 ) -> None:
     """Replace text in a course."""
-    asyncio.run(replace_async(lang, course_id, replacements, assume_yes))
+    run_async(replace_async(lang, course_id, replacements, assume_yes))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 import asyncio
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.utils import double_check, timing
 
 
@@ -19,7 +19,7 @@ async def resplit_async(lang: str, course_id: int) -> None:
             )
             tasks = [handler.resplit_lesson(lesson.id) for lesson in lessons]
         else:
-            lesson = await handler.get_lesson_from_id(lessons[0].id)
+            lesson = await handler.get_lesson_view_from_id(lessons[0].id, projection="text")
             lesson_text = lesson.get_raw_text()
             data = {"text": lesson_text}
             tasks = [handler.resplit_lesson(lesson.id, data) for lesson in lessons]
@@ -28,7 +28,7 @@ async def resplit_async(lang: str, course_id: int) -> None:
 
 @timing
 def resplit(lang: str, course_id: int) -> None:
-    asyncio.run(resplit_async(lang, course_id))
+    run_async(resplit_async(lang, course_id))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 import asyncio
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.models.collection_v3 import CollectionLessonResult
 from lingq.models.counter import Counter
 
@@ -104,7 +104,7 @@ def show_my(
     verbose: bool,
 ) -> None:
     """Show my collections in a language."""
-    titles = asyncio.run(get_my_collections_titles_async(lang, shared, codes, verbose))
+    titles = run_async(get_my_collections_titles_async(lang, shared, codes, verbose))
     for idx, title in enumerate(titles, 1):
         print(f"{idx:02}: {title}")
 
@@ -118,7 +118,7 @@ def show_course(
     verbose: bool,
 ) -> None:
     """Show lessons in a language."""
-    titles = asyncio.run(get_course_titles_async(lang, course_id, shared, codes, verbose))
+    titles = run_async(get_course_titles_async(lang, course_id, shared, codes, verbose))
     for idx, title in enumerate(titles, 1):
         print(f"{idx:02}: {title}")
 
@@ -152,7 +152,7 @@ async def get_status_titles_async(lang: str) -> list[str]:
 
 def show_status(lang: str) -> None:
     """Show pending and refused lessons in a language."""
-    titles = asyncio.run(get_status_titles_async(lang))
+    titles = run_async(get_status_titles_async(lang))
     for idx, title in enumerate(titles, 1):
         print(f"{idx:02}: {title}")
 
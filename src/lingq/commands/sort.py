@@ -1,7 +1,6 @@
-import asyncio
 import re
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 from lingq.log import logger
 from lingq.models.collection_v3 import CollectionLessonResult
 from lingq.utils import sort_by_greek_words_impl, timing
@@ -160,7 +159,7 @@ async def sort_lessons_async(lang: str, course_id: int, *, dry_run: bool) -> Non
 @timing
 def sort_lessons(lang: str, course_id: int, *, dry_run: bool = False) -> None:
     """Sort course lessons."""
-    asyncio.run(sort_lessons_async(lang, course_id, dry_run=dry_run))
+    run_async(sort_lessons_async(lang, course_id, dry_run=dry_run))
 
 
 if __name__ == "__main__":
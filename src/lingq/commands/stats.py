@@ -1,7 +1,6 @@
-import asyncio
 import datetime
 
-from lingq.lingqhandler import LingqHandler
+from lingq.lingqhandler import LingqHandler, run_async
 
 
 async def stats_async(lang: str) -> None:
@@ -19,7 +18,7 @@ async def stats_async(lang: str) -> None:
 
 def stats(lang: str) -> None:
     """Show stats."""
-    asyncio.run(stats_async(lang))
+    run_async(stats_async(lang))
 
 
 if __name__ == "__main__":
@@ -8,6 +8,29 @@ CONFIG_DIR = Path(user_config_dir(appname="lingq"))
 CONFIG_PATH = CONFIG_DIR / ".env"
 
 
+def _get_number[T: (int, float)](config: dict[str, str | None], key: str, ty: type[T]) -> T | None:
+    """Get an optional numeric setting from the config file, or exit if it is malformed."""
+    value = config.get(key)
+    if value is None:
+        return None
+    try:
+        return ty(value)
+    except ValueError:
+        print(f"Error: invalid value for {key} in the config file at {CONFIG_PATH}: '{value}'.")
+        sys.exit(1)
+
+
+def _get_bool(config: dict[str, str | None], key: str) -> bool:
+    """Get an optional boolean setting from the config file, or exit if it is malformed."""
+    value = config.get(key)
+    if value is None:
+        return False
+    if value.lower() not in ("true", "false", "1", "0"):
+        print(f"Error: invalid value for {key} in the config file at {CONFIG_PATH}: '{value}'.")
+        sys.exit(1)
+    return value.lower() in ("true", "1")
+
+
 class Config:
     def __init__(self) -> None:
         if not CONFIG_PATH.exists():
@@ -32,3 +55,28 @@ class Config:
 
         self.key = config["APIKEY"]
         self.headers = {"Authorization": f"Token {self.key}"}
+
+        # Optional settings to tune the rate limiter (cf. lingq.ratelimiter):
+        # REQUESTS_PER_SECOND=5
+        # MAX_IN_FLIGHT=8
+        self.requests_per_second = _get_number(config, "REQUESTS_PER_SECOND", float)
+        self.max_in_flight = _get_number(config, "MAX_IN_FLIGHT", int)
+
+        # Optional on-disk cache of the API responses (cf. lingq.httpcache):
+        # HTTP_CACHE=true
+        self.http_cache = _get_bool(config, "HTTP_CACHE")
+
+        # Optional settings of the connection pool (cf. lingq.lingqhandler.make_session).
+        # Timeouts and keep-alive are in seconds:
+        # CONNECTION_LIMIT=32
+        # CONNECTION_LIMIT_PER_HOST=16
+        # KEEPALIVE_TIMEOUT=30
+        # DNS_CACHE_TTL=300
+        # CONNECT_TIMEOUT=30
+        # READ_TIMEOUT=120
+        self.connection_limit = _get_number(config, "CONNECTION_LIMIT", int)
+        self.connection_limit_per_host = _get_number(config, "CONNECTION_LIMIT_PER_HOST", int)
+        self.keepalive_timeout = _get_number(config, "KEEPALIVE_TIMEOUT", float)
+        self.dns_cache_ttl = _get_number(config, "DNS_CACHE_TTL", int)
+        self.connect_timeout = _get_number(config, "CONNECT_TIMEOUT", float)
+        self.read_timeout = _get_number(config, "READ_TIMEOUT", float)
@@ -0,0 +1,184 @@
+"""Long-lived daemon (lingq serve), and the thin client forwarding CLI calls to it.
+
+The daemon keeps a warm interpreter: the modules are imported once, and the languages
+used to validate arguments stay in memory (cf. LangType). The coroutines of the commands
+run on the event loop of the daemon (cf. run_async), where every handler shares one base
+handler: the connection pool, the state of the rate limiter and the caches outlive the
+commands. Commands run one at a time, in the working directory of the client, and their
+output is streamed back to it.
+
+Protocol, with one JSON object per line over a Unix socket:
+    client -> daemon: {"argv": ["show", "my", "el"], "cwd": "/home/me"}
+    daemon -> client: {"stdout": "..."} or {"stderr": "..."}, then {"exit_code": 0}
+
+The imports of the client are kept light, since it runs on every CLI call.
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any
+
+from platformdirs import user_cache_dir
+
+SOCKET_PATH = Path(user_cache_dir(appname="lingq")) / "lingq.sock"
+
+Send = Callable[[dict[str, Any]], None]
+
+
+def forward(argv: list[str], path: Path = SOCKET_PATH) -> int | None:
+    """Run a CLI call in the daemon, if it is running, and return its exit code.
+
+    Return None if there is no daemon to forward to.
+    """
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        # A stale socket, left by a daemon that did not exit cleanly.
+        sock.close()
+        return None
+
+    with sock, sock.makefile("rwb") as file:
+        request = {"argv": argv, "cwd": str(Path.cwd())}
+        file.write(json.dumps(request).encode() + b"\n")
+        file.flush()
+        for line in file:
+            message = json.loads(line)
+            if "exit_code" in message:
+                return int(message["exit_code"])
+            stream = sys.stdout if "stdout" in message else sys.stderr
+            stream.write(message.get("stdout") or message.get("stderr") or "")
+            stream.flush()
+    print("Error: lost the connection to the lingq daemon.", file=sys.stderr)
+    return 1
+
+
+def main() -> None:
+    """Entry point of the CLI: forward to the daemon if it is running, else run here."""
+    argv = sys.argv[1:]
+    if argv[:1] != ["serve"] and (exit_code := forward(argv)) is not None:
+        sys.exit(exit_code)
+
+    from lingq.cli import cli
+
+    cli()
+
+
+class _Emitter(io.TextIOBase):
+    """Text stream that sends what is written to the client, as messages of 'key'."""
+
+    # Otherwise, click takes it for a binary stream and wraps it.
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, key: str, send: Send) -> None:
+        self.key = key
+        self.send = send
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            msg = f"write() argument must be str, not {type(text).__name__}"
+            raise TypeError(msg)
+        if text:
+            self.send({self.key: text})
+        return len(text)
+
+
+@contextmanager
+def command_context(cwd: Path, send: Send) -> Iterator[None]:
+    """Run what is inside in 'cwd', sending the output and the logs with 'send'.
+
+    It swaps process-wide state: it must be entered by the thread of the event loop,
+    for one command at a time.
+    """
+    from lingq.log import logger, logger_format
+
+    stdout, stderr = _Emitter("stdout", send), _Emitter("stderr", send)
+
+    def log_sink(message: str) -> None:
+        stderr.write(message)
+
+    sink_id = logger.add(log_sink, format=logger_format)
+    stdin, sys.stdin = sys.stdin, io.StringIO()
+    previous_cwd = Path.cwd()
+    os.chdir(cwd)
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            yield
+    finally:
+        os.chdir(previous_cwd)
+        sys.stdin = stdin
+        logger.remove(sink_id)
+
+
+def run_command(argv: list[str]) -> int:
+    """Run a CLI call in this process, and return its exit code. Cf. command_context."""
+    from traceback import print_exc
+
+    from lingq.cli import cli
+
+    try:
+        cli.main(argv, prog_name="lingq")
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else int(e.code is not None)
+    except EOFError:
+        print("Error: the daemon can not prompt. Use --yes, or stop the daemon.")
+        return 1
+    except Exception:
+        print_exc()
+        return 1
+    return 0
+
+
+async def serve(path: Path = SOCKET_PATH) -> None:
+    """Serve CLI calls over a Unix socket, until interrupted."""
+    import asyncio
+
+    from lingq.lingqhandler import LingqHandler
+    from lingq.log import logger
+
+    lock = asyncio.Lock()
+    loop = asyncio.get_running_loop()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        def send(message: dict[str, Any]) -> None:
+            line = json.dumps(message).encode() + b"\n"
+            loop.call_soon_threadsafe(writer.write, line)
+
+        try:
+            request = json.loads(await reader.readline())
+            async with lock:
+                logger.info(f"lingq {' '.join(request['argv'])}")
+                with command_context(Path(request["cwd"]), send):
+                    # In a thread, since the commands block until their coroutines,
+                    # sent back to this loop, are done.
+                    exit_code = await asyncio.to_thread(run_command, request["argv"])
+            writer.write(json.dumps({"exit_code": exit_code}).encode() + b"\n")
+            await writer.drain()
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logger.warning(f"Dropping a client: {e!r}")
+        finally:
+            writer.close()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    server = await asyncio.start_unix_server(handle, path=str(path))
+    # The daemon runs commands with our API key: only we may talk to it.
+    path.chmod(0o600)
+    logger.info(f"Serving on {path}")
+    async with LingqHandler("Filler") as base:
+        LingqHandler.share(base)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            LingqHandler.share(None)
+            path.unlink(missing_ok=True)
@@ -0,0 +1,170 @@
+"""Resumable downloads of big files, such as the audios of lessons.
+
+A download to 'path' is written to 'path.part', next to a sidecar 'path.part.json'
+that records the url, the expected length and the validators of the file.
+
+When the download is interrupted, the next one continues from the end of the partial
+file, with a Range request. If-Range makes the server send the whole file instead if
+it changed in the meantime.
+
+Once complete, the size of the file is checked against the expected length, and its MD5
+hash against the one sent by the server, if any (Content-MD5 or x-goog-hash). Only then
+is it renamed to 'path'.
+"""
+
+import base64
+import hashlib
+import re
+from collections.abc import Mapping
+from pathlib import Path
+from typing import BinaryIO
+
+from pydantic import BaseModel, ValidationError
+
+from lingq.log import logger
+
+CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+GOOG_MD5 = re.compile(r"md5=([A-Za-z0-9+/=]+)")
+
+
+class DownloadError(Exception):
+    """The download failed, or the downloaded file is not the expected one."""
+
+
+class PartialDownload(BaseModel):
+    """What the sidecar of a partial file records about the file being downloaded."""
+
+    url: str
+    length: int | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    md5: str | None = None
+
+    @classmethod
+    def from_headers(cls, url: str, headers: Mapping[str, str]) -> "PartialDownload":
+        """Make a record from the headers of a full (200) response."""
+        length = headers.get("Content-Length")
+        md5 = headers.get("Content-MD5")
+        if md5 is None and (goog_md5 := GOOG_MD5.search(headers.get("x-goog-hash", ""))):
+            md5 = goog_md5.group(1)
+        return cls(
+            url=url,
+            length=int(length) if length is not None else None,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            md5=md5,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "PartialDownload | None":
+        if not path.exists():
+            return None
+        try:
+            return cls.model_validate_json(path.read_text(encoding="utf-8"))
+        except ValidationError:
+            return None
+
+    def save(self, path: Path) -> None:
+        path.write_text(self.model_dump_json(), encoding="utf-8")
+
+
+class ResumableDownload:
+    """A download of 'url' to 'path', that picks up where a previous one stopped.
+
+    Usage:
+        download = ResumableDownload(url, path)
+        async with session.get(url, headers=download.request_headers()) as response:
+            with download.open(response.status, response.headers) as file:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    file.write(chunk)
+        download.finish()
+
+    """
+
+    def __init__(self, url: str, path: Path) -> None:
+        self.url = url
+        self.path = path
+        self.part_path = path.with_name(f"{path.name}.part")
+        self.state_path = path.with_name(f"{path.name}.part.json")
+        state = PartialDownload.load(self.state_path)
+        self.state = state if state is not None and state.url == url else None
+
+    @property
+    def offset(self) -> int:
+        """The number of bytes already downloaded."""
+        if self.state is None or not self.part_path.exists():
+            return 0
+        return self.part_path.stat().st_size
+
+    def request_headers(self) -> dict[str, str]:
+        # Ranges and lengths are those of the encoded body: do not let it be compressed.
+        headers = {"Accept-Encoding": "identity"}
+        if not (offset := self.offset) or self.state is None:
+            return headers
+        headers["Range"] = f"bytes={offset}-"
+        if validator := self.state.etag or self.state.last_modified:
+            headers["If-Range"] = validator
+        return headers
+
+    def is_complete(self) -> bool:
+        return self.state is not None and self.offset == self.state.length
+
+    def open(self, status: int, headers: Mapping[str, str]) -> BinaryIO:
+        """Open the partial file, to write the body of the response to."""
+        if status == 206:
+            self._check_content_range(headers.get("Content-Range", ""))
+            logger.debug(f"Resuming the download of {self.path.name} at {self.offset} bytes")
+            return self.part_path.open("ab")
+
+        # A full response: the first try, a changed file, or a server without ranges.
+        self.state = PartialDownload.from_headers(self.url, headers)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.state.save(self.state_path)
+        return self.part_path.open("wb")
+
+    def _check_content_range(self, content_range: str) -> None:
+        match = CONTENT_RANGE.fullmatch(content_range)
+        if match is None or int(match.group(1)) != self.offset:
+            self.discard()
+            msg = f"Unexpected Content-Range for {self.path.name}: '{content_range}'"
+            raise DownloadError(msg)
+        total = match.group(3)
+        if self.state is not None and total != "*" and int(total) != self.state.length:
+            self.discard()
+            msg = f"The size of {self.url} changed"
+            raise DownloadError(msg)
+
+    def finish(self) -> Path:
+        """Verify the partial file, then move it to 'path'.
+
+        An incomplete file is kept, to be resumed. A wrong one is discarded.
+        """
+        assert self.state is not None, "finish() called before open()"
+        size = self.offset
+        if self.state.length is not None and size < self.state.length:
+            msg = f"Incomplete download of {self.path.name}: {size}/{self.state.length} bytes"
+            raise DownloadError(msg)
+        if self.state.length is not None and size > self.state.length:
+            self.discard()
+            msg = f"Too big download of {self.path.name}: {size}/{self.state.length} bytes"
+            raise DownloadError(msg)
+        if self.state.md5 is not None and self._md5() != self.state.md5:
+            self.discard()
+            msg = f"Corrupted download of {self.path.name}: MD5 mismatch"
+            raise DownloadError(msg)
+
+        self.part_path.replace(self.path)
+        self.state_path.unlink(missing_ok=True)
+        return self.path
+
+    def discard(self) -> None:
+        self.part_path.unlink(missing_ok=True)
+        self.state_path.unlink(missing_ok=True)
+        self.state = None
+
+    def _md5(self) -> str:
+        md5 = hashlib.md5(usedforsecurity=False)
+        with self.part_path.open("rb") as file:
+            while chunk := file.read(1 << 20):
+                md5.update(chunk)
+        return base64.b64encode(md5.digest()).decode()
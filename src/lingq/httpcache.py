@@ -0,0 +1,155 @@
+"""Opt-in on-disk cache of the GET responses of the LingQ API.
+
+It is enabled with HTTP_CACHE=true in the config file, cf. lingq.config.
+
+Responses are keyed by url (with params) and are fresh for a time that depends on the
+endpoint, cf. TTLS. Past that time, they are revalidated with ETag / Last-Modified when
+the server sent them: a 304 response then costs no download.
+
+Our own writes (PATCH, POST, DELETE) invalidate the cached lessons and collections.
+
+Every account (API key) has its own cache file, cf. get_cache_path: responses such as
+the profile or the user collections are only valid for the account that fetched them.
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+from platformdirs import user_cache_dir
+
+CACHE_DIR = Path(user_cache_dir(appname="lingq"))
+
+MINUTE = 60.0
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+TTLS: list[tuple[re.Pattern[str], float]] = [
+    (re.compile(r"/languages"), DAY),
+    (re.compile(r"/profile/"), DAY),
+    (re.compile(r"/lessons/\d+/"), HOUR),
+    (re.compile(r"/search"), HOUR),
+    (re.compile(r"/collections/"), 10 * MINUTE),
+]
+"""How long (in seconds) the responses of an endpoint are fresh. The first match is used.
+
+Other responses are only kept if they can be revalidated.
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_url ON responses (url);
+"""
+
+LESSON_ID = re.compile(r"/lessons/(\d+)")
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    stored_at: float
+    etag: str | None
+    last_modified: str | None
+
+    def validators(self) -> dict[str, str]:
+        """The headers of a conditional request for this response."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def get_cache_path(api_key: str) -> Path:
+    """The cache file of the account of this API key."""
+    account = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return CACHE_DIR / f"responses-{account}.sqlite3"
+
+
+def get_ttl(url: str) -> float:
+    for pattern, ttl in TTLS:
+        if pattern.search(url):
+            return ttl
+    return 0.0
+
+
+class ResponseCache:
+    """SQLite cache of response bodies.
+
+    Usage:
+        cache = ResponseCache(get_cache_path(api_key))
+        key = ResponseCache.key("GET", url, params)
+        if (cached := cache.get(key)) and cache.is_fresh(cached, url):
+            return cached.body
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @staticmethod
+    def key(method: str, url: str, params: Mapping[str, Any] | None = None) -> str:
+        key = f"{method.upper()} {url}"
+        if params:
+            key += f"?{urlencode(sorted(params.items()), doseq=True)}"
+        return key
+
+    @staticmethod
+    def is_fresh(cached: CachedResponse, url: str) -> bool:
+        return time.time() - cached.stored_at < get_ttl(url)
+
+    def get(self, key: str) -> CachedResponse | None:
+        query = "SELECT body, stored_at, etag, last_modified FROM responses WHERE key = ?"
+        row = self._conn.execute(query, (key,)).fetchone()
+        return CachedResponse(*row) if row is not None else None
+
+    def put(self, key: str, url: str, body: bytes, headers: Mapping[str, str]) -> None:
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if get_ttl(url) <= 0 and etag is None and last_modified is None:
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (key, url, time.time(), etag, last_modified, body),
+        )
+
+    def touch(self, key: str) -> None:
+        """Mark a revalidated response as fresh again."""
+        self._conn.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+
+    def invalidate(self, url_prefix: str) -> None:
+        """Drop every response whose url starts with the prefix."""
+        escaped = url_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        self._conn.execute("DELETE FROM responses WHERE url LIKE ? ESCAPE '\\'", (f"{escaped}%",))
+
+    def invalidate_write(self, url: str, base_urls: Iterable[str]) -> None:
+        """Drop the responses that a write to this url may have made stale.
+
+        That is, the lesson written to if any, and every collection (listings, counters...)
+        and search under the base urls of the language.
+        """
+        lesson_id = LESSON_ID.search(url)
+        for base_url in base_urls:
+            if lesson_id is not None:
+                self.invalidate(f"{base_url}lessons/{lesson_id.group(1)}/")
+            self.invalidate(f"{base_url}collections")
+            self.invalidate(f"{base_url}search")
@@ -0,0 +1,184 @@
+"""Incremental reading of the top-level members of a JSON object.
+
+Used to only read the beginning of big responses: once the members we need are read,
+the rest of the response is not downloaded.
+
+Members are decoded with the standard JSONDecoder as soon as they are complete.
+An incomplete member is only decoded again once the buffer grew by an eighth, so that
+reading a member of size n costs O(n) (about nine decodes of it), and not O(n^2), and
+the reader stops at most n/8 past its end.
+
+Whole documents are decoded with 'loads': orjson if installed (pip install lingq[fast]),
+else the standard json module.
+"""
+
+import codecs
+import json
+import re
+from collections.abc import AsyncIterable, Callable, Iterable
+from typing import Any
+
+loads: Callable[[str | bytes], Any]
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+DECODER = json.JSONDecoder()
+RETRY_GROWTH = 8
+"""An incomplete member is decoded again once the buffer grew by 1/RETRY_GROWTH."""
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+CHUNK_SIZE = 1 << 16
+
+
+class IncompleteError(Exception):
+    """More text is needed to read the next member."""
+
+
+class JsonMembersReader:
+    """Read the top-level members of a JSON object, as its text arrives.
+
+    Usage:
+        reader = JsonMembersReader({"id", "title"})
+        for text in chunks:
+            if reader.feed(text):
+                break
+        members = reader.close()
+
+    Attributes:
+        keys (set[str]): The keys of the members to keep. The others are discarded.
+        first_item_keys (set[str]): Keys of arrays of which only the first item is kept.
+        members (dict[str, Any]): The members read so far.
+        done (bool): Whether every wanted member was read, or the object ended.
+
+    """
+
+    def __init__(self, keys: Iterable[str], *, first_item_keys: Iterable[str] = ()) -> None:
+        self.keys = set(keys)
+        self.first_item_keys = set(first_item_keys)
+        self.members: dict[str, Any] = {}
+        self.done = not self.keys
+
+        self._buffer = ""
+        self._pos = 0
+        self._retry_at = 0
+        self._started = False
+        # Set while skipping the remaining items of a 'first_item_keys' array.
+        self._in_array = False
+
+    def feed(self, text: str) -> bool:
+        """Feed more text. Return True once every wanted member was read."""
+        self._buffer += text
+        if self.done or len(self._buffer) - self._pos < self._retry_at:
+            return self.done
+        try:
+            while not self.done:
+                self._step()
+        except IncompleteError:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+            self._retry_at = len(self._buffer) + len(self._buffer) // RETRY_GROWTH
+        return self.done
+
+    def close(self) -> dict[str, Any]:
+        """Signal the end of the text, and return the members read."""
+        if not self.done:
+            self._retry_at = 0
+            if not self.feed(""):
+                raise json.JSONDecodeError("Unterminated object", self._buffer, self._pos)
+        return self.members
+
+    def _skip_whitespace(self, pos: int) -> int:
+        pos = WHITESPACE.match(self._buffer, pos).end()  # type: ignore[union-attr]
+        if pos >= len(self._buffer):
+            raise IncompleteError
+        return pos
+
+    def _decode(self, pos: int) -> tuple[Any, int]:
+        try:
+            value, end = DECODER.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError as e:
+            raise IncompleteError from e
+        # A number at the end of the buffer may not be complete yet.
+        if end >= len(self._buffer):
+            raise IncompleteError
+        return value, end
+
+    def _step(self) -> None:
+        """Read the next member (or array item), and advance past it."""
+        pos = self._skip_whitespace(self._pos)
+        if self._in_array:
+            self._pos = self._skip_array_item(pos)
+            return
+
+        if not self._started:
+            if self._buffer[pos] != "{":
+                raise json.JSONDecodeError("Expecting '{'", self._buffer, pos)
+            self._started = True
+            self._pos = pos + 1
+            return
+
+        match self._buffer[pos]:
+            case "}":
+                self.done = True
+                self._pos = pos + 1
+                return
+            case ",":
+                pos = self._skip_whitespace(pos + 1)
+
+        key, pos = self._decode(pos)
+        pos = self._skip_whitespace(pos)
+        if self._buffer[pos] != ":":
+            raise json.JSONDecodeError("Expecting ':'", self._buffer, pos)
+        pos = self._skip_whitespace(pos + 1)
+
+        if key in self.first_item_keys and self._buffer[pos] == "[":
+            value, pos = self._decode_first_item(pos)
+        else:
+            value, pos = self._decode(pos)
+
+        if key in self.keys:
+            self.members[key] = value
+            self.done = self.keys <= self.members.keys()
+        self._pos = pos
+
+    def _decode_first_item(self, pos: int) -> tuple[list[Any], int]:
+        """Decode the first item of the array at 'pos'. The others are skipped later."""
+        pos = self._skip_whitespace(pos + 1)
+        if self._buffer[pos] == "]":
+            return [], pos + 1
+        item, pos = self._decode(pos)
+        self._in_array = True
+        return [item], pos
+
+    def _skip_array_item(self, pos: int) -> int:
+        match self._buffer[pos]:
+            case ",":
+                _, pos = self._decode(self._skip_whitespace(pos + 1))
+                return pos
+            case "]":
+                self._in_array = False
+                return pos + 1
+            case _:
+                raise json.JSONDecodeError("Expecting ',' or ']'", self._buffer, pos)
+
+
+async def read_json_members(
+    chunks: AsyncIterable[bytes],
+    keys: Iterable[str],
+    *,
+    first_item_keys: Iterable[str] = (),
+) -> dict[str, Any]:
+    """Read the wanted members of a JSON object from a stream of bytes.
+
+    Stop consuming the stream as soon as every wanted member was read.
+    """
+    reader = JsonMembersReader(keys, first_item_keys=first_item_keys)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        if reader.feed(decoder.decode(chunk)):
+            return reader.members
+    reader.feed(decoder.decode(b"", final=True))
+    return reader.close()
@@ -0,0 +1,75 @@
+"""On-disk cache of the languages of the account, with their known words.
+
+Used to validate the language arguments of the CLI without a request per command.
+The cache is refreshed in the background once stale, cf. LingqHandler.get_user_langs.
+"""
+
+import time
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from lingq.config import CONFIG_DIR
+from lingq.log import logger
+from lingq.models.language import Language
+
+LANGS_PATH = CONFIG_DIR / "languages.json"
+LANGS_TTL = 24 * 60 * 60.0
+REFRESH_TIMEOUT = 5 * 60.0
+"""After this time (in seconds), the claim of a refresh that never ended is taken over."""
+
+
+class LanguagesCache(BaseModel):
+    """The languages recognized by LingQ, as of 'fetched_at' (a timestamp)."""
+
+    fetched_at: float
+    languages: list[Language]
+
+    @classmethod
+    def load(cls, path: Path = LANGS_PATH) -> "LanguagesCache | None":
+        if not path.exists():
+            return None
+        try:
+            return cls.model_validate_json(path.read_text(encoding="utf-8"))
+        except ValidationError:
+            logger.warning(f"Ignoring outdated languages cache at {path}")
+            return None
+
+    def save(self, path: Path = LANGS_PATH) -> None:
+        # Write then rename, since a background refresh may race with a reader.
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(self.model_dump_json(by_alias=True), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def is_stale(self, ttl: float = LANGS_TTL) -> bool:
+        return time.time() - self.fetched_at >= ttl
+
+    def user_langs(self) -> list[str]:
+        """Get a list of language codes with known words."""
+        return [lang.code for lang in self.languages if lang.known_words > 0]
+
+
+def claim_refresh(path: Path = LANGS_PATH) -> bool:
+    """Claim the refresh of the cache, or return False if another process claimed it.
+
+    Otherwise, every command run while the cache is stale would start its own refresh.
+    The claim is a lock file next to the cache, cf. release_refresh.
+    """
+    lock_path = path.with_suffix(".lock")
+    try:
+        lock_path.touch(exist_ok=False)
+        return True
+    except FileExistsError:
+        pass
+    try:
+        if time.time() - lock_path.stat().st_mtime < REFRESH_TIMEOUT:
+            return False
+    except FileNotFoundError:
+        # Released in the meantime: the cache is fresh again.
+        return False
+    lock_path.touch()
+    return True
+
+
+def release_refresh(path: Path = LANGS_PATH) -> None:
+    path.with_suffix(".lock").unlink(missing_ok=True)
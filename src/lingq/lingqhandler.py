@@ -1,13 +1,34 @@
 import asyncio
+import copy
+import subprocess
 import sys
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, Coroutine, Iterable
+from dataclasses import dataclass
+from functools import partial
 from io import BufferedReader
-from typing import Any, Self, TypedDict, Unpack
-
-from aiohttp import ClientResponse, ClientSession, FormData
-from aiohttp_retry import ExponentialRetry, RetryClient
+from pathlib import Path
+from typing import Any, ClassVar, Literal, Self, TypedDict, Unpack
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientPayloadError,
+    ClientResponse,
+    ClientSession,
+    ClientTimeout,
+    FormData,
+    TCPConnector,
+)
+from pydantic import BaseModel
 
 from lingq.config import Config
+from lingq.download import DownloadError, ResumableDownload
+from lingq.httpcache import CachedResponse, ResponseCache, get_cache_path
+from lingq.jsonstream import CHUNK_SIZE, loads, read_json_members
+from lingq.langcache import LanguagesCache, claim_refresh, release_refresh
 from lingq.log import logger
+from lingq.models.cards import Cards
 from lingq.models.collection import Collection
 from lingq.models.collection_v3 import (
     CollectionLessonResult,
@@ -18,9 +39,31 @@ from lingq.models.collection_v3 import (
 )
 from lingq.models.counter import Counter
 from lingq.models.language import Language
-from lingq.models.lesson_v3 import LOCKED_REASON_CHOICES, LessonV3
+from lingq.models.lesson_v3 import (
+    LESSON_TEXT_KEYS,
+    LOCKED_REASON_CHOICES,
+    LessonV3,
+    LessonV3Header,
+    LessonV3View,
+    TokenGroup,
+)
 from lingq.models.my_collections import MyCollections
-from lingq.utils import get_editor_url, model_validate_or_exit
+from lingq.ratelimiter import DEFAULT_MAX_IN_FLIGHT, DEFAULT_REQUESTS_PER_SECOND, RateLimiter
+from lingq.retry import RetryPolicy, parse_retry_after
+from lingq.utils import get_editor_url, model_validate_or_exit, remaining_page_urls
+
+DEFAULT_CONNECTION_LIMIT = 32
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 16
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+DEFAULT_DNS_CACHE_TTL = 300
+DEFAULT_CONNECT_TIMEOUT = 30.0
+# Cloudflare gives up on LingQ after 100 seconds.
+DEFAULT_READ_TIMEOUT = 120.0
+
+RETRY_EXCEPTIONS = (ClientConnectionError, ClientPayloadError, TimeoutError)
+"""Transient errors: the request is retried, as with a locked response."""
+
+REFRESH_LANGS_SCRIPT = "from lingq.lingqhandler import LingqHandler; LingqHandler._refresh_langs()"
 
 
 class RequestKwargs(TypedDict, total=False):
@@ -29,6 +72,69 @@ class RequestKwargs(TypedDict, total=False):
     data: Any
 
 
+def make_session(config: Config) -> ClientSession:
+    """Make a session with the connection pool and timeouts of the config.
+
+    It must be made inside a running event loop.
+    """
+    connector = TCPConnector(
+        limit=config.connection_limit or DEFAULT_CONNECTION_LIMIT,
+        limit_per_host=config.connection_limit_per_host or DEFAULT_CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=config.keepalive_timeout or DEFAULT_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=config.dns_cache_ttl or DEFAULT_DNS_CACHE_TTL,
+    )
+    timeout = ClientTimeout(
+        total=None,
+        connect=config.connect_timeout or DEFAULT_CONNECT_TIMEOUT,
+        sock_read=config.read_timeout or DEFAULT_READ_TIMEOUT,
+    )
+    return ClientSession(connector=connector, timeout=timeout)
+
+
+@dataclass
+class _InFlight:
+    """A GET request in flight, and the number of callers waiting for it. Cf. _request."""
+
+    task: asyncio.Future[Any]
+    waiters: int = 0
+
+
+class _CoroutineExitError(Exception):
+    """A SystemExit raised by a coroutine of run_async, carried out of the shared loop."""
+
+
+async def _exit_as_exception[T](coro: Coroutine[Any, Any, T]) -> T:
+    try:
+        return await coro
+    except SystemExit as e:
+        # Raised on the loop, it would stop it, and with it the daemon.
+        raise _CoroutineExitError(e.code) from e
+
+
+def run_async[T](coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine from synchronous code, as asyncio.run.
+
+    In the daemon, it runs on the event loop of the daemon instead, where the handlers
+    share the base handler (cf. LingqHandler.share). It then blocks the calling thread,
+    which must not be the one of the loop, and a sys.exit of the coroutine is raised
+    in that thread.
+    """
+    loop = LingqHandler._shared_loop
+    if loop is None:
+        return asyncio.run(coro)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        future = asyncio.run_coroutine_threadsafe(_exit_as_exception(coro), loop)
+        try:
+            return future.result()
+        except _CoroutineExitError as e:
+            raise SystemExit(*e.args) from None
+    coro.close()
+    msg = "run_async() cannot be called from a running event loop"
+    raise RuntimeError(msg)
+
+
 class LingqHandler:
     """Abstraction for the requests sent to the LingQ API.
 
@@ -38,27 +144,91 @@ class LingqHandler:
     Attributes:
         lang (str): The language code for the course (e.g., 'ja' for Japanese).
         config (Config): Configuration settings for the LingQ API.
-        session (RetryClient): A retry-enabled HTTP client session.
+        session (ClientSession): The HTTP client session, cf. make_session. It can be
+            passed to share it between handlers: it is then not closed by this one.
+        limiter (RateLimiter): Adaptive rate limiter that every request goes through.
+            It can be passed to share it between handlers.
+        retry_policy (RetryPolicy): Delays and budget of the retries. It can be passed
+            to share the budget between handlers.
+        cache (ResponseCache | None): On-disk cache of the GET responses, if enabled
+            in the config.
         _user_id (int | None): The user id. Used for some requests.
+        _langs (list[Language] | None): The languages recognized by LingQ.
+        _in_flight (dict): The GET requests in flight, by key. Cf. _request.
 
     """
 
-    def __init__(self, lang: str) -> None:
+    _shared: ClassVar["LingqHandler | None"] = None
+    _shared_loop: ClassVar[asyncio.AbstractEventLoop | None] = None
+
+    def __init__(
+        self,
+        lang: str,
+        *,
+        limiter: RateLimiter | None = None,
+        session: ClientSession | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
         self.lang = lang
         self.config = Config()
-        retry_client = RetryClient(
-            client_session=ClientSession(),
-            raise_for_status=False,
-            retry_options=ExponentialRetry(attempts=3),
-        )
-        self.session = retry_client
+        base = LingqHandler._shared
+        if base is not None and base.config.key != self.config.key:
+            # The account changed since the daemon started (cf. lingq setup).
+            base = None
+        if base is not None:
+            limiter = limiter or base.limiter
+            session = session or base.session
+            retry_policy = retry_policy or base.retry_policy
+        if limiter is None:
+            limiter = RateLimiter(
+                self.config.requests_per_second or DEFAULT_REQUESTS_PER_SECOND,
+                self.config.max_in_flight or DEFAULT_MAX_IN_FLIGHT,
+            )
+        self.limiter: RateLimiter = limiter
+        self.retry_policy: RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._owns_session = session is None
+        self.session: ClientSession = session if session is not None else make_session(self.config)
+        self.cache = None
+        if base is not None:
+            self.cache = base.cache
+        elif self.config.http_cache and self.config.key:
+            self.cache = ResponseCache(get_cache_path(self.config.key))
         self._user_id = None
+        self._langs: list[Language] | None = None
+        self._in_flight: dict[tuple[Any, ...], _InFlight] = {}
 
     async def __aenter__(self) -> Self:
         return self
 
     async def __aexit__(self, *_: Any) -> None:
+        if not self._owns_session:
+            return
+        logger.trace(f"Closing handler with {self.limiter}")
         await self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def for_lang(self, lang: str) -> "LingqHandler":
+        """Get a handler for another language, that shares everything else with this one.
+
+        That is, the session, the rate limiter, the retry budget and the caches.
+        Only this handler closes them.
+        """
+        handler = copy.copy(self)
+        handler.lang = lang
+        handler._owns_session = False
+        return handler
+
+    @classmethod
+    def share(cls, base: "LingqHandler | None") -> None:
+        """Make every new handler share everything with 'base', as with for_lang.
+
+        The coroutines of run_async then run on the current event loop, the one of
+        'base'. This is how the daemon keeps its connection pool, the state of the rate
+        limiter and the caches warm between commands. Pass None to stop sharing.
+        """
+        cls._shared = base
+        cls._shared_loop = asyncio.get_running_loop() if base is not None else None
 
     """Debug utils"""
 
@@ -90,7 +260,7 @@ class LingqHandler:
             case _:
                 logger.error(f"Unhandled response code error: {response.status}")
 
-        if response.headers.get("Content-Type") == "application/json":
+        if response.content_type == "application/json":
             response_json = await response.json()
             if isinstance(response_json, dict):
                 match response_json.get("detail", "_SENTINEL"):
@@ -103,7 +273,8 @@ class LingqHandler:
                         logger.error("Uncaught detail")
             logger.error(f"[{response.status}] Response JSON:\n{response_json}")
         else:
-            logger.error(f"Response text: {response.text}")
+            text = await response.text()
+            logger.error(f"Response text: {text[:500]}")
 
     def url(self, endpoint: str, *, version: int, add_language: bool) -> str:
         base_api_url = {
@@ -124,13 +295,95 @@ class LingqHandler:
         version: int = 3,
         add_language: bool = True,
         max_retries: int = 4,
+        members: Iterable[str] | None = None,
+        first_item_members: Iterable[str] = (),
+        model: type[BaseModel] | None = None,
+        fresh: bool = False,
         **kwargs: Unpack[RequestKwargs],
     ) -> Any:
         """Generic request.
 
-        On error, retry 'max_retries' times.
+        Identical GET requests in flight are coalesced: concurrent callers share one
+        round-trip and one parsed result, which they should then not mutate. The request
+        is cancelled once every caller is.
+        Cf. _send_request for the rest of the arguments.
+        """
+        send = partial(
+            self._send_request,
+            method,
+            endpoint,
+            version=version,
+            add_language=add_language,
+            max_retries=max_retries,
+            members=members,
+            first_item_members=first_item_members,
+            model=model,
+            fresh=fresh,
+            **kwargs,
+        )
+        if method.upper() != "GET":
+            return await send()
+
+        url = self.url(endpoint, version=version, add_language=add_language)
+        key = (
+            ResponseCache.key(method, url, kwargs.get("params")),
+            frozenset(members) if members is not None else None,
+            frozenset(first_item_members),
+            model,
+            fresh,
+        )
+        if (request := self._in_flight.get(key)) is not None:
+            logger.trace(f"Joining in-flight request: {key[0]}")
+        else:
+            request = _InFlight(asyncio.ensure_future(send()))
+            self._in_flight[key] = request
+            request.task.add_done_callback(lambda _: self._forget_request(key, request))
+        request.waiters += 1
+        try:
+            # A cancelled caller does not cancel the request of the others...
+            return await asyncio.shield(request.task)
+        finally:
+            request.waiters -= 1
+            if not request.waiters and not request.task.done():
+                # ...but the last one does: it would hold a limiter slot for nobody.
+                self._forget_request(key, request)
+                request.task.cancel()
+
+    def _forget_request(self, key: tuple[Any, ...], request: _InFlight) -> None:
+        if self._in_flight.get(key) is request:
+            del self._in_flight[key]
+
+    async def _send_request(  # noqa: C901
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        version: int = 3,
+        add_language: bool = True,
+        max_retries: int = 4,
+        members: Iterable[str] | None = None,
+        first_item_members: Iterable[str] = (),
+        model: type[BaseModel] | None = None,
+        fresh: bool = False,
+        **kwargs: Unpack[RequestKwargs],
+    ) -> Any:
+        """Send a request.
+
+        If a 'model' is given, validate a successful response straight from its bytes,
+        without building the intermediate JSON objects.
+
+        If 'members' are given, only read those members of a successful JSON object
+        response, and stop downloading it as soon as they are read. Cf. read_json_members.
+
+        If the cache is enabled, other GET requests go through it, unless 'fresh': the
+        response is then always downloaded (and cached). Successful writes invalidate
+        the cached responses they may affect. Cf. ResponseCache.
 
-        That is, loop until we get a json different from:
+        On error, retry 'max_retries' times, cf. RetryPolicy.
+
+        That is, loop while the connection fails (cf. RETRY_EXCEPTIONS), while the servers
+        are overloaded or failing (429, 5xx, or an error page that is not JSON), or until
+        we get a json different from:
         * {'isLocked': 'TOKENIZE_TEXT', 'errorType': 'locked'}
         * {'isLocked': 'GENERATE_TIMESTAMPS', 'errorType': 'locked'}
         * ["Can't execute: Cannot save changes at the moment. Please try again later."]
@@ -143,39 +396,188 @@ class LingqHandler:
         if params := kwargs.get("params", ""):
             logger.trace(f"{params=}")
 
+        cache_key = ResponseCache.key(method, url, kwargs.get("params"))
+        cached = None if fresh else self._get_cached(method, cache_key, members=members)
+        headers = self.config.headers
+        if cached is not None and ResponseCache.is_fresh(cached, url):
+            logger.trace(f"Cache hit: {cache_key}")
+            return self._decode(cached.body, model)
+        if cached is not None:
+            headers = headers | cached.validators()
+
         for retry in range(1, max_retries + 1):
-            async with self.session.request(
-                method.lower(), url, headers=self.config.headers, **kwargs
-            ) as response:
-                json = await response.json()
-
-                if 200 <= response.status < 300:
-                    return json
-
-                if isinstance(json, dict) and json.get("errorType", "") == "locked":
-                    reason = json.get("isLocked", "")
-                    if reason not in LOCKED_REASON_CHOICES:
-                        logger.warning(f"Unexpected lock reason: {reason}")
-                    msg = f"Content is locked at {reason}. Retrying... ({retry}/{max_retries})"
-                    logger.debug(msg)
-                elif isinstance(json, dict) and json.get("detail", "") == "Not found.":
-                    msg = f"{f'{method.upper()} {url}'} was not found."
-                    logger.warning(msg)
-                    return json
-                elif isinstance(json, list) and json[0].startswith(
-                    "Can't execute: Cannot save changes at the moment"
+            retry_after, locked_reason = None, None
+            try:
+                async with (
+                    self.limiter.slot() as slot,
+                    self.session.request(
+                        method.lower(), url, headers=headers, **kwargs
+                    ) as response,
                 ):
-                    msg = f"Can't execute at the moment. Retrying... ({retry}/{max_retries})"
-                    logger.debug(msg)
-                else:
-                    await self.response_debug(response)
-
-                await asyncio.sleep(2**retry)
+                    slot.status = response.status
+                    if 200 <= response.status < 300 or (
+                        cached is not None and response.status == 304
+                    ):
+                        return await self._read_success(
+                            response,
+                            url,
+                            cache_key,
+                            cached,
+                            members=members,
+                            first_item_members=first_item_members,
+                            model=model,
+                        )
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if (
+                        response.status == 429
+                        or response.status >= 500
+                        or response.content_type != "application/json"
+                    ):
+                        # Overloaded or failing servers, that may answer with an HTML page.
+                        await self.response_debug(response)
+                        logger.debug(f"[{response.status}] Retrying... ({retry}/{max_retries})")
+                    else:
+                        json = await response.json(loads=loads)
+                        if isinstance(json, dict) and json.get("errorType", "") == "locked":
+                            locked_reason = json.get("isLocked", "")
+                            if locked_reason not in LOCKED_REASON_CHOICES:
+                                logger.warning(f"Unexpected lock reason: {locked_reason}")
+                            msg = f"Content is locked at {locked_reason}."
+                            logger.debug(f"{msg} Retrying... ({retry}/{max_retries})")
+                            slot.throttled = True
+                        elif isinstance(json, dict) and json.get("detail", "") == "Not found.":
+                            msg = f"{f'{method.upper()} {url}'} was not found."
+                            logger.warning(msg)
+                            # Let the caller fail on validation, as with a successful response.
+                            return json if model is None else model.model_validate(json)
+                        elif isinstance(json, list) and json[0].startswith(
+                            "Can't execute: Cannot save changes at the moment"
+                        ):
+                            msg = (
+                                f"Can't execute at the moment. Retrying... ({retry}/{max_retries})"
+                            )
+                            logger.debug(msg)
+                            slot.throttled = True
+                        else:
+                            await self.response_debug(response)
+            except RETRY_EXCEPTIONS as e:
+                logger.debug(f"{e!r}. Retrying... ({retry}/{max_retries})")
+
+            if retry == max_retries:
+                break
+            # Waiting for locked content is expected, and does not add to the load.
+            if locked_reason is None and not self.retry_policy.spend():
+                msg = f"Retry budget exhausted ({self.retry_policy}): not retrying {url}"
+                logger.error(msg)
+                raise RuntimeError(msg)
+            # Do not hold the limiter slot while waiting.
+            delay = self.retry_policy.delay(
+                retry, retry_after=retry_after, locked_reason=locked_reason
+            )
+            await asyncio.sleep(delay)
 
         msg = f"Could not get content after {max_retries} retries"
         logger.error(msg)
         raise RuntimeError(msg)
 
+    def _get_cached(
+        self, method: str, cache_key: str, *, members: Iterable[str] | None
+    ) -> CachedResponse | None:
+        """Get the cached response of a request, if it goes through the cache."""
+        if self.cache is None or method.upper() != "GET" or members is not None:
+            return None
+        return self.cache.get(cache_key)
+
+    async def _read_success(
+        self,
+        response: ClientResponse,
+        url: str,
+        cache_key: str,
+        cached: CachedResponse | None,
+        *,
+        members: Iterable[str] | None,
+        first_item_members: Iterable[str],
+        model: type[BaseModel] | None,
+    ) -> Any:
+        """Read a successful (or not modified) response. Cf. _request."""
+        self.retry_policy.record_success()
+        if response.method != "GET":
+            self._invalidate_cache(url)
+        elif response.status == 304 and self.cache is not None and cached is not None:
+            logger.trace(f"Cache revalidated: {cache_key}")
+            self.cache.touch(cache_key)
+            return self._decode(cached.body, model)
+        elif members is None and self.cache is not None:
+            body = await response.read()
+            self.cache.put(cache_key, url, body, response.headers)
+            return self._decode(body, model)
+
+        if members is not None:
+            return await read_json_members(
+                response.content.iter_chunked(CHUNK_SIZE),
+                members,
+                first_item_keys=first_item_members,
+            )
+        if model is not None:
+            return model.model_validate_json(await response.read())
+        return await response.json(loads=loads)
+
+    @staticmethod
+    def _decode(body: bytes, model: type[BaseModel] | None) -> Any:
+        if model is not None:
+            return model.model_validate_json(body)
+        return loads(body)
+
+    def _invalidate_cache(self, url: str) -> None:
+        """Drop the cached responses that a write to this url may have made stale."""
+        if self.cache is None:
+            return
+        base_urls = [self.url("", version=version, add_language=True) for version in (2, 3)]
+        self.cache.invalidate_write(url, base_urls)
+
+    def _endpoint_from_url(self, url: str) -> str:
+        """Inverse of 'url' for v3 language endpoints, f.e. the 'next' url of a page."""
+        base_url = self.url("", version=3, add_language=True)
+        assert url.startswith(base_url), url
+        return url[len(base_url) :]
+
+    async def _iter_pages(
+        self, endpoint: str, *, window: int | None = None
+    ) -> AsyncGenerator[Any, None]:
+        """Yield, in order, the JSON of every page of a paginated endpoint.
+
+        The first page is fetched alone to read the total 'count'. The urls of the
+        remaining pages are then computed and fetched concurrently (the limiter takes
+        care of the throttling), keeping at most 'window' pages in memory.
+
+        If the urls can not be computed, fall back to following 'next' one page at a time.
+        """
+        page = await self._request("GET", endpoint)
+        yield page
+        if not isinstance(page, dict) or not page.get("next"):
+            return
+
+        urls = remaining_page_urls(page["next"], page["count"], len(page["results"]))
+        if urls is None:
+            while next_url := page.get("next"):
+                page = await self._request("GET", self._endpoint_from_url(next_url))
+                yield page
+            return
+
+        window = window or len(urls)
+        pending: deque[asyncio.Task[Any]] = deque()
+        try:
+            for url in urls:
+                if len(pending) >= window:
+                    yield await pending.popleft()
+                request = self._request("GET", self._endpoint_from_url(url))
+                pending.append(asyncio.create_task(request))
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
     """Get requests"""
 
     async def get_user_id(self) -> None:
@@ -185,31 +587,63 @@ class LingqHandler:
             self._user_id = data["id"]
             logger.trace(f"Cached user id {self._user_id}")
 
-    async def _get_langs(self) -> list[Language]:
-        """Get a list of all languages recognized by LingQ.
+    async def _get_langs(self, *, fresh: bool = False) -> list[Language]:
+        """Get and cache a list of all languages recognized by LingQ.
+
+        If 'fresh', bypass the response cache: the known words change over time.
 
         https://www.lingq.com/apidocs/api-2.0.html#get (outdated)
         """
-        data = await self._request("GET", "languages", version=2, add_language=False)
-        return [Language.model_validate(lang) for lang in data]
+        if self._langs is None:
+            data = await self._request(
+                "GET", "languages", version=2, add_language=False, fresh=fresh
+            )
+            self._langs = [Language.model_validate(lang) for lang in data]
+        return self._langs
 
-    async def _get_user_langs(self) -> list[str]:
-        """Get a list of language codes with known words."""
-        langs = await self._get_langs()
-        return [lang.code for lang in langs if lang.known_words > 0]
+    @classmethod
+    def _fetch_langs(cls) -> LanguagesCache:
+        """Get all languages recognized by LingQ, and save them to the languages cache."""
+
+        async def tmp() -> list[Language]:
+            async with cls("Filler") as handler:
+                return await handler._get_langs(fresh=True)
+
+        cache = LanguagesCache(fetched_at=time.time(), languages=run_async(tmp()))
+        cache.save()
+        return cache
+
+    @classmethod
+    def _refresh_langs(cls) -> None:
+        try:
+            cls._fetch_langs()
+        except Exception as e:
+            logger.warning(f"Could not refresh the languages cache: {e}")
+        finally:
+            release_refresh()
 
     @classmethod
-    def get_user_langs(cls) -> list[str]:
+    def get_user_langs(cls, *, refresh: bool = False) -> list[str]:
         """Get a list of language codes with known words.
 
+        The languages are cached on disk: a stale cache is still used, but refreshed
+        in the background. Use 'refresh' to wait for fresh languages instead.
+
         This is a class method since it does not require initializing a language code.
         """
-
-        async def tmp() -> list[str]:
-            async with cls("Filler") as handler:
-                return await handler._get_user_langs()
-
-        return asyncio.run(tmp())
+        cache = None if refresh else LanguagesCache.load()
+        if cache is None:
+            cache = cls._fetch_langs()
+        elif cache.is_stale() and claim_refresh():
+            logger.trace("Refreshing the languages cache in the background")
+            # A detached process, so that it outlives short commands.
+            subprocess.Popen(
+                [sys.executable, "-c", REFRESH_LANGS_SCRIPT],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        return cache.user_langs()
 
     async def get_lesson_from_id(self, lesson_id: int) -> LessonV3:
         """Get a lesson, from its id.
@@ -219,8 +653,39 @@ class LingqHandler:
             url: https://www.lingq.com/api/v3/LANG/lessons/ID/
 
         """
-        data = await self._request("GET", f"lessons/{lesson_id}/")
-        return LessonV3.model_validate(data)
+        return await self._request("GET", f"lessons/{lesson_id}/", model=LessonV3)
+
+    async def get_lesson_view_from_id(
+        self, lesson_id: int, *, projection: Literal["full", "text"] = "full"
+    ) -> LessonV3View:
+        """Get a lesson, from its id, without validating its text and words.
+
+        With the "text" projection, stop downloading the lesson shortly after its text,
+        before most of its cards and words, which are left empty. Cf. LESSON_TEXT_KEYS.
+
+        Cf. get_lesson_from_id and LessonV3View.
+        """
+        endpoint = f"lessons/{lesson_id}/"
+        if projection == "full":
+            return await self._request("GET", endpoint, model=LessonV3View)
+        data = await self._request("GET", endpoint, members=LESSON_TEXT_KEYS)
+        return LessonV3View.model_validate(data)
+
+    async def get_lesson_head_from_id(self, lesson_id: int) -> list[TokenGroup]:
+        """Get the first paragraph of a lesson, from its id. It is usually the title.
+
+        Only the beginning of the lesson is downloaded.
+        """
+        data = await self._request(
+            "GET",
+            f"lessons/{lesson_id}/",
+            members={"tokenizedText"},
+            first_item_members={"tokenizedText"},
+        )
+        paragraphs = data["tokenizedText"]
+        if not paragraphs:
+            return []
+        return [TokenGroup.model_validate(token_group) for token_group in paragraphs[0]]
 
     async def get_lesson_from_ids(self, ids: list[int]) -> list[LessonV3]:
         """Get a list of lessons, from their ids."""
@@ -234,18 +699,10 @@ class LingqHandler:
             url: https://www.lingq.com/api/v3/ja/collections/537808/lessons
 
         """
-        base_url = self.url("", version=3, add_language=True)
-        base_url_size = len(base_url)
-        url = f"{base_url}collections/{course_id}/lessons/"
         collection_lessons: list[CollectionLessonResult] = []
-        cur_url = url
-
-        while cur_url:
-            endpoint = cur_url[base_url_size:]
-            res_json = await self._request("GET", endpoint)
+        async for res_json in self._iter_pages(f"collections/{course_id}/lessons/"):
             collection_lessons_at_page = CollectionLessons.model_validate(res_json)
             collection_lessons.extend(collection_lessons_at_page.results)
-            cur_url = collection_lessons_at_page.next
 
         if not collection_lessons:
             editor_url = get_editor_url(self.lang, course_id, "course")
@@ -255,6 +712,24 @@ class LingqHandler:
 
         return collection_lessons
 
+    async def get_cards_pages(
+        self, page_size: int, window: int, *, sort: str | None = None
+    ) -> AsyncGenerator[Cards, None]:
+        """Get, in order, every page of LingQs (cards).
+
+        At most 'window' pages are downloaded at the same time.
+
+        The LingQ API clamps page size:
+            - The API default page_size is 100 (with a clamped max of 1000 words per page).
+
+        The sort options are the ones of the vocabulary page, f.e. "date" for newest first.
+        """
+        endpoint = f"cards/?page=1&page_size={page_size}"
+        if sort is not None:
+            endpoint = f"{endpoint}&sort={sort}"
+        async for cards_json in self._iter_pages(endpoint, window=window):
+            yield Cards.model_validate(cards_json)
+
     async def get_my_collections(self) -> MyCollections:
         data = await self._request("GET", "collections/my")
         return MyCollections.model_validate(data)
@@ -321,15 +796,60 @@ class LingqHandler:
         col.add_data(self.lang, collection)
         return col
 
-    async def get_audio_from_lesson(self, lesson: LessonV3) -> bytes | None:
-        """Get the audio from a lesson. Return None if there is no audio.
+    async def download_audio_from_lesson(
+        self, lesson: LessonV3Header, path: Path, *, max_retries: int = 4
+    ) -> Path | None:
+        """Stream the audio of a lesson to a file. Return None if there is no audio.
+
+        The download is resumed if it is interrupted, here or in a previous run, and the
+        file only appears at 'path' once complete and verified. Cf. ResumableDownload.
+        Only one chunk of the audio is ever held in memory.
+
+        Raises DownloadError after 'max_retries' failed attempts.
 
         Note: The key with the audio url is 'audio' in V2 and 'audioUrl' in V3.
         """
         if not lesson.audio_url:
             return None
-        async with self.session.get(str(lesson.audio_url)) as response:
-            return await response.read()
+        if path.exists():
+            return path
+        url = str(lesson.audio_url)
+        download = ResumableDownload(url, path)
+
+        for retry in range(1, max_retries + 1):
+            try:
+                if download.is_complete():
+                    return await asyncio.to_thread(download.finish)
+                async with (
+                    self.limiter.slot() as slot,
+                    self.session.get(url, headers=download.request_headers()) as response,
+                ):
+                    slot.status = response.status
+                    if response.status == 416:
+                        download.discard()
+                        msg = f"Range not satisfiable for {path.name}: starting over"
+                        raise DownloadError(msg)
+                    if response.status not in (200, 206):
+                        logger.warning(f"Could not download the audio of '{lesson.title}'")
+                        await self.response_debug(response)
+                        return None
+                    # The disk writes run in a thread, so that they do not block the loop.
+                    audio_file = await asyncio.to_thread(
+                        download.open, response.status, response.headers
+                    )
+                    with audio_file:
+                        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                            await asyncio.to_thread(audio_file.write, chunk)
+                return await asyncio.to_thread(download.finish)
+            except (*RETRY_EXCEPTIONS, DownloadError) as e:
+                logger.debug(f"{e!r}. Retrying... ({retry}/{max_retries})")
+
+            if retry == max_retries or not self.retry_policy.spend():
+                break
+            await asyncio.sleep(self.retry_policy.delay(retry))
+
+        msg = f"Could not download the audio of '{lesson.title}' ({download.offset} bytes kept)"
+        raise DownloadError(msg)
 
     async def get_stats(self) -> Any:
         """Get reading stats for the last 7 days.
@@ -491,7 +1011,12 @@ class LingqHandler:
         base_url = self.url("", version=3, add_language=True)
         url = f"{base_url}collections/{course_id}"
         logger.trace(f"DELETE {url}")
-        async with self.session.delete(url, headers=self.config.headers) as response:
+        async with (
+            self.limiter.slot() as slot,
+            self.session.delete(url, headers=self.config.headers) as response,
+        ):
+            slot.status = response.status
             if response.status != 202:
                 msg = "The course could not be successfully deleted"
                 raise RuntimeError(msg)
+        self._invalidate_cache(url)
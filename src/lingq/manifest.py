@@ -0,0 +1,216 @@
+"""Manifest of the lessons downloaded to an output folder, cf. 'lingq get courses'.
+
+For every lesson written, it records the listing the lesson was fetched from (cf.
+lesson_fingerprint), when it was fetched, and the files written (text, audio and
+timestamps) with their size and SHA-256 hash.
+
+With --skip-downloaded, a sync then only fetches the lessons that are new, changed, or
+whose files are missing. Lessons are recorded as soon as they are written, so that an
+interrupted sync resumes where it stopped.
+
+NOTE: The lessons of every course are still listed: the counters of a course do not
+      change when audio is added to a lesson, or when a title is edited.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from lingq.models.collection_v3 import CollectionLessonResult
+
+MANIFEST_FILENAME = ".lingq-manifest.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lessons (
+    lesson_id INTEGER PRIMARY KEY,
+    collection_id INTEGER NOT NULL,
+    lang TEXT NOT NULL,
+    title TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    with_audio INTEGER NOT NULL,
+    with_timestamps INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    lesson_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (lesson_id, kind),
+    FOREIGN KEY (lesson_id) REFERENCES lessons (lesson_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS lessons_collection ON lessons (collection_id);
+"""
+
+
+def lesson_fingerprint(lesson: CollectionLessonResult) -> str:
+    """What changes in the listing of a course when one of its lessons is edited."""
+    fields = [lesson.title, lesson.word_count, lesson.unique_word_count, lesson.duration]
+    return json.dumps([*fields, lesson.audio], ensure_ascii=False)
+
+
+def hash_file(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with path.open("rb") as file:
+        while chunk := file.read(1 << 20):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+@dataclass
+class Artifact:
+    """A file written for a lesson: its 'text', 'audio' or 'timestamps'."""
+
+    kind: str
+    path: Path
+    size: int
+    sha256: str
+
+    @classmethod
+    def from_path(cls, kind: str, path: Path) -> "Artifact":
+        """Blocking: hashes the file."""
+        return cls(kind, path, path.stat().st_size, hash_file(path))
+
+
+class Manifest:
+    """SQLite manifest of the lessons downloaded to 'root'.
+
+    Usage:
+        with Manifest(opath) as manifest:
+            lessons = manifest.outdated(lessons, with_audio=True, with_timestamps=False)
+            ...
+            manifest.record_lesson(lang, lesson, artifacts, with_audio=True, with_timestamps=False)
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.path = root / MANIFEST_FILENAME
+        root.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._conn.close()
+
+    def _is_lesson_synced(
+        self,
+        lesson_id: int,
+        fingerprint: str | None,
+        *,
+        with_audio: bool,
+        with_timestamps: bool,
+    ) -> bool:
+        """Whether the lesson was fetched with what is asked, and its files are untouched.
+
+        The files are only compared by size, since hashing every audio would take long.
+        If 'fingerprint' is None, it is not checked.
+        """
+        query = "SELECT fingerprint, with_audio, with_timestamps FROM lessons WHERE lesson_id = ?"
+        row = self._conn.execute(query, (lesson_id,)).fetchone()
+        if row is None:
+            return False
+        if fingerprint is not None and row[0] != fingerprint:
+            return False
+        if (with_audio and not row[1]) or (with_timestamps and not row[2]):
+            return False
+        query = "SELECT path, size FROM artifacts WHERE lesson_id = ?"
+        for path, size in self._conn.execute(query, (lesson_id,)):
+            file_path = self.root / path
+            if not file_path.exists() or file_path.stat().st_size != size:
+                return False
+        return True
+
+    def outdated(
+        self,
+        lessons: list[CollectionLessonResult],
+        *,
+        with_audio: bool,
+        with_timestamps: bool,
+    ) -> list[CollectionLessonResult]:
+        """Get the lessons that are new, changed since they were fetched, or incomplete."""
+        return [
+            lesson
+            for lesson in lessons
+            if not self._is_lesson_synced(
+                lesson.id,
+                lesson_fingerprint(lesson),
+                with_audio=with_audio,
+                with_timestamps=with_timestamps,
+            )
+        ]
+
+    def record_lesson(
+        self,
+        lang: str,
+        lesson: CollectionLessonResult,
+        artifacts: list[Artifact],
+        *,
+        with_audio: bool,
+        with_timestamps: bool,
+    ) -> list[Path]:
+        """Record a lesson that was just written, and return its files that it replaces.
+
+        That is, the files of a previous fetch that are not written anymore, for instance
+        because the lesson was renamed.
+        """
+        query = "SELECT path FROM artifacts WHERE lesson_id = ?"
+        previous = {self.root / path for (path,) in self._conn.execute(query, (lesson.id,))}
+        with self._conn:
+            # Deleting the lesson cascades to its artifacts.
+            self._conn.execute("DELETE FROM lessons WHERE lesson_id = ?", (lesson.id,))
+            self._conn.execute(
+                "INSERT INTO lessons VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    lesson.id,
+                    lesson.collection_id,
+                    lang,
+                    lesson.title,
+                    lesson_fingerprint(lesson),
+                    with_audio,
+                    with_timestamps,
+                    time.time(),
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO artifacts VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        lesson.id,
+                        artifact.kind,
+                        str(artifact.path.relative_to(self.root)),
+                        artifact.size,
+                        artifact.sha256,
+                    )
+                    for artifact in artifacts
+                ),
+            )
+        return sorted(previous - {artifact.path for artifact in artifacts})
+
+    def forget_lessons(self, collection_id: int, keep: Iterable[int]) -> int:
+        """Forget the lessons of a course that are not in 'keep', and return how many.
+
+        Their files are kept.
+        """
+        keep = set(keep)
+        query = "SELECT lesson_id FROM lessons WHERE collection_id = ?"
+        lesson_ids = [lesson_id for (lesson_id,) in self._conn.execute(query, (collection_id,))]
+        forgotten = [(lesson_id,) for lesson_id in lesson_ids if lesson_id not in keep]
+        with self._conn:
+            self._conn.executemany("DELETE FROM lessons WHERE lesson_id = ?", forgotten)
+        return len(forgotten)
@@ -3,9 +3,11 @@
 https://www.lingq.com/api/v3/el/lessons/31145860/
 """
 
+from functools import cached_property
+from pathlib import Path
 from typing import Any, Literal, get_args
 
-from pydantic import BaseModel, ConfigDict, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, TypeAdapter
 from pydantic.alias_generators import to_camel
 
 from lingq.log import logger
@@ -85,7 +87,9 @@ class PreviousLesson(BaseModel):
     id: int
 
 
-class LessonV3(BaseModel):
+class LessonV3Header(BaseModel):
+    """Every field of a lesson, except for the text and the words (the heavy ones)."""
+
     model_config = ConfigDict(
         alias_generator=to_camel,
         populate_by_name=True,
@@ -113,7 +117,8 @@ class LessonV3(BaseModel):
     shared_by_id: int
     shared_by_name: str
     shared_by_role: str | None
-    external_type: str | None
+    # Not in camel case
+    external_type: str | None = Field(alias="external_type")
     type: str
     # P := shared, D := private, R := rejected, X := None
     status: Literal["P", "D", "R", "X"]
@@ -152,7 +157,6 @@ class LessonV3(BaseModel):
     is_legacy: bool
     simplified_to: str | None
     simplified_by: str | None
-    tokenized_text: list[list[TokenGroup]]
     is_locked: bool | LockedReason | None
     shared_by_image_url: HttpUrl
     shared_by_is_friend: bool
@@ -166,14 +170,19 @@ class LessonV3(BaseModel):
     next_lesson: PreviousLesson | None = None
     translation: LessonTranslation | None
     video_url: str | None
-    cards: dict[str, Any]
     cards_count: int
-    words: dict[str, Word]
 
     # Custom attributes
-    _downloaded_audio: bytes | None = None
+    # Path of the downloaded audio, until it is moved to its final path.
+    _audio_path: Path | None = None
     _timestamps: str | None = None
 
+
+class LessonV3(LessonV3Header):
+    tokenized_text: list[list[TokenGroup]]
+    cards: dict[str, Any]
+    words: dict[str, Word]
+
     def get_raw_text(self) -> str:
         # The first element is the lesson title, that we don't use.
         # Note that some defective lessons may not have a title,
@@ -213,3 +222,77 @@ def format_timestamp(seconds: float) -> str:
     secs = int(seconds % 60)
     millis = int((seconds * 1000) % 1000)
     return f"{hours:02}:{minutes:02}:{secs:02}.{millis:03}"
+
+
+TokenizedTextAdapter = TypeAdapter(list[list[TokenGroup]])
+WordsAdapter = TypeAdapter(dict[str, Word])
+
+
+class LessonV3View(LessonV3Header):
+    """A lesson that only validates its header.
+
+    The text, words and cards are kept as raw JSON, and only validated when accessed.
+    Getting the raw text or the subtitles walks the raw JSON directly.
+
+    The words and cards are empty if they were not fetched, cf. LESSON_TEXT_KEYS.
+    The count of cards is then None too, since it comes after them.
+    """
+
+    cards_count: int | None = None  # type: ignore[assignment]
+    raw_tokenized_text: list[list[dict[str, Any]]] = Field(alias="tokenizedText")
+    raw_cards: dict[str, Any] = Field(default_factory=dict, alias="cards")
+    raw_words: dict[str, Any] = Field(default_factory=dict, alias="words")
+
+    @cached_property
+    def tokenized_text(self) -> list[list[TokenGroup]]:
+        return TokenizedTextAdapter.validate_python(self.raw_tokenized_text)
+
+    @cached_property
+    def words(self) -> dict[str, Word]:
+        return WordsAdapter.validate_python(self.raw_words)
+
+    @property
+    def cards(self) -> dict[str, Any]:
+        return self.raw_cards
+
+    def to_lesson(self) -> LessonV3:
+        """Validate the whole lesson."""
+        return LessonV3.model_validate(self.model_dump(by_alias=True))
+
+    def get_raw_text(self) -> str:
+        # Cf. LessonV3.get_raw_text
+        return "\n".join(
+            " ".join(token_group["text"] for token_group in paragraph)
+            for paragraph in self.raw_tokenized_text[1:]
+        )
+
+    def to_vtt(self) -> str | None:
+        # Cf. LessonV3.to_vtt
+        vtt_lines = ["WEBVTT\n"]
+
+        idx_token = 0
+        for paragraph in self.raw_tokenized_text[1:]:
+            for token_group in paragraph:
+                start_time, end_time = token_group["timestamp"]
+                if start_time is None or end_time is None:
+                    logger.warning(f"Lesson {self.title} has no subtitles")
+                    return None
+                start = format_timestamp(start_time)
+                end = format_timestamp(end_time)
+
+                idx_token += 1
+                vtt_lines.append(f"{idx_token}")
+                vtt_lines.append(f"{start} --> {end}")
+                vtt_lines.append(token_group["text"])
+                vtt_lines.append("")
+
+        return "\n".join(vtt_lines)
+
+
+LESSON_TEXT_KEYS = frozenset(
+    field.alias or name for name, field in LessonV3View.model_fields.items() if field.is_required()
+)
+"""The members of a lesson JSON needed for a LessonV3View without words and cards.
+
+They come before the cards and the words in the JSON, and are much lighter.
+"""
@@ -0,0 +1,156 @@
+"""Adaptive rate limiter shared by every request sent through a LingqHandler.
+
+It combines a token bucket, that paces requests per second, with an AIMD window,
+that bounds the number of requests in flight:
+* Additive increase: every fast and successful response grows the rate and the window.
+* Multiplicative decrease: both are halved whenever LingQ signals that it is overloaded
+  (429, 5xx, timeouts, locked content...).
+
+The configured values are ceilings: the limiter starts at half of them and climbs
+towards them for as long as the API keeps up.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from lingq.log import logger
+
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+DEFAULT_MAX_IN_FLIGHT = 8
+
+
+def is_throttle_status(status: int | None) -> bool:
+    """Whether a response code means that we are going too fast: 429 or 5xx."""
+    return status is not None and (status == 429 or status >= 500)
+
+
+@dataclass
+class Slot:
+    """The outcome of a request, filled by the caller while holding the slot."""
+
+    status: int | None = None
+    throttled: bool = False
+
+
+class RateLimiter:
+    """Token bucket + AIMD concurrency window.
+
+    Usage:
+        async with limiter.slot() as slot:
+            async with session.get(url) as response:
+                slot.status = response.status
+
+    Attributes:
+        rate (float): Current requests per second.
+        concurrency (float): Current maximum of requests in flight.
+        in_flight (int): Number of requests currently holding a slot.
+
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        *,
+        min_requests_per_second: float = 0.2,
+        latency_target: float = 2.0,
+    ) -> None:
+        if requests_per_second <= 0 or max_in_flight < 1:
+            raise ValueError(f"Invalid limits: {requests_per_second=}, {max_in_flight=}")
+        self.max_rate = requests_per_second
+        self.min_rate = min(min_requests_per_second, requests_per_second)
+        self.max_in_flight = max_in_flight
+        # Responses slower than this (in seconds) do not grow the limits.
+        self.latency_target = latency_target
+
+        self.rate = max(self.min_rate, requests_per_second / 2)
+        self.concurrency = float(max(1, max_in_flight // 2))
+        self.in_flight = 0
+
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._bucket_lock = asyncio.Lock()
+        self._window = asyncio.Condition()
+
+    def __repr__(self) -> str:
+        return (
+            f"RateLimiter(rate={self.rate:.2f}/{self.max_rate:.2f} req/s, "
+            f"concurrency={int(self.concurrency)}/{self.max_in_flight}, "
+            f"in_flight={self.in_flight})"
+        )
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[Slot]:
+        """Wait for a free slot, then report the outcome of the request on exit.
+
+        A timeout while holding the slot counts as a throttling signal. A cancelled
+        request says nothing about the load: it leaves the limits as they are.
+        """
+        slot = Slot()
+        await self._acquire()
+        started = time.monotonic()
+        try:
+            yield slot
+        except TimeoutError:
+            slot.throttled = True
+            raise
+        except (asyncio.CancelledError, GeneratorExit):
+            slot.status, slot.throttled = None, False
+            raise
+        finally:
+            await self._release(slot, started)
+
+    async def _acquire(self) -> None:
+        async with self._window:
+            await self._window.wait_for(lambda: self.in_flight < int(self.concurrency))
+            self.in_flight += 1
+
+        # Requests are paced one at a time, in arrival order.
+        try:
+            async with self._bucket_lock:
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= 1
+        except BaseException:
+            # Cancelled while waiting for a token: give the slot back.
+            async with self._window:
+                self.in_flight -= 1
+                self._window.notify_all()
+            raise
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        # A bucket of size one: requests are evenly spaced, without bursts.
+        self._tokens = min(1.0, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def _release(self, slot: Slot, started: float) -> None:
+        elapsed = time.monotonic() - started
+        async with self._window:
+            self.in_flight -= 1
+            if slot.throttled or is_throttle_status(slot.status):
+                self._decrease(started)
+            elif slot.status is not None and slot.status < 400 and elapsed < self.latency_target:
+                self._increase()
+            self._window.notify_all()
+
+    def _increase(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+        # Roughly +1 per full window of successful responses.
+        self.concurrency = min(self.max_in_flight, self.concurrency + 1 / self.concurrency)
+
+    def _decrease(self, started: float) -> None:
+        # Requests sent before the last decrease were sent at the old rate:
+        # a burst of throttled responses should only halve the limits once.
+        if started < self._last_decrease:
+            return
+        self._last_decrease = time.monotonic()
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.concurrency = max(1.0, self.concurrency / 2)
+        logger.debug(f"Throttled, slowing down: {self}")
@@ -0,0 +1,111 @@
+"""Retry policy of the requests sent through a LingqHandler.
+
+* Full jitter: wait a random time in [0, base * 2^attempt], so that requests that
+  failed together do not retry together.
+* Retry-After: when the server says how long to wait, wait at least that long.
+* Locked content: LingQ is still processing the lesson. Wait about as long as that
+  step usually takes (cf. LOCKED_DELAYS), with less jitter. These waits are expected,
+  and do not spend the retry budget.
+* Retry budget: retries spend tokens, which successful requests earn back. Once they
+  are spent, requests fail instead of retrying: when most requests fail, retrying them
+  all would only add to the load.
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+
+LOCKED_DELAYS: dict[str, float] = {
+    "TOKENIZE_TEXT": 2.0,
+    "NORMALIZE_AUDIO": 5.0,
+    "GENERATE_LIPP": 5.0,
+    "GENERATE_TIMESTAMPS": 10.0,
+    "TRANSCRIBE_AUDIO": 30.0,
+}
+"""Base delay (in seconds) before retrying content locked at each step, cf. LockedReason."""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (seconds, or an HTTP date) into seconds to wait."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """How long to wait before retrying, and whether to retry at all.
+
+    Share it between handlers (with the rate limiter) to share the budget.
+
+    Usage:
+        if not policy.spend():
+            raise ...
+        await asyncio.sleep(policy.delay(attempt, retry_after=retry_after))
+
+    Attributes:
+        base_delay (float): The delay before the first retry, before jitter.
+        max_delay (float): The cap of the exponential backoff.
+        budget (float): The tokens left to retry with.
+        max_budget (float): The size of the budget, and its initial value.
+        refill (float): The tokens earned back per success: 0.1 allows a retry every
+            ten successful requests, once the initial budget is spent.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_budget: float = 20.0,
+        refill: float = 0.1,
+    ) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_budget = max_budget
+        self.budget = max_budget
+        self.refill = refill
+
+    def __repr__(self) -> str:
+        return f"RetryPolicy(budget={self.budget:.1f}/{self.max_budget:.0f})"
+
+    def delay(
+        self,
+        attempt: int,
+        *,
+        retry_after: float | None = None,
+        locked_reason: str | None = None,
+    ) -> float:
+        """The time to wait (in seconds) after the 'attempt'-th attempt failed."""
+        if locked_reason is not None:
+            # The processing takes some time anyway: only jitter half of the delay.
+            base_delay = LOCKED_DELAYS.get(locked_reason, self.base_delay)
+            backoff = min(self.max_delay, base_delay * 2 ** (attempt - 1))
+            return backoff / 2 + random.uniform(0, backoff / 2)
+
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0, backoff)
+        if retry_after is not None:
+            # Still jittered, since every throttled request got the same Retry-After.
+            delay = min(retry_after, self.max_delay) + random.uniform(0, self.base_delay)
+        return delay
+
+    def spend(self) -> bool:
+        """Take a token to retry, or return False if the budget is spent."""
+        if self.budget < 1:
+            return False
+        self.budget -= 1
+        return True
+
+    def record_success(self) -> None:
+        self.budget = min(self.max_budget, self.budget + self.refill)
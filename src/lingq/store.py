@@ -0,0 +1,179 @@
+"""Local SQLite store of LingQs (cards).
+
+One row per card and language, with the tags and hints in side tables. Every card is
+also kept as JSON, so that it can be read back into a Card model.
+
+Lookups by term, status, tag or importance are served by indexes instead of loading
+and validating a whole dump.
+"""
+
+import sqlite3
+from collections.abc import Collection, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self
+
+from lingq.models.cards import Card
+
+STORE_FILENAME = "lingqs.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    lang TEXT NOT NULL,
+    pk INTEGER NOT NULL,
+    term TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    extended_status INTEGER,
+    displayed_status INTEGER NOT NULL,
+    importance INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (lang, pk)
+);
+CREATE TABLE IF NOT EXISTS card_tags (
+    lang TEXT NOT NULL,
+    pk INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (lang, pk, tag),
+    FOREIGN KEY (lang, pk) REFERENCES cards (lang, pk) ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS card_hints (
+    lang TEXT NOT NULL,
+    pk INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    locale TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (lang, pk, position),
+    FOREIGN KEY (lang, pk) REFERENCES cards (lang, pk) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS cards_term ON cards (lang, term);
+CREATE INDEX IF NOT EXISTS cards_status ON cards (lang, displayed_status);
+CREATE INDEX IF NOT EXISTS cards_importance ON cards (lang, importance);
+CREATE INDEX IF NOT EXISTS card_tags_tag ON card_tags (lang, tag);
+"""
+
+
+class CardStore:
+    """SQLite store of cards for every language.
+
+    Writes are only committed at the end of a 'transaction' block:
+        with CardStore(path) as store, store.transaction():
+            store.delete_language("el")
+            store.upsert_cards("el", cards)
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Commit every write of the block at once, or none of them on error."""
+        with self._conn:
+            yield
+
+    def count(self, lang: str) -> int:
+        query = "SELECT COUNT(*) FROM cards WHERE lang = ?"
+        return int(self._conn.execute(query, (lang,)).fetchone()[0])
+
+    def delete_language(self, lang: str) -> None:
+        self._conn.execute("DELETE FROM cards WHERE lang = ?", (lang,))
+
+    def delete_cards(self, lang: str, pks: Iterable[int]) -> None:
+        self._conn.executemany(
+            "DELETE FROM cards WHERE lang = ? AND pk = ?", ((lang, pk) for pk in pks)
+        )
+
+    def upsert_cards(self, lang: str, cards: list[Card]) -> None:
+        # Deleting a card cascades to its tags and hints.
+        self.delete_cards(lang, (card.pk for card in cards))
+        self._conn.executemany(
+            "INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    lang,
+                    card.pk,
+                    card.term,
+                    card.status,
+                    card.extended_status,
+                    card.displayed_status(),
+                    card.importance,
+                    card.model_dump_json(),
+                )
+                for card in cards
+            ),
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO card_tags VALUES (?, ?, ?)",
+            ((lang, card.pk, tag) for card in cards for tag in card.tags),
+        )
+        self._conn.executemany(
+            "INSERT INTO card_hints VALUES (?, ?, ?, ?, ?)",
+            (
+                (lang, card.pk, position, hint.locale, hint.text)
+                for card in cards
+                for position, hint in enumerate(card.hints)
+            ),
+        )
+
+    def iter_cards_json(
+        self,
+        lang: str,
+        *,
+        term: str | None = None,
+        statuses: Collection[int] | None = None,
+        tag: str | None = None,
+        min_importance: int | None = None,
+    ) -> Iterator[str]:
+        """Query the cards of a language, in insertion order, as JSON strings.
+
+        The statuses are the ones displayed by LingQ (1-5), cf. Card.displayed_status.
+        """
+        query = "SELECT data FROM cards WHERE lang = ?"
+        params: list[Any] = [lang]
+        if term is not None:
+            query += " AND term = ?"
+            params.append(term)
+        if statuses is not None:
+            query += f" AND displayed_status IN ({', '.join('?' * len(statuses))})"
+            params.extend(statuses)
+        if tag is not None:
+            query += " AND pk IN (SELECT pk FROM card_tags WHERE lang = ? AND tag = ?)"
+            params.extend((lang, tag))
+        if min_importance is not None:
+            query += " AND importance >= ?"
+            params.append(min_importance)
+        query += " ORDER BY rowid"
+
+        for (data,) in self._conn.execute(query, params):
+            yield data
+
+    def iter_cards(
+        self,
+        lang: str,
+        *,
+        term: str | None = None,
+        statuses: Collection[int] | None = None,
+        tag: str | None = None,
+        min_importance: int | None = None,
+    ) -> Iterator[Card]:
+        """Query the cards of a language, in insertion order. Cf. iter_cards_json."""
+        cards_json = self.iter_cards_json(
+            lang, term=term, statuses=statuses, tag=tag, min_importance=min_importance
+        )
+        for data in cards_json:
+            yield Card.model_validate_json(data)
@@ -3,8 +3,10 @@ import time
 import unicodedata
 from collections.abc import Callable
 from functools import wraps
+from math import ceil
 from pathlib import Path
 from typing import Any, Literal, Type
+from urllib.parse import parse_qs, urlencode, urlsplit
 
 import roman
 from natsort import natsort_keygen, os_sorted
@@ -57,6 +59,28 @@ def model_validate_or_exit[T: BaseModel](
         sys.exit(1)
 
 
+def remaining_page_urls(next_url: str, count: int, page_size: int) -> list[str] | None:
+    """Compute the urls of every page after the first one of a paginated response.
+
+    Return None if 'next_url' (the url of the second page) has no page parameter.
+
+    >>> remaining_page_urls("https://x.com/cards/?page=2&page_size=2", 5, 2)
+    ['https://x.com/cards/?page=2&page_size=2', 'https://x.com/cards/?page=3&page_size=2']
+    """
+    parts = urlsplit(next_url)
+    query = parse_qs(parts.query)
+    if "page" not in query:
+        return None
+    if "page_size" in query:
+        page_size = int(query["page_size"][0])
+    n_pages = ceil(count / page_size)
+    urls = []
+    for page in range(2, n_pages + 1):
+        query["page"] = [str(page)]
+        urls.append(parts._replace(query=urlencode(query, doseq=True)).geturl())
+    return urls
+
+
 def normalize_greek_word(word: str) -> str:
     """Return a greek word without accents in lowercase.
     ["Άλφα", "Αλφα", "άλφα", "αλφα"] are all converted into "αλφα".
@@ -0,0 +1,40 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lingq import config
+from lingq.lingqhandler import LingqHandler
+
+
+@pytest.fixture
+def config_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """A config file with a fake API key, for the handlers made in the test."""
+    path = tmp_path / ".env"
+    path.write_text("APIKEY=key\n")
+    monkeypatch.setattr(config, "CONFIG_PATH", path)
+    return path
+
+
+class LangRecorder:
+    """Stands for the download of one language: record how many run at once."""
+
+    def __init__(self) -> None:
+        self.langs: list[str] = []
+        self.sessions: set[int] = set()
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, handler: LingqHandler, *_: Any, **__: Any) -> None:
+        self.langs.append(handler.lang)
+        self.sessions.add(id(handler.session))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+
+
+@pytest.fixture
+def lang_recorder() -> LangRecorder:
+    return LangRecorder()
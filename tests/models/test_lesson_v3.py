@@ -1,7 +1,9 @@
 import json
 from pathlib import Path
 
-from lingq.models.lesson_v3 import LessonV3
+import pytest
+
+from lingq.models.lesson_v3 import LessonV3, LessonV3View
 
 
 def make_test_lesson_v3(lang: str) -> None:
@@ -50,3 +52,17 @@ def test_lesson_v3_it() -> None:
 
 def test_lesson_v3_pt() -> None:
     make_test_lesson_v3("pt")
+
+
+@pytest.mark.parametrize("lang", ["ja", "el", "de", "en"])
+def test_lesson_v3_view(lang: str) -> None:
+    fixture_path = Path("tests/models/models_fixtures/lessons") / f"{lang}.json"
+    with fixture_path.open("r") as json_file:
+        data = json.load(json_file)
+    lesson = LessonV3.model_validate(data)
+    view = LessonV3View.model_validate(data)
+
+    assert view.get_raw_text() == lesson.get_raw_text()
+    assert view.to_vtt() == lesson.to_vtt()
+    assert view.tokenized_text == lesson.tokenized_text
+    assert view.to_lesson() == lesson
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from lingq.cli import cli
+
+HEAVY_MODULES = ["aiohttp", "pydantic", "yt_dlp", "Levenshtein", "natsort", "roman"]
+
+
+def get_imported_modules(code: str) -> dict[str, int]:
+    """Run code in a fresh interpreter, and get the cumulative import time (us) by module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_cli_imports_are_lazy() -> None:
+    modules = get_imported_modules("import lingq.cli")
+    assert "lingq.cli" in modules
+    heavy = [module for module in HEAVY_MODULES if module in modules]
+    assert not heavy, f"lingq.cli imports {heavy} at startup"
+
+
+def test_help() -> None:
+    result = CliRunner().invoke(cli, ["get", "words", "--help"])
+    assert result.exit_code == 0
+    assert "--format" in result.output
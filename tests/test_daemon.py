@@ -0,0 +1,100 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from lingq import config
+from lingq.daemon import forward
+from lingq.lingqhandler import LingqHandler, run_async
+
+
+@contextmanager
+def running_daemon(tmp_path: Path, setup: str = "") -> Iterator[Path]:
+    """Run a daemon in another process, after running 'setup' there, and get its socket."""
+    path = tmp_path / "lingq.sock"
+    code = "\n".join(
+        [
+            "import asyncio",
+            "from pathlib import Path",
+            "from lingq.daemon import serve",
+            setup,
+            f"asyncio.run(serve(Path({str(path)!r})))",
+        ]
+    )
+    config_path = tmp_path / "config" / "lingq" / ".env"
+    config_path.parent.mkdir(parents=True)
+    config_path.write_text("APIKEY=key\n")
+    env = os.environ | {"XDG_CONFIG_HOME": str(tmp_path / "config")}
+    daemon = subprocess.Popen([sys.executable, "-c", code], env=env)
+    try:
+        deadline = time.monotonic() + 10
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        yield path
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+def test_forward(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert forward(["--help"], tmp_path / "lingq.sock") is None
+
+    with running_daemon(tmp_path) as path:
+        assert forward(["show", "--help"], path) == 0
+        assert "Show commands." in capsys.readouterr().out
+        assert forward(["unknown"], path) == 2
+        assert "No such command" in capsys.readouterr().err
+
+
+EXITING_STATS = """
+import sys
+from lingq.commands import stats
+from lingq.lingqhandler import LingqHandler
+
+LingqHandler.get_user_langs = classmethod(lambda cls, refresh=False: ["el"])
+
+async def stats_async(lang):
+    async with LingqHandler(lang):
+        sys.exit(3)
+
+stats.stats_async = stats_async
+"""
+
+
+def test_command_exit_does_not_stop_the_daemon(tmp_path: Path) -> None:
+    with running_daemon(tmp_path, EXITING_STATS) as path:
+        # The exit of the command, on the loop of the daemon, is the exit code of the call.
+        assert forward(["show", "stats", "el"], path) == 3
+        assert forward(["show", "stats", "el"], path) == 3
+
+
+def test_handlers_share_the_base_handler(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    config_path = tmp_path / ".env"
+    config_path.write_text("APIKEY=key\n")
+    monkeypatch.setattr(config, "CONFIG_PATH", config_path)
+
+    async def make_handler() -> LingqHandler:
+        async with LingqHandler("el") as handler:
+            return handler
+
+    async def main() -> None:
+        async with LingqHandler("Filler") as base:
+            LingqHandler.share(base)
+            try:
+                # As a command does, from the thread it runs in.
+                handler = await asyncio.to_thread(run_async, make_handler())
+            finally:
+                LingqHandler.share(None)
+            assert handler.session is base.session
+            assert handler.limiter is base.limiter
+            assert handler.retry_policy is base.retry_policy
+            assert not handler._owns_session
+            assert not base.session.closed
+
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+import asyncio
+import base64
+import hashlib
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from aiohttp import web
+
+from lingq.download import DownloadError, ResumableDownload
+from lingq.jsonstream import CHUNK_SIZE
+from lingq.lingqhandler import LingqHandler
+from lingq.ratelimiter import RateLimiter
+
+URL = "https://example.com/audio.mp3"
+BODY = b"0123456789" * 100
+
+
+def headers_of(body: bytes) -> dict[str, str]:
+    md5 = base64.b64encode(hashlib.md5(body, usedforsecurity=False).digest()).decode()
+    return {"Content-Length": str(len(body)), "ETag": '"v1"', "Content-MD5": md5}
+
+
+def test_resume(tmp_path: Path) -> None:
+    path = tmp_path / "audio.mp3"
+    download = ResumableDownload(URL, path)
+    assert "Range" not in download.request_headers()
+    with download.open(200, headers_of(BODY)) as file:
+        file.write(BODY[:300])
+    with pytest.raises(DownloadError, match="Incomplete"):
+        download.finish()
+
+    # As in a later run of the same command.
+    download = ResumableDownload(URL, path)
+    assert download.offset == 300
+    headers = download.request_headers()
+    assert headers["Range"] == "bytes=300-"
+    assert headers["If-Range"] == '"v1"'
+    with download.open(206, {"Content-Range": f"bytes 300-999/{len(BODY)}"}) as file:
+        file.write(BODY[300:])
+    assert download.finish() == path
+    assert path.read_bytes() == BODY
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_changed_file_restarts(tmp_path: Path) -> None:
+    path = tmp_path / "audio.mp3"
+    download = ResumableDownload(URL, path)
+    with download.open(200, headers_of(BODY)) as file:
+        file.write(BODY[:300])
+
+    # If-Range did not match: the server sends the new file in full.
+    new_body = BODY[::-1]
+    download = ResumableDownload(URL, path)
+    with download.open(200, headers_of(new_body)) as file:
+        file.write(new_body)
+    download.finish()
+    assert path.read_bytes() == new_body
+
+
+def test_corrupted_download_is_discarded(tmp_path: Path) -> None:
+    path = tmp_path / "audio.mp3"
+    download = ResumableDownload(URL, path)
+    with download.open(200, headers_of(BODY)) as file:
+        file.write(b"x" * len(BODY))
+    with pytest.raises(DownloadError, match="MD5"):
+        download.finish()
+    assert list(tmp_path.iterdir()) == []
+
+
+def download_audio(audio_url: str | None, path: Path, body: bytes) -> tuple[Path | None, int]:
+    """Download the audio of a lesson from a local server that serves 'body'.
+
+    Return the result and the number of requests.
+    """
+    hits = 0
+
+    async def handle(request: web.Request) -> web.Response:
+        nonlocal hits
+        hits += 1
+        await request.read()
+        headers = headers_of(body)
+        del headers["Content-Length"]
+        return web.Response(body=body, headers=headers)
+
+    async def run() -> Path | None:
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = audio_url and f"http://127.0.0.1:{runner.addresses[0][1]}/{audio_url}"
+        lesson: Any = SimpleNamespace(audio_url=url, title="Lesson")
+        try:
+            limiter = RateLimiter(requests_per_second=1000)
+            async with LingqHandler("el", limiter=limiter) as handler:
+                return await handler.download_audio_from_lesson(lesson, path)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(run()), hits
+
+
+@pytest.mark.usefixtures("config_path")
+def test_lesson_audio_is_streamed_to_disk(tmp_path: Path) -> None:
+    path = tmp_path / "audio" / "lesson.mp3"
+    body = BODY * (3 * CHUNK_SIZE // len(BODY))
+    assert download_audio(None, path, body) == (None, 0)
+
+    # Several chunks, with a Content-MD5 that is checked once the file is complete.
+    assert download_audio("audio.mp3", path, body) == (path, 1)
+    assert path.read_bytes() == body
+    assert list(path.parent.iterdir()) == [path]
+
+    # Already downloaded.
+    assert download_audio("audio.mp3", path, body) == (path, 0)
@@ -0,0 +1,83 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from lingq.commands import get_lessons
+from lingq.commands.get_lesson import get_lesson_async
+from lingq.download import DownloadError
+
+HANDLER: Any = SimpleNamespace(lang="el", limiter=SimpleNamespace(max_in_flight=2))
+
+
+def patch_io(
+    monkeypatch: pytest.MonkeyPatch, written: list[tuple[int, int]], fail_id: int = -1
+) -> None:
+    async def get_lesson_async(_handler: Any, lesson_id: int, *_: Any) -> Any:
+        await asyncio.sleep(0.02 * lesson_id)
+        if lesson_id == fail_id:
+            raise RuntimeError("Fetch failed")
+        return SimpleNamespace(id=lesson_id) if lesson_id != 2 else None
+
+    def write_lesson(_lang: str, lesson: Any, _opath: Path, idx: int | None) -> None:
+        assert idx is not None
+        written.append((idx, lesson.id))
+
+    monkeypatch.setattr(get_lessons, "get_lesson_async", get_lesson_async)
+    monkeypatch.setattr(get_lessons, "write_lesson", write_lesson)
+
+
+def fetch_and_write(lesson_ids: list[int], *, write: bool = True) -> list[Any]:
+    lessons = [(idx, SimpleNamespace(id=lesson_id)) for idx, lesson_id in enumerate(lesson_ids, 1)]
+    return asyncio.run(
+        get_lessons.fetch_and_write_lessons(
+            HANDLER,
+            lessons,  # type: ignore[arg-type]
+            Path(),
+            download_audio=False,
+            download_timestamps=False,
+            write=write,
+            with_index=True,
+        )
+    )
+
+
+def test_lessons_are_written_as_fetched(monkeypatch: pytest.MonkeyPatch) -> None:
+    written: list[tuple[int, int]] = []
+    patch_io(monkeypatch, written)
+    # Lessons that failed (None) are skipped. Written lessons are not kept.
+    assert fetch_and_write([5, 4, 3, 2, 1]) == []
+    assert written == [(2, 4), (1, 5), (3, 3), (5, 1)]
+
+
+def test_lessons_not_written_are_returned(monkeypatch: pytest.MonkeyPatch) -> None:
+    written: list[tuple[int, int]] = []
+    patch_io(monkeypatch, written)
+    lessons = fetch_and_write([5, 4, 3, 2, 1], write=False)
+    # In the order of the course.
+    assert [lesson.id for lesson in lessons] == [5, 4, 3, 1]
+    assert written == []
+
+
+def test_fetched_lessons_are_written_on_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    written: list[tuple[int, int]] = []
+    patch_io(monkeypatch, written, fail_id=3)
+    with pytest.raises(RuntimeError, match="Fetch failed"):
+        fetch_and_write([1, 3, 4, 5])
+    assert written == [(1, 1)]
+
+
+def test_lesson_is_kept_when_its_audio_fails() -> None:
+    lesson = SimpleNamespace(id=1, collection_title="Course", _audio_path=None)
+
+    handler: Any = SimpleNamespace(
+        lang="el",
+        get_lesson_view_from_id=AsyncMock(return_value=lesson),
+        download_audio_from_lesson=AsyncMock(side_effect=DownloadError("Incomplete download")),
+    )
+    fetched = asyncio.run(get_lesson_async(handler, 1, Path(), True, False))
+    assert fetched is lesson
+    assert fetched._audio_path is None
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from aiohttp import web
+
+from lingq import httpcache
+from lingq.httpcache import ResponseCache, get_cache_path
+from lingq.lingqhandler import LingqHandler
+from lingq.ratelimiter import RateLimiter
+
+BASE_URL = "https://www.lingq.com/api/v3/el/"
+
+
+def test_key_sorts_params() -> None:
+    key1 = ResponseCache.key("get", f"{BASE_URL}search", {"page": 2, "level": [1, 2]})
+    key2 = ResponseCache.key("GET", f"{BASE_URL}search", {"level": [1, 2], "page": 2})
+    assert key1 == key2
+    assert key1 == f"GET {BASE_URL}search?level=1&level=2&page=2"
+
+
+def test_cache_path_per_account() -> None:
+    assert get_cache_path("key1") == get_cache_path("key1")
+    assert get_cache_path("key1") != get_cache_path("key2")
+    assert "key1" not in get_cache_path("key1").name
+
+
+def test_freshness(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    lesson_url = f"{BASE_URL}lessons/123/"
+    cache.put("lesson", lesson_url, b"{}", {})
+    cached = cache.get("lesson")
+    assert cached is not None
+    assert cached.body == b"{}"
+    assert ResponseCache.is_fresh(cached, lesson_url)
+    cached.stored_at = time.time() - 2 * 60 * 60
+    assert not ResponseCache.is_fresh(cached, lesson_url)
+
+    # Responses without a TTL are only kept if they can be revalidated.
+    cards_url = f"{BASE_URL}cards/"
+    cache.put("cards", cards_url, b"[]", {})
+    assert cache.get("cards") is None
+    cache.put("cards", cards_url, b"[]", {"ETag": '"abc"'})
+    cached = cache.get("cards")
+    assert cached is not None
+    assert not ResponseCache.is_fresh(cached, cards_url)
+    assert cached.validators() == {"If-None-Match": '"abc"'}
+    cache.close()
+
+
+def test_invalidate_write(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    urls = [
+        f"{BASE_URL}lessons/123/",
+        f"{BASE_URL}lessons/1234/",
+        f"{BASE_URL}collections/my/",
+        f"{BASE_URL}search/",
+        "https://www.lingq.com/api/v2/languages/",
+    ]
+    for url in urls:
+        cache.put(url, url, b"{}", {})
+    cache.invalidate_write(f"{BASE_URL}lessons/123/", [BASE_URL])
+    kept = [url for url in urls if cache.get(url) is not None]
+    assert kept == [f"{BASE_URL}lessons/1234/", "https://www.lingq.com/api/v2/languages/"]
+    cache.close()
+
+
+def test_get_is_revalidated(
+    config_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config_path.write_text("APIKEY=key\nHTTP_CACHE=true\n")
+    monkeypatch.setattr(httpcache, "CACHE_DIR", tmp_path / "cache")
+    conditions: list[str | None] = []
+
+    async def handle(request: web.Request) -> web.Response:
+        etag = request.headers.get("If-None-Match")
+        conditions.append(etag)
+        await request.read()
+        if etag == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.json_response({"cards": [1, 2]}, headers={"ETag": '"v1"'})
+
+    async def run() -> list[Any]:
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        base_url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        monkeypatch.setattr(LingqHandler, "url", lambda _, endpoint, **__: f"{base_url}/{endpoint}")
+        try:
+            limiter = RateLimiter(requests_per_second=1000)
+            async with LingqHandler("el", limiter=limiter) as handler:
+                assert handler.cache is not None
+                return [await handler._request("GET", "cards/") for _ in range(2)]
+        finally:
+            await runner.cleanup()
+
+    first, second = asyncio.run(run())
+    # Cards have no TTL: the second GET is conditional, and its 304 serves the cached body.
+    assert conditions == [None, '"v1"']
+    assert first == second == {"cards": [1, 2]}
@@ -0,0 +1,77 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from lingq.jsonstream import JsonMembersReader, read_json_members
+from lingq.models.lesson_v3 import LESSON_TEXT_KEYS, LessonV3View
+
+LESSON_FIXTURE = Path("tests/models/models_fixtures/lessons/el.json")
+
+
+def feed_by(text: str, chunk_size: int, reader: JsonMembersReader) -> dict:
+    for idx in range(0, len(text), chunk_size):
+        if reader.feed(text[idx : idx + chunk_size]):
+            return reader.members
+    return reader.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_members_are_read(chunk_size: int) -> None:
+    data = {"a": 12345, "b": {"c": [1, 2.5, None]}, "d": 'x"}', "e": [[1], [2], [3]], "f": True}
+    text = json.dumps(data, indent=2)
+
+    reader = JsonMembersReader(data.keys())
+    assert feed_by(text, chunk_size, reader) == data
+
+    reader = JsonMembersReader({"a", "d", "f"})
+    assert feed_by(text, chunk_size, reader) == {"a": 12345, "d": 'x"}', "f": True}
+
+    reader = JsonMembersReader({"e", "f"}, first_item_keys={"e"})
+    assert feed_by(text, chunk_size, reader) == {"e": [[1]], "f": True}
+
+
+def test_missing_members() -> None:
+    reader = JsonMembersReader({"a", "missing"})
+    assert feed_by('{"a": 1, "b": 2}', 3, reader) == {"a": 1}
+
+    reader = JsonMembersReader({"a", "missing"})
+    with pytest.raises(json.JSONDecodeError):
+        feed_by('{"a": 1, "b": ', 3, reader)
+
+
+def test_stream_stops_early() -> None:
+    raw = LESSON_FIXTURE.read_bytes()
+    data = json.loads(raw)
+    consumed = 0
+
+    async def chunks() -> AsyncIterator[bytes]:
+        nonlocal consumed
+        for idx in range(0, len(raw), 1000):
+            consumed += 1000
+            await asyncio.sleep(0)
+            yield raw[idx : idx + 1000]
+
+    members = asyncio.run(read_json_members(chunks(), {"title", "tokenizedText"}))
+    assert members == {"title": data["title"], "tokenizedText": data["tokenizedText"]}
+    assert consumed < len(raw)
+
+
+def test_lesson_text_stops_before_the_cards() -> None:
+    raw = Path("tests/models/models_fixtures/lessons/en.json").read_bytes()
+    consumed = 0
+
+    async def chunks() -> AsyncIterator[bytes]:
+        nonlocal consumed
+        for idx in range(0, len(raw), 1000):
+            consumed += 1000
+            await asyncio.sleep(0)
+            yield raw[idx : idx + 1000]
+
+    members = asyncio.run(read_json_members(chunks(), LESSON_TEXT_KEYS))
+    assert "cards" not in members
+    # The text ends at about 1.06 MB, then come the cards and the words.
+    assert consumed < raw.index(b'\n    "cardsCount"')
+    assert LessonV3View.model_validate(members).cards_count is None
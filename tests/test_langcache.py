@@ -0,0 +1,52 @@
+import os
+import time
+from pathlib import Path
+
+from lingq.langcache import REFRESH_TIMEOUT, LanguagesCache, claim_refresh, release_refresh
+from lingq.models.language import Language
+
+
+def make_language(code: str, known_words: int) -> Language:
+    return Language(
+        id=1,
+        url=f"https://www.lingq.com/api/v2/{code}/",
+        code=code,
+        title=code,
+        supported=True,
+        known_words=known_words,
+    )
+
+
+def test_languages_cache(tmp_path: Path) -> None:
+    path = tmp_path / "languages.json"
+    assert LanguagesCache.load(path) is None
+
+    languages = [make_language("el", 120), make_language("eo", 0)]
+    LanguagesCache(fetched_at=time.time(), languages=languages).save(path)
+    cache = LanguagesCache.load(path)
+    assert cache is not None
+    assert cache.languages == languages
+    assert cache.user_langs() == ["el"]
+    assert not cache.is_stale()
+    assert cache.is_stale(ttl=0)
+
+
+def test_outdated_languages_cache(tmp_path: Path) -> None:
+    path = tmp_path / "languages.json"
+    path.write_text('{"languages": []}')
+    assert LanguagesCache.load(path) is None
+
+
+def test_claim_refresh(tmp_path: Path) -> None:
+    path = tmp_path / "languages.json"
+    assert claim_refresh(path)
+    assert not claim_refresh(path)
+    release_refresh(path)
+    assert claim_refresh(path)
+
+    # The claim of a refresh that never ended is taken over.
+    lock_path = path.with_suffix(".lock")
+    old = time.time() - 2 * REFRESH_TIMEOUT
+    os.utime(lock_path, (old, old))
+    assert claim_refresh(path)
+    assert not claim_refresh(path)
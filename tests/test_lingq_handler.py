@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import tempfile
 from pathlib import Path
 
 import aiohttp
@@ -135,12 +136,16 @@ async def run_handler(lang: str) -> None:
         assert l2.audio_url is not None
 
         log_start("Getting audios")
-        audio1, audio2 = await asyncio.gather(
-            handler.get_audio_from_lesson(l1),
-            handler.get_audio_from_lesson(l2),
-        )
-        assert audio1 is None
-        assert audio2 is not None
+        with tempfile.TemporaryDirectory() as tmpdir:
+            apath1, apath2 = Path(tmpdir, "1.mp3"), Path(tmpdir, "2.mp3")
+            audio1, audio2 = await asyncio.gather(
+                handler.download_audio_from_lesson(l1, apath1),
+                handler.download_audio_from_lesson(l2, apath2),
+            )
+            assert audio1 is None
+            assert not apath1.exists()
+            assert audio2 == apath2
+            assert apath2.stat().st_size > 0
 
         # 5.1. Patch methods
         log_start("Testing patch text")
@@ -0,0 +1,165 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from lingq.commands import get_courses, get_lessons
+from lingq.commands.get_courses import get_courses_async, get_courses_for_language_async
+from lingq.manifest import Artifact, Manifest
+from lingq.models.collection_v3 import CollectionLessonResult
+
+COURSE_ID = 10
+
+
+def make_lesson(lesson_id: int, title: str = "Title", **kwargs: Any) -> CollectionLessonResult:
+    fields = {
+        "collection_title": "Course",
+        "word_count": 100,
+        "unique_word_count": 50,
+        "duration": 60,
+        "audio": None,
+    }
+    return CollectionLessonResult.model_construct(
+        id=lesson_id, collection_id=COURSE_ID, title=title, **(fields | kwargs)
+    )
+
+
+def write(root: Path, name: str, text: str = "text") -> Artifact:
+    path = root / "el" / "Course" / "texts" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return Artifact.from_path("text", path)
+
+
+def test_outdated_lessons(tmp_path: Path) -> None:
+    lesson = make_lesson(1)
+    with Manifest(tmp_path) as manifest:
+        assert manifest.outdated([lesson], with_audio=False, with_timestamps=False) == [lesson]
+
+        artifact = write(tmp_path, "Title.txt")
+        manifest.record_lesson("el", lesson, [artifact], with_audio=False, with_timestamps=False)
+        assert manifest.outdated([lesson], with_audio=False, with_timestamps=False) == []
+
+        # Edited on LingQ, asked for audio, or edited on disk.
+        edited = make_lesson(1, word_count=101)
+        assert manifest.outdated([edited], with_audio=False, with_timestamps=False) == [edited]
+        assert manifest.outdated([lesson], with_audio=True, with_timestamps=False) == [lesson]
+        artifact.path.write_text("longer text", encoding="utf-8")
+        assert manifest.outdated([lesson], with_audio=False, with_timestamps=False) == [lesson]
+
+
+def test_renamed_lesson_replaces_its_files(tmp_path: Path) -> None:
+    with Manifest(tmp_path) as manifest:
+        old = write(tmp_path, "Old.txt")
+        manifest.record_lesson(
+            "el", make_lesson(1, "Old"), [old], with_audio=False, with_timestamps=False
+        )
+        new = write(tmp_path, "New.txt")
+        replaced = manifest.record_lesson(
+            "el", make_lesson(1, "New"), [new], with_audio=False, with_timestamps=False
+        )
+        assert replaced == [old.path]
+
+
+def test_lesson_with_new_audio_is_outdated(tmp_path: Path) -> None:
+    lesson = make_lesson(1)
+    with Manifest(tmp_path) as manifest:
+        artifact = write(tmp_path, "Title.txt")
+        manifest.record_lesson("el", lesson, [artifact], with_audio=True, with_timestamps=False)
+        assert manifest.outdated([lesson], with_audio=True, with_timestamps=False) == []
+
+        # The word counts, and so the counters of the course, do not change.
+        with_audio = make_lesson(1, audio="https://www.lingq.com/audio/1.mp3")
+        assert manifest.outdated([with_audio], with_audio=False, with_timestamps=False) == [
+            with_audio
+        ]
+
+
+def test_forget_lessons(tmp_path: Path) -> None:
+    with Manifest(tmp_path) as manifest:
+        for lesson_id in (1, 2):
+            artifact = write(tmp_path, f"{lesson_id}.txt")
+            manifest.record_lesson(
+                "el", make_lesson(lesson_id), [artifact], with_audio=False, with_timestamps=False
+            )
+        assert manifest.forget_lessons(COURSE_ID, [1]) == 1
+        assert manifest.outdated(
+            [make_lesson(1), make_lesson(2)], with_audio=False, with_timestamps=False
+        ) == [make_lesson(2)]
+
+
+def test_synced_course_is_listed_again(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    listing = [make_lesson(1)]
+    fetched: list[int] = []
+
+    async def get_collection_lessons_from_id(_: int) -> list[CollectionLessonResult]:
+        await asyncio.sleep(0)
+        return listing
+
+    async def get_my_collections() -> Any:
+        await asyncio.sleep(0)
+        return SimpleNamespace(count=1, results=[SimpleNamespace(id=COURSE_ID)])
+
+    async def get_lesson_async(_handler: Any, lesson_id: int, *_: Any) -> Any:
+        await asyncio.sleep(0)
+        fetched.append(lesson_id)
+        return SimpleNamespace(id=lesson_id, _audio_path=None)
+
+    def write_lesson(_lang: str, lesson: Any, opath: Path, _idx: int | None) -> dict[str, Path]:
+        return {"text": write(opath, f"{lesson.id}.txt").path}
+
+    monkeypatch.setattr(get_lessons, "get_lesson_async", get_lesson_async)
+    monkeypatch.setattr(get_lessons, "write_lesson", write_lesson)
+    handler: Any = SimpleNamespace(
+        lang="el",
+        limiter=SimpleNamespace(max_in_flight=2),
+        get_my_collections=get_my_collections,
+        get_collection_lessons_from_id=get_collection_lessons_from_id,
+    )
+
+    def sync() -> None:
+        with Manifest(tmp_path) as manifest:
+            asyncio.run(
+                get_courses_for_language_async(
+                    handler,
+                    tmp_path,
+                    manifest,
+                    download_audio=False,
+                    download_timestamps=False,
+                    skip_downloaded=True,
+                    batch_size=1,
+                )
+            )
+
+    sync()
+    sync()
+    assert fetched == [1]
+    # Only the audio of the lesson changes, which the counters of the course miss.
+    listing[0] = make_lesson(1, audio="https://www.lingq.com/audio/1.mp3")
+    sync()
+    assert fetched == [1, 1]
+
+
+@pytest.mark.usefixtures("config_path")
+def test_several_languages_at_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, lang_recorder: Any
+) -> None:
+    monkeypatch.setattr(get_courses, "get_courses_for_language_async", lang_recorder)
+    langs = ["el", "de", "ja", "fr"]
+    asyncio.run(
+        get_courses_async(
+            langs,
+            tmp_path,
+            download_audio=False,
+            download_timestamps=False,
+            skip_downloaded=True,
+            batch_size=1,
+            parallel_langs=2,
+            assume_yes=True,
+        )
+    )
+    assert sorted(lang_recorder.langs) == sorted(langs)
+    assert lang_recorder.max_running == 2
+    assert len(lang_recorder.sessions) == 1
@@ -0,0 +1,123 @@
+import asyncio
+import contextlib
+
+from lingq.ratelimiter import RateLimiter
+
+
+def test_concurrency_is_bounded() -> None:
+    limiter = RateLimiter(requests_per_second=1000, max_in_flight=4)
+    max_seen = 0
+
+    async def request() -> None:
+        nonlocal max_seen
+        async with limiter.slot() as slot:
+            max_seen = max(max_seen, limiter.in_flight)
+            await asyncio.sleep(0.01)
+            slot.status = 200
+
+    async def run() -> None:
+        await asyncio.gather(*(request() for _ in range(20)))
+
+    asyncio.run(run())
+    assert 1 <= max_seen <= 4
+    assert limiter.in_flight == 0
+
+
+def test_increase_on_fast_responses() -> None:
+    limiter = RateLimiter(requests_per_second=1000, max_in_flight=8)
+    initial_rate, initial_concurrency = limiter.rate, limiter.concurrency
+
+    async def run() -> None:
+        for _ in range(50):
+            async with limiter.slot() as slot:
+                slot.status = 200
+
+    asyncio.run(run())
+    assert limiter.rate > initial_rate
+    assert limiter.concurrency > initial_concurrency
+    assert limiter.rate <= limiter.max_rate
+    assert limiter.concurrency <= limiter.max_in_flight
+
+
+def test_burst_of_throttled_responses_decreases_once() -> None:
+    limiter = RateLimiter(requests_per_second=1000, max_in_flight=8)
+    initial_rate = limiter.rate
+
+    async def request() -> None:
+        async with limiter.slot() as slot:
+            # Longer than the pacing of the four requests, even on a busy machine.
+            await asyncio.sleep(0.1)
+            slot.status = 429
+
+    async def run() -> None:
+        await asyncio.gather(*(request() for _ in range(4)))
+
+    asyncio.run(run())
+    assert limiter.rate == initial_rate / 2
+
+
+def test_cancelled_request_releases_its_slot() -> None:
+    limiter = RateLimiter(requests_per_second=1, max_in_flight=1)
+
+    async def request() -> None:
+        async with limiter.slot() as slot:
+            slot.status = 200
+
+    async def run() -> None:
+        await request()
+        # The next request waits for a token (about a second), and is cancelled meanwhile.
+        task = asyncio.create_task(request())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        assert limiter.in_flight == 0
+        await asyncio.wait_for(request(), timeout=5)
+
+    asyncio.run(run())
+    assert limiter.in_flight == 0
+
+
+def test_limits_only_decrease_on_overload() -> None:
+    limiter = RateLimiter(requests_per_second=1000, max_in_flight=8)
+    initial_rate = limiter.rate
+
+    async def request(error: BaseException, status: int | None) -> None:
+        async with limiter.slot() as slot:
+            slot.status = status
+            raise error
+
+    async def cancelled_request() -> None:
+        async with limiter.slot() as slot:
+            slot.status = 200
+            await asyncio.sleep(10)
+
+    async def run() -> None:
+        with contextlib.suppress(ValueError):
+            await request(ValueError("Range not satisfiable"), 416)
+        task = asyncio.create_task(cancelled_request())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        assert limiter.rate == initial_rate
+
+        with contextlib.suppress(TimeoutError):
+            await request(TimeoutError(), None)
+        assert limiter.rate == initial_rate / 2
+
+    asyncio.run(run())
+    assert limiter.in_flight == 0
+
+
+def test_server_errors_decrease() -> None:
+    limiter = RateLimiter(requests_per_second=1000, max_in_flight=8)
+    initial_rate = limiter.rate
+
+    async def run() -> None:
+        for status in (404, 416, 502):
+            async with limiter.slot() as slot:
+                slot.status = status
+
+    asyncio.run(run())
+    assert limiter.rate == initial_rate / 2
@@ -0,0 +1,61 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from lingq.lingqhandler import LingqHandler
+
+
+def patch_send_request(monkeypatch: pytest.MonkeyPatch, delay: float) -> list[str]:
+    """Answer every request after 'delay' seconds, and return the endpoints sent."""
+    sent: list[str] = []
+
+    async def send_request(_: LingqHandler, method: str, endpoint: str, **__: Any) -> Any:
+        sent.append(endpoint)
+        await asyncio.sleep(delay)
+        return {"endpoint": endpoint}
+
+    monkeypatch.setattr(LingqHandler, "_send_request", send_request)
+    return sent
+
+
+@pytest.mark.usefixtures("config_path")
+def test_identical_gets_are_coalesced(monkeypatch: pytest.MonkeyPatch) -> None:
+    sent = patch_send_request(monkeypatch, delay=0.01)
+
+    async def main() -> list[Any]:
+        async with LingqHandler("el") as handler:
+            return await asyncio.gather(
+                handler._request("GET", "a/"),
+                handler._request("GET", "a/"),
+                handler._request("GET", "b/"),
+            )
+
+    a1, a2, b = asyncio.run(main())
+    assert sent == ["a/", "b/"]
+    assert a1 is a2
+    assert b == {"endpoint": "b/"}
+
+
+@pytest.mark.usefixtures("config_path")
+def test_coalesced_get_is_cancelled_with_its_callers(monkeypatch: pytest.MonkeyPatch) -> None:
+    sent = patch_send_request(monkeypatch, delay=10)
+
+    async def main() -> None:
+        async with LingqHandler("el") as handler:
+            callers = [asyncio.create_task(handler._request("GET", "a/")) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            (request,) = handler._in_flight.values()
+
+            callers[0].cancel()
+            await asyncio.sleep(0.01)
+            # The other caller still waits for it.
+            assert not request.task.done()
+
+            callers[1].cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            assert request.task.cancelled()
+            assert handler._in_flight == {}
+
+    asyncio.run(main())
+    assert sent == ["a/"]
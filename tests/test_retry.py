@@ -0,0 +1,150 @@
+import asyncio
+import time
+from collections.abc import Callable
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any
+
+import pytest
+from aiohttp import web
+
+from lingq import config
+from lingq.lingqhandler import LingqHandler
+from lingq.ratelimiter import RateLimiter
+from lingq.retry import LOCKED_DELAYS, RetryPolicy, parse_retry_after
+
+Responder = Callable[[int], web.Response]
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("soon") is None
+    in_a_minute = parse_retry_after(formatdate(time.time() + 60, usegmt=True))
+    assert in_a_minute is not None
+    assert 55 < in_a_minute <= 60
+
+
+def test_delays() -> None:
+    policy = RetryPolicy(base_delay=1.0, max_delay=60.0)
+    for attempt in range(1, 10):
+        assert 0 <= policy.delay(attempt) <= min(60.0, 2 ** (attempt - 1))
+    assert 30 <= policy.delay(1, retry_after=30) <= 31
+    assert 60 <= policy.delay(1, retry_after=3600) <= 61
+    locked_delay = LOCKED_DELAYS["TRANSCRIBE_AUDIO"]
+    assert locked_delay / 2 <= policy.delay(1, locked_reason="TRANSCRIBE_AUDIO") <= locked_delay
+
+
+def test_budget() -> None:
+    policy = RetryPolicy(max_budget=2, refill=0.5)
+    assert policy.spend()
+    assert policy.spend()
+    assert not policy.spend()
+    policy.record_success()
+    assert not policy.spend()
+    policy.record_success()
+    assert policy.spend()
+    for _ in range(10):
+        policy.record_success()
+    assert policy.budget == policy.max_budget
+
+
+def serve_and_get(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    respond: Responder,
+    policy: RetryPolicy,
+) -> tuple[Any, int]:
+    """GET through a handler from a local server, that answers the n-th hit with 'respond'.
+
+    Return the result, or the exception raised, and the number of hits.
+    """
+    config_path = tmp_path / ".env"
+    config_path.write_text("APIKEY=key\n")
+    monkeypatch.setattr(config, "CONFIG_PATH", config_path)
+    hits = 0
+
+    async def handle(request: web.Request) -> web.Response:
+        nonlocal hits
+        hits += 1
+        await request.read()
+        return respond(hits)
+
+    async def run() -> Any:
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        base_url = f"http://127.0.0.1:{port}"
+        monkeypatch.setattr(LingqHandler, "url", lambda _, endpoint, **__: f"{base_url}/{endpoint}")
+        try:
+            limiter = RateLimiter(requests_per_second=1000)
+            async with LingqHandler("el", limiter=limiter, retry_policy=policy) as handler:
+                return await handler._request("GET", "stats/")
+        except RuntimeError as e:
+            return e
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(run()), hits
+
+
+def test_error_pages_are_retried(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def respond(hit: int) -> web.Response:
+        if hit == 1:
+            return web.Response(status=524, text="<html>Timeout</html>", content_type="text/html")
+        if hit == 2:
+            return web.Response(
+                status=502, text="<html>Bad gateway</html>", content_type="text/html"
+            )
+        return web.json_response({"ok": True})
+
+    policy = RetryPolicy(base_delay=0.01)
+    result, hits = serve_and_get(tmp_path, monkeypatch, respond, policy)
+    assert result == {"ok": True}
+    assert hits == 3
+
+
+class RecordingPolicy(RetryPolicy):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.delays: list[tuple[int, float | None]] = []
+
+    def delay(self, attempt: int, **kwargs: Any) -> float:
+        self.delays.append((attempt, kwargs.get("retry_after")))
+        return super().delay(attempt, **kwargs)
+
+
+def test_throttled_requests_wait_and_spend(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def respond(hit: int) -> web.Response:
+        if hit == 1:
+            return web.json_response(
+                {"detail": "Throttled."}, status=429, headers={"Retry-After": "0"}
+            )
+        if hit == 2:
+            return web.Response(status=503, text="Unavailable", headers={"Retry-After": "0"})
+        return web.json_response({"ok": True})
+
+    policy = RecordingPolicy(base_delay=0.01, max_budget=5, refill=0.5)
+    result, hits = serve_and_get(tmp_path, monkeypatch, respond, policy)
+    assert result == {"ok": True}
+    assert hits == 3
+    assert policy.delays == [(1, 0.0), (2, 0.0)]
+    assert policy.budget == pytest.approx(5 - 2 + 0.5)
+
+
+def test_failing_requests_stop_with_the_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def respond(_: int) -> web.Response:
+        return web.Response(status=500, text="Internal error")
+
+    policy = RecordingPolicy(base_delay=0.01, max_budget=1)
+    result, hits = serve_and_get(tmp_path, monkeypatch, respond, policy)
+    assert isinstance(result, RuntimeError)
+    assert "budget" in str(result)
+    assert hits == 2
+    assert policy.delays == [(1, None)]
@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+
+from lingq.models.cards import Card
+from lingq.store import CardStore
+
+FIXTURE_PATH = Path("tests/fixtures/lingqs/el/lingqs.json")
+
+
+def load_fixture_cards() -> list[Card]:
+    with FIXTURE_PATH.open("r", encoding="utf-8") as f:
+        return [Card.model_validate(card) for card in json.load(f)]
+
+
+def test_store_roundtrip(tmp_path: Path) -> None:
+    cards = load_fixture_cards()
+    with CardStore(tmp_path / "lingqs.sqlite3") as store:
+        with store.transaction():
+            store.upsert_cards("el", cards)
+        assert store.count("el") == len(cards)
+        assert store.count("de") == 0
+        assert list(store.iter_cards("el")) == cards
+
+
+def test_store_queries(tmp_path: Path) -> None:
+    first, second = load_fixture_cards()
+    learned = second.model_copy(update={"status": 3, "extended_status": 3, "tags": ["verb"]})
+    with CardStore(tmp_path / "lingqs.sqlite3") as store:
+        with store.transaction():
+            store.upsert_cards("el", [first, learned])
+        assert list(store.iter_cards("el", term=first.term)) == [first]
+        assert list(store.iter_cards("el", statuses=[1])) == [first]
+        assert list(store.iter_cards("el", statuses=[5])) == [learned]
+        assert list(store.iter_cards("el", tag="verb")) == [learned]
+        assert list(store.iter_cards("el", min_importance=4)) == []
+
+
+def test_store_upsert_and_delete(tmp_path: Path) -> None:
+    first, second = load_fixture_cards()
+    with CardStore(tmp_path / "lingqs.sqlite3") as store:
+        with store.transaction():
+            store.upsert_cards("el", [first, second])
+            # Upserting twice must not duplicate the side tables.
+            store.upsert_cards("el", [first])
+            store.delete_cards("el", [second.pk])
+        assert list(store.iter_cards("el")) == [first]
+        n_hints = store._conn.execute("SELECT COUNT(*) FROM card_hints").fetchone()[0]
+        assert n_hints == len(first.hints)
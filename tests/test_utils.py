@@ -1,5 +1,11 @@
 from lingq.commands.sort import sort_by_versioned_numbers_impl
-from lingq.utils import get_sorting_fn, greek_sorting_fn, roman_sorting_fn, sort_by_greek_words_impl
+from lingq.utils import (
+    get_sorting_fn,
+    greek_sorting_fn,
+    remaining_page_urls,
+    roman_sorting_fn,
+    sort_by_greek_words_impl,
+)
 
 
 def test_greek_sorting_fn() -> None:
@@ -104,3 +110,16 @@ def test_version_sorting() -> None:
     ]
     sorted_entries = sorted(entries, key=sort_by_versioned_numbers_impl)
     assert sorted_entries == expected
+
+
+def test_remaining_page_urls() -> None:
+    base = "https://www.lingq.com/api/v3/el/collections/1/lessons/"
+    urls = remaining_page_urls(f"{base}?page=2", count=55, page_size=25)
+    assert urls == [f"{base}?page=2", f"{base}?page=3"]
+
+    # The page size of the url wins over the size of the first page.
+    base = "https://www.lingq.com/api/v3/el/cards/"
+    urls = remaining_page_urls(f"{base}?page=2&page_size=500", count=1001, page_size=3)
+    assert urls == [f"{base}?page={n}&page_size=500" for n in (2, 3)]
+
+    assert remaining_page_urls(f"{base}?cursor=abc", count=1001, page_size=500) is None
@@ -0,0 +1,160 @@
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from itertools import batched
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lingq.commands import get_words
+from lingq.commands.choices import DumpFormat
+from lingq.commands.get_words import (
+    CHANGES_FILENAME,
+    FULL_SYNC_INTERVAL,
+    SYNC_STATE_FILENAME,
+    SyncState,
+    WordsWriter,
+    find_dump,
+    get_words_async,
+    get_words_for_language_async,
+    iter_dump,
+)
+from lingq.models.cards import Card, Cards
+
+FIXTURE_PATH = Path("tests/fixtures/lingqs/el/lingqs.json")
+
+
+def load_fixture_cards() -> list[Card]:
+    with FIXTURE_PATH.open("r", encoding="utf-8") as f:
+        return [Card.model_validate(card) for card in json.load(f)]
+
+
+def test_words_writer_matches_json_dump(tmp_path: Path) -> None:
+    cards = load_fixture_cards()
+    dump_path = tmp_path / "lingqs.json"
+    with WordsWriter(dump_path) as writer:
+        # Write in two pages
+        writer.write_cards(cards[:2])
+        writer.write_cards(cards[2:])
+
+    expected = json.dumps([card.model_dump() for card in cards], ensure_ascii=False, indent=2)
+    assert dump_path.read_text(encoding="utf-8") == expected
+    assert not writer.tmp_path.exists()
+
+
+def test_words_writer_empty(tmp_path: Path) -> None:
+    dump_path = tmp_path / "lingqs.json"
+    with WordsWriter(dump_path):
+        pass
+    assert json.loads(dump_path.read_text(encoding="utf-8")) == []
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl", "jsonl.gz"])
+def test_dump_roundtrip(tmp_path: Path, fmt: DumpFormat) -> None:
+    cards = load_fixture_cards()
+    dump_path = tmp_path / f"lingqs.{fmt}"
+    with WordsWriter(dump_path, fmt) as writer:
+        writer.write_cards(cards)
+
+    assert find_dump(tmp_path) == dump_path
+    assert list(iter_dump(dump_path)) == cards
+
+
+class FakeHandler:
+    """Serves 'cards' as the API does, oldest first, or newest first with sort="date"."""
+
+    lang = "el"
+
+    def __init__(self, cards: list[Card]) -> None:
+        self.cards = cards
+
+    async def get_cards_pages(
+        self, page_size: int, window: int, *, sort: str | None = None
+    ) -> AsyncGenerator[Cards, None]:
+        cards = sorted(self.cards, key=lambda card: card.pk, reverse=sort == "date")
+        for page in batched(cards, page_size) if cards else [()]:
+            await asyncio.sleep(0)
+            yield Cards(count=len(cards), results=list(page))
+
+
+def make_cards(n: int) -> list[Card]:
+    card = load_fixture_cards()[0]
+    return [card.model_copy(update={"pk": pk, "term": f"term{pk}"}) for pk in range(1, n + 1)]
+
+
+def sync(tmp_path: Path, cards: list[Card]) -> dict[str, list[int]] | None:
+    """Sync the dump incrementally, and return the changes it recorded, if any."""
+    changes_path = tmp_path / "lingqs" / "el" / CHANGES_FILENAME
+    n_lines = len(changes_path.read_text().splitlines()) if changes_path.exists() else 0
+    handler: Any = FakeHandler(cards)
+    asyncio.run(get_words_for_language_async(handler, tmp_path, page_size=2, incremental=True))
+    lines = changes_path.read_text().splitlines() if changes_path.exists() else []
+    if len(lines) == n_lines:
+        return None
+    return {key: json.loads(lines[-1])[key] for key in ("added", "updated", "deleted")}
+
+
+def dumped_terms(tmp_path: Path) -> dict[int, str]:
+    return {card.pk: card.term for card in iter_dump(tmp_path / "lingqs" / "el" / "lingqs.json")}
+
+
+def test_sync_added_cards(tmp_path: Path) -> None:
+    cards = make_cards(5)
+    assert sync(tmp_path, cards[:4]) is None
+    assert sync(tmp_path, cards) == {"added": [5], "updated": [], "deleted": []}
+    assert list(dumped_terms(tmp_path)) == [1, 2, 3, 4, 5]
+
+
+def test_sync_deleted_cards(tmp_path: Path) -> None:
+    cards = make_cards(5)
+    sync(tmp_path, cards)
+    assert sync(tmp_path, cards[1:]) == {"added": [], "updated": [], "deleted": [1]}
+    assert list(dumped_terms(tmp_path)) == [2, 3, 4, 5]
+
+
+def test_sync_updated_cards(tmp_path: Path) -> None:
+    cards = make_cards(5)
+    sync(tmp_path, cards)
+    # The newest cards are checked on every sync.
+    cards[4] = cards[4].model_copy(update={"term": "new5"})
+    assert sync(tmp_path, cards) == {"added": [], "updated": [5], "deleted": []}
+
+    # The older ones only once the last full download is too old.
+    cards[0] = cards[0].model_copy(update={"status": 2})
+    assert sync(tmp_path, cards) is None
+    state_path = tmp_path / "lingqs" / "el" / SYNC_STATE_FILENAME
+    state = SyncState.load(state_path)
+    assert state is not None
+    state.full_sync_at -= FULL_SYNC_INTERVAL + 1
+    state.save(state_path)
+    assert sync(tmp_path, cards) == {"added": [], "updated": [1], "deleted": []}
+    assert next(iter_dump(tmp_path / "lingqs" / "el" / "lingqs.json")).status == 2
+
+
+@pytest.mark.usefixtures("config_path")
+@pytest.mark.parametrize(("sqlite", "max_running"), [(False, 2), (True, 1)])
+def test_several_languages_at_once(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    lang_recorder: Any,
+    sqlite: bool,
+    max_running: int,
+) -> None:
+    monkeypatch.setattr(get_words, "get_words_for_language_async", lang_recorder)
+    langs = ["el", "de", "ja", "fr"]
+    asyncio.run(
+        get_words_async(
+            langs,
+            tmp_path,
+            window=1,
+            fmt="json",
+            incremental=False,
+            sqlite=sqlite,
+            parallel_langs=2,
+        )
+    )
+    assert sorted(lang_recorder.langs) == sorted(langs)
+    # The store takes one language at a time.
+    assert lang_recorder.max_running == max_running
+    assert len(lang_recorder.sessions) == 1
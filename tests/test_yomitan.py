@@ -1,8 +1,13 @@
 import json
+import shutil
 import zipfile
 from pathlib import Path
 
-from lingq.commands.mk_yomitan import YomitanDictTy, get_dictionary_title, yomitan
+import pytest
+
+from lingq.commands.choices import YOMITAN_DICT_CHOICES, YomitanDictTy
+from lingq.commands.mk_yomitan import get_dictionary_title, yomitan
+from lingq.lingqhandler import LingqHandler
 
 
 def rewrite_json_with_first_n_entries(json_file_path: Path, n: int = 5) -> None:
@@ -23,6 +28,12 @@ def path_zip(dict_ty: YomitanDictTy) -> Path:
     return FIXTURE_DIR / LANG / f"{dict_title}.zip"
 
 
+def remove_dictionary(dict_ty: YomitanDictTy) -> None:
+    pz = path_zip(dict_ty)
+    pz.unlink()
+    pz.with_suffix(".cache.json").unlink()
+
+
 def test_yomitan_structure() -> None:
     """Test that the yomitan function does not crash."""
     assert (FIXTURE_DIR / LANG).exists()
@@ -34,7 +45,7 @@ def test_yomitan_structure() -> None:
     yomitan([LANG], FIXTURE_DIR, dict_ty=dict_ty)
     assert pz.exists()
 
-    pz.unlink()
+    remove_dictionary(dict_ty)
     assert not pz.exists()
 
 
@@ -50,6 +61,7 @@ def test_make_yomitan_card() -> None:
         with zipfile.ZipFile(pz, "r") as zf:
             names = zf.namelist()
             assert all(f in names for f in ("index.json", "term_bank_1.json", "styles.css"))
+            assert all(f in names for f in ("tag_bank_1.json", "term_meta_bank_1.json"))
             with zf.open("term_bank_1.json") as f:
                 content = f.read().decode("utf-8")
                 data = json.loads(content)
@@ -58,7 +70,111 @@ def test_make_yomitan_card() -> None:
                 with pz.with_name(f"{dict_ty}.json").open("w") as of:
                     json.dump(first_entry, of, indent=2, ensure_ascii=False)
 
-        pz.unlink()
+        remove_dictionary(dict_ty)
+
+
+def test_split_term_banks() -> None:
+    """The entries are split into banks of 'bank_size', in order."""
+    dict_ty = "simple"
+    pz = path_zip(dict_ty)
+    yomitan([LANG], FIXTURE_DIR, dict_ty=dict_ty)
+    with zipfile.ZipFile(pz, "r") as zf:
+        expected = json.loads(zf.read("term_bank_1.json"))
+
+    yomitan([LANG], FIXTURE_DIR, dict_ty=dict_ty, bank_size=2)
+    with zipfile.ZipFile(pz, "r") as zf:
+        banks = sorted(name for name in zf.namelist() if name.startswith("term_bank_"))
+        assert len(banks) == -(-len(expected) // 2)
+        entries = [
+            entry
+            for i in range(len(banks))
+            for entry in json.loads(zf.read(f"term_bank_{i + 1}.json"))
+        ]
+    assert entries == expected
+
+    remove_dictionary(dict_ty)
+
+
+def test_parallel_build_matches_sequential() -> None:
+    for dict_ty in YOMITAN_DICT_CHOICES:
+        pz = path_zip(dict_ty)
+        yomitan([LANG], FIXTURE_DIR, dict_ty=dict_ty, bank_size=2)
+        with zipfile.ZipFile(pz, "r") as zf:
+            expected = {name: zf.read(name) for name in zf.namelist()}
+
+        yomitan([LANG], FIXTURE_DIR, dict_ty=dict_ty, bank_size=2, jobs=2, force=True)
+        with zipfile.ZipFile(pz, "r") as zf:
+            assert {name: zf.read(name) for name in zf.namelist()} == expected
+
+        remove_dictionary(dict_ty)
+
+
+def test_parallel_build_without_languages(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(LingqHandler, "get_user_langs", staticmethod(lambda: []))
+    yomitan([], FIXTURE_DIR, jobs=2)
+
+
+def test_term_meta_bank() -> None:
+    """Every term has a frequency, from its importance."""
+    dict_ty = "normal"
+    pz = path_zip(dict_ty)
+    yomitan([LANG], FIXTURE_DIR, dict_ty=dict_ty, force=True)
+    cards = json.loads((FIXTURE_DIR / LANG / "lingqs.json").read_text(encoding="utf-8"))
+    with zipfile.ZipFile(pz, "r") as zf:
+        metas = json.loads(zf.read("term_meta_bank_1.json"))
+        tags = json.loads(zf.read("tag_bank_1.json"))
+
+    assert [meta[0] for meta in metas] == [card["term"] for card in cards]
+    assert all(meta[1] == "freq" for meta in metas)
+    assert [meta[2]["value"] for meta in metas] == [card["importance"] for card in cards]
+    assert [tag[0] for tag in tags] == ["1", "2", "3", "4", "5"]
+
+    remove_dictionary(dict_ty)
+
+
+def test_status_tags_are_described() -> None:
+    """Every status tag of the entries is in the tag bank, for both dictionary types."""
+    for dict_ty in YOMITAN_DICT_CHOICES:
+        pz = path_zip(dict_ty)
+        yomitan([LANG], FIXTURE_DIR, dict_ty=dict_ty, force=True)
+        with zipfile.ZipFile(pz, "r") as zf:
+            entries = json.loads(zf.read("term_bank_1.json"))
+            tags = {tag[0] for tag in json.loads(zf.read("tag_bank_1.json"))}
+
+        assert all(entry[2].split()[0] in tags for entry in entries)
+
+        remove_dictionary(dict_ty)
+
+
+def test_build_cache(tmp_path: Path) -> None:
+    """Unchanged dictionaries are not rebuilt, and only the changed term banks are."""
+    shutil.copytree(FIXTURE_DIR / LANG, tmp_path / LANG)
+    dump_path = tmp_path / LANG / "lingqs.json"
+    pz = tmp_path / LANG / f"{DICT_TITLE}.zip"
+
+    yomitan([LANG], tmp_path, bank_size=1)
+    with zipfile.ZipFile(pz, "r") as zf:
+        old_banks = {name: zf.read(name) for name in zf.namelist()}
+    mtime = pz.stat().st_mtime_ns
+
+    yomitan([LANG], tmp_path, bank_size=1)
+    assert pz.stat().st_mtime_ns == mtime
+
+    cards = json.loads(dump_path.read_text(encoding="utf-8"))
+    cards[-1]["term"] = "changed"
+    dump_path.write_text(json.dumps(cards, ensure_ascii=False), encoding="utf-8")
+    yomitan([LANG], tmp_path, bank_size=1)
+    with zipfile.ZipFile(pz, "r") as zf:
+        new_banks = {name: zf.read(name) for name in zf.namelist()}
+
+    n_banks = sum(name.startswith("term_bank_") for name in old_banks)
+    changed = {f"term_bank_{n_banks}.json", f"term_meta_bank_{n_banks}.json"}
+    assert new_banks.keys() == old_banks.keys()
+    for name in changed:
+        assert new_banks[name] != old_banks[name]
+        assert b"changed" in new_banks[name]
+    for name in old_banks.keys() - {*changed, "index.json"}:
+        assert new_banks[name] == old_banks[name]
 
 
 if __name__ == "__main__":